@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""bench_api.py: Benchmarks mrxcavator's API flows against the mock server"""
+
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import argparse
+import tempfile
+import contextlib
+import subprocess
+
+from typing import Any, Callable
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import mrxcavator  # noqa: E402
+
+
+def synthetic_extensions(count: int) -> list:
+    """Returns a list of extension dicts with stable, valid-looking IDs.
+
+    Args:
+        count: The number of extensions to return.
+
+    Returns:
+        A list of extensions.
+    """
+    extensions = []
+
+    for number in range(count):
+        digest = hashlib.sha256(str(number).encode("utf-8")).hexdigest()
+        id = "".join(chr(ord("a") + int(char, 16)) for char in digest[:32])
+        extensions.append({"id": id, "name": id, "version": "TBD"})
+
+    return extensions
+
+
+def start_mock_server(options: Any) -> tuple:
+    """Starts the mock server in a subprocess and waits for it to listen.
+
+    Args:
+        options: An argparse namespace of the benchmark's options.
+
+    Returns:
+        A tuple of the subprocess and the mock API's base URI.
+    """
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    command = [
+        sys.executable,
+        os.path.join(BENCH_DIR, "mock_server.py"),
+        f"--port={port}",
+        f"--latency={options.latency}",
+        f"--jitter={options.jitter}",
+        f"--error_rate={options.error_rate}",
+        f"--rate_limit_rate={options.rate_limit_rate}",
+        f"--retry_after={options.retry_after}",
+    ]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+def reset_timings() -> None:
+    """Clears mrxcavator's recorded timings before a benchmark run.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    mrxcavator.timings.update(
+        start=time.perf_counter(),
+        phases={},
+        endpoints={},
+        api_calls=0,
+        retries=0,
+        errors=0,
+        bytes=0,
+        cache_hits=0,
+    )
+
+
+def run_flow(flow: Callable, extensions: list) -> dict:
+    """Runs a flow with its output silenced and returns its statistics.
+
+    Args:
+        flow: A function that runs an mrxcavator flow for a list of extensions.
+        extensions: A list of extensions to run the flow for.
+
+    Returns:
+        A dict of throughput and latency statistics for the run.
+    """
+    reset_timings()
+
+    with open(os.devnull, "w") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            with contextlib.redirect_stderr(devnull):
+                start = time.perf_counter()
+                flow(extensions)
+                elapsed = time.perf_counter() - start
+
+    latencies = sorted(
+        latency
+        for endpoint in mrxcavator.timings["endpoints"].values()
+        for latency in endpoint
+    )
+
+    result = {
+        "extensions": len(extensions),
+        "seconds": elapsed,
+        "extensions_per_second": len(extensions) / elapsed,
+        "calls": len(latencies),
+        "calls_per_second": len(latencies) / elapsed,
+        "retries": mrxcavator.timings["retries"],
+    }
+
+    for percent in [50, 90, 99]:
+        value = mrxcavator.percentile(latencies, percent) if latencies else 0
+        result[f"p{percent}_ms"] = value * 1000
+
+    return result
+
+
+def virustotal_flow(extensions: list) -> None:
+    """Runs the VirusTotal flow (report, submit and results) per extension.
+
+    Args:
+        extensions: A list of extensions.
+
+    Returns:
+        None
+    """
+    for extension in extensions:
+        report = mrxcavator.get_report(extension["id"])
+
+        if report is not None:
+            mrxcavator.get_virustotal(report, 64 * "a")
+
+
+FLOWS = {
+    "report_all": lambda extensions: mrxcavator.get_reports(extensions, False),
+    "submit_all": lambda extensions: mrxcavator.submit_extensions(
+        extensions, "benchmark"
+    ),
+    "virustotal": virustotal_flow,
+}
+
+
+def main() -> None:
+    """Benchmarks each flow at each size and prints a results table.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="10,1000,10000")
+    parser.add_argument("--flows", default=",".join(FLOWS))
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--error_rate", type=float, default=0)
+    parser.add_argument("--rate_limit_rate", type=float, default=0)
+    parser.add_argument("--retry_after", type=int, default=0)
+    parser.add_argument("--json", metavar="filename")
+    options = parser.parse_args()
+
+    process, uri = start_mock_server(options)
+
+    mrxcavator.config.read_dict(
+        {
+            "DEFAULT": {"crxcavator_api_uri": uri, "daemon_uri": ""},
+            "custom": {},
+        }
+    )
+    mrxcavator.VIRUSTOTAL_THROTTLE = 0
+    mrxcavator.ROOT_DIR = tempfile.mkdtemp()
+
+    print(
+        f"{'Flow':<12}{'Extensions':>11}{'Seconds':>10}{'Ext/s':>10}"
+        f"{'Calls/s':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+        f"{'Retries':>9}"
+    )
+
+    results = []
+
+    try:
+        for size in [int(size) for size in options.sizes.split(",")]:
+            extensions = synthetic_extensions(size)
+
+            for name in options.flows.split(","):
+                result = run_flow(FLOWS[name], extensions)
+                result["flow"] = name
+                results.append(result)
+
+                print(
+                    f"{name:<12}{size:>11}{result['seconds']:>10.2f}"
+                    f"{result['extensions_per_second']:>10.1f}"
+                    f"{result['calls_per_second']:>10.1f}"
+                    f"{result['p50_ms']:>9.2f}{result['p90_ms']:>9.2f}"
+                    f"{result['p99_ms']:>9.2f}{result['retries']:>9}"
+                )
+    finally:
+        process.terminate()
+        process.wait()
+
+    if options.json:
+        with open(options.json, "w") as fileHandle:
+            json.dump(results, fileHandle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""bench_memory.py: Compares memory held by raw and parsed reports"""
+
+import os
+import sys
+import json
+import argparse
+import tracemalloc
+
+from typing import Any, Callable
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import mrxcavator  # noqa: E402
+import bench_api  # noqa: E402
+import mock_server  # noqa: E402
+
+
+def measure(bodies: list, load: Callable) -> Any:
+    """Returns the bytes still allocated after loading every report body.
+
+    Args:
+        bodies: A list of report bodies as JSON strings.
+        load: A function that turns one body into the object to keep.
+
+    Returns:
+        A tuple of the allocated bytes and the loaded objects, which are
+        returned so they stay alive until measured.
+    """
+    tracemalloc.start()
+    kept = [load(body) for body in bodies]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return allocated, kept
+
+
+def main() -> None:
+    """Measures raw JSON and parsed Extension reports for synthetic IDs.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--reports", type=int, default=5000)
+    parser.add_argument("--versions", type=int, default=5)
+    args = parser.parse_args()
+
+    bodies = [
+        json.dumps(mock_server.build_report(extension["id"], args.versions))
+        for extension in bench_api.synthetic_extensions(args.reports)
+    ]
+
+    raw, kept = measure(bodies, json.loads)
+    del kept
+    parsed, kept = measure(
+        bodies, lambda body: mrxcavator.parse_report(json.loads(body))
+    )
+
+    print(f"{'Reports':<12}{'KiB':>12}{'Bytes/report':>16}")
+    for name, allocated in [("raw JSON", raw), ("Extension", parsed)]:
+        print(
+            f"{name:<12}{allocated / 1024:>12.0f}"
+            f"{allocated / args.reports:>16.0f}"
+        )
+
+    print(f"\nParsed reports use {100 * parsed / raw:.0f}% of raw memory.")
+
+
+if __name__ == "__main__":
+    main()
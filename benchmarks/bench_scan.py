@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""bench_scan.py: Benchmarks discovery of locally installed extensions"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import mrxcavator  # noqa: E402
+import gen_extensions  # noqa: E402
+
+
+def drop_caches() -> bool:
+    """Asks the kernel to drop the page, dentry and inode caches so the next
+    scan reads from disk. This only works on Linux when running as root.
+
+    Args:
+        None
+
+    Returns:
+        A boolean for whether the caches were dropped.
+    """
+    try:
+        subprocess.run(["sync"], check=True)
+
+        with open("/proc/sys/vm/drop_caches", "w") as fileHandle:
+            fileHandle.write("3\n")
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+    return True
+
+
+def scan_steps(path: str) -> dict:
+    """Runs each discovery step separately and returns the time of each.
+
+    Args:
+        path: The filesystem path to Chrome extensions.
+
+    Returns:
+        A dict of step names and the seconds spent in each.
+    """
+    steps = {"find": 0.0, "version": 0.0, "name": 0.0}
+
+    start = time.perf_counter()
+    directories = mrxcavator.find_extension_directories(path)
+    steps["find"] = time.perf_counter() - start
+
+    for dir in directories:
+        start = time.perf_counter()
+        version = mrxcavator.get_latest_local_version(dir)
+        steps["version"] += time.perf_counter() - start
+
+        if version:
+            start = time.perf_counter()
+            mrxcavator.get_extension_name(dir, version)
+            steps["name"] += time.perf_counter() - start
+
+    return steps
+
+
+def main() -> None:
+    """Times cold and warm discovery of a (generated) extension tree.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--path", help="scan an existing tree instead")
+    parser.add_argument("-n", "--extensions", type=int, default=2000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--broken", type=float, default=0.02)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--packages", action="store_true", help="also time reading .crx files"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        path = args.path or os.path.join(temporary, "Extensions")
+
+        if not args.path:
+            gen_extensions.generate(
+                path, args.extensions, args.versions, args.broken, 0
+            )
+
+        mrxcavator.extension_path = path.rstrip("/") + "/"
+
+        dropped = drop_caches()
+        start = time.perf_counter()
+        extensions = mrxcavator.get_installed_extensions(path)
+        cold = time.perf_counter() - start
+
+        warm = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            mrxcavator.get_installed_extensions(path)
+            warm.append(time.perf_counter() - start)
+
+        steps = scan_steps(path)
+
+        if args.packages:
+            packages = os.path.join(temporary, "packages")
+            gen_extensions.pack(path, packages)
+
+            for minimum in (sys.maxsize, 0):
+                mrxcavator.PACKAGE_POOL_MIN = minimum
+                start = time.perf_counter()
+                mrxcavator.get_package_extensions(packages)
+                name = "serial" if minimum else "pool"
+                steps[f"crx ({name})"] = time.perf_counter() - start
+
+    unknown = sum(1 for ext in extensions if ext["name"] == "**Unknown Name**")
+
+    print(f"Extensions found: {len(extensions)} ({unknown} unknown names)")
+    if not dropped:
+        print("Page cache was not dropped; cold is the first scan in-process.")
+
+    print(f"\n{'Scan':<16}{'Seconds':>10}{'Ext/s':>10}")
+    for name, elapsed in [
+        ("cold", cold),
+        ("warm (median)", statistics.median(warm)),
+        ("warm (best)", min(warm)),
+    ]:
+        rate = len(extensions) / elapsed
+        print(f"{name:<16}{elapsed:>10.3f}{rate:>10.0f}")
+
+    print(f"\n{'Warm step':<16}{'Seconds':>10}")
+    for name, elapsed in steps.items():
+        print(f"{name:<16}{elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
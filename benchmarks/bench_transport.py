@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""bench_transport.py: Compares mrxcavator's HTTP transports under load"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import mrxcavator  # noqa: E402
+import bench_api  # noqa: E402
+
+
+def available_transports() -> list:
+    """Returns the names of the transports whose dependencies are installed.
+
+    Args:
+        None
+
+    Returns:
+        A list of transport names.
+    """
+    names = []
+
+    for name in mrxcavator.TRANSPORTS:
+        try:
+            mrxcavator.Transport(name).close()
+        except mrxcavator.MrxcavatorError:
+            continue
+
+        names.append(name)
+
+    return names
+
+
+def get_protocol(id: str) -> str:
+    """Returns the HTTP version the current transport negotiates.
+
+    Args:
+        id: An extension identifier string to request a report for.
+
+    Returns:
+        A string such as 'HTTP/1.1' or 'HTTP/2'.
+    """
+    response = mrxcavator.get_transport().request(
+        "GET", mrxcavator.get_api_uri() + "/report/" + id
+    )
+
+    return getattr(response, "http_version", "HTTP/1.1")
+
+
+def run_transport(name: str, ids: list, concurrency: int) -> dict:
+    """Fetches every report through a transport from concurrent threads.
+
+    Args:
+        name: The transport's name.
+        ids: A list of extension identifier strings.
+        concurrency: The number of threads sending requests at once.
+
+    Returns:
+        A dict of throughput and latency statistics for the run.
+    """
+    mrxcavator.transport = mrxcavator.Transport(name)
+
+    try:
+        protocol = get_protocol(ids[0])
+        bench_api.reset_timings()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            list(executor.map(mrxcavator.prefetch_report, ids))
+            elapsed = time.perf_counter() - start
+    finally:
+        mrxcavator.transport.close()
+        mrxcavator.transport = None
+
+    latencies = sorted(
+        latency
+        for endpoint in mrxcavator.timings["endpoints"].values()
+        for latency in endpoint
+    )
+
+    result: Any = {
+        "transport": name,
+        "protocol": protocol,
+        "concurrency": concurrency,
+        "reports": len(ids),
+        "seconds": elapsed,
+        "reports_per_second": len(ids) / elapsed,
+    }
+
+    for percent in [50, 90, 99]:
+        value = mrxcavator.percentile(latencies, percent) if latencies else 0
+        result[f"p{percent}_ms"] = value * 1000
+
+    return result
+
+
+def main() -> None:
+    """Benchmarks each transport at each concurrency and prints a table.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--reports", type=int, default=1000)
+    parser.add_argument("--concurrency", default="1,8,32")
+    parser.add_argument(
+        "--transports", default=",".join(mrxcavator.TRANSPORTS)
+    )
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--uri", help="benchmark this API instead of a mock")
+    parser.add_argument("--input", metavar="filename", help="IDs for --uri")
+    parser.add_argument("--json", metavar="filename")
+    options = parser.parse_args()
+    options.error_rate = options.rate_limit_rate = options.retry_after = 0
+
+    if options.uri and not options.input:
+        parser.error("--uri needs --input with IDs the API has reports for")
+
+    process = None
+
+    if options.uri:
+        uri = options.uri.rstrip("/")
+        ids = [
+            extension["id"]
+            for extension in mrxcavator.extensions_from_file(options.input)
+        ]
+    else:
+        process, uri = bench_api.start_mock_server(options)
+        ids = [
+            extension["id"]
+            for extension in bench_api.synthetic_extensions(options.reports)
+        ]
+
+    mrxcavator.config.read_dict(
+        {
+            "DEFAULT": {"crxcavator_api_uri": uri, "daemon_uri": ""},
+            "custom": {},
+        }
+    )
+    mrxcavator.ROOT_DIR = tempfile.mkdtemp()
+
+    installed = available_transports()
+
+    print(
+        f"{'Transport':<11}{'Protocol':<10}{'Threads':>8}{'Reports':>9}"
+        f"{'Seconds':>9}{'Reports/s':>11}{'p50 ms':>9}{'p90 ms':>9}"
+        f"{'p99 ms':>9}"
+    )
+
+    results = []
+
+    try:
+        for name in options.transports.split(","):
+            if name not in installed:
+                print(f"{name:<11}(not installed)")
+                continue
+
+            for concurrency in options.concurrency.split(","):
+                result = run_transport(name, ids, int(concurrency))
+                results.append(result)
+
+                print(
+                    f"{name:<11}{result['protocol']:<10}"
+                    f"{result['concurrency']:>8}{result['reports']:>9}"
+                    f"{result['seconds']:>9.2f}"
+                    f"{result['reports_per_second']:>11.1f}"
+                    f"{result['p50_ms']:>9.2f}{result['p90_ms']:>9.2f}"
+                    f"{result['p99_ms']:>9.2f}"
+                )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    if options.json:
+        with open(options.json, "w") as fileHandle:
+            json.dump(results, fileHandle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
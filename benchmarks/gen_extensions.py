@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""gen_extensions.py: Builds a synthetic Chrome `Extensions/` directory tree"""
+
+import io
+import os
+import json
+import random
+import struct
+import zipfile
+import argparse
+
+from typing import Any
+
+PERMISSIONS = [
+    "activeTab",
+    "alarms",
+    "bookmarks",
+    "clipboardRead",
+    "clipboardWrite",
+    "contextMenus",
+    "cookies",
+    "downloads",
+    "history",
+    "identity",
+    "management",
+    "nativeMessaging",
+    "notifications",
+    "proxy",
+    "storage",
+    "tabs",
+    "webNavigation",
+    "webRequest",
+    "webRequestBlocking",
+]
+HOSTS = [
+    "<all_urls>",
+    "*://*/*",
+    "http://*/*",
+    "https://*/*",
+    "https://*.google.com/*",
+    "https://api.example.com/*",
+    "https://mail.example.org/*",
+]
+CSP_POLICIES = [
+    "script-src 'self'; object-src 'self'",
+    "script-src 'self' 'unsafe-eval'; object-src 'self'",
+    "script-src 'self' https://cdn.example.com; object-src 'none'",
+    "default-src 'self'; script-src 'self'; style-src 'self' 'unsafe-inline'",
+]
+MESSAGE_KEYS = ["appName", "extName", "APP_NAME", "chrome_extension_name"]
+LOCALES = [["en"], ["en_US"], ["en_GB", "fr"], ["en", "de", "ja"], ["de"]]
+WORDS = ["Tab", "Mail", "Note", "Password", "Shop", "Reader", "Dark", "VPN"]
+
+
+def random_id(rng: random.Random) -> str:
+    """Returns a random 32-character Chrome extension identifier.
+
+    Args:
+        rng: A random.Random object.
+
+    Returns:
+        An extension identifier string.
+    """
+    return "".join(rng.choice("abcdefghijklmnop") for _ in range(32))
+
+
+def write_json(path: str, content: Any) -> None:
+    """Writes passed-in content as JSON, creating parent directories.
+
+    Args:
+        path: The filesystem path to write to.
+        content: A JSON-serializable object.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w") as fileHandle:
+        json.dump(content, fileHandle, indent=2)
+
+
+def build_manifest(rng: random.Random, name: str, version: str) -> dict:
+    """Returns a manifest.json dict with randomized permissions and content.
+
+    Args:
+        rng: A random.Random object.
+        name: The manifest 'name' value.
+        version: The manifest 'version' value.
+
+    Returns:
+        A dict of the manifest.
+    """
+    manifest: dict = {
+        "manifest_version": rng.choice([2, 2, 3]),
+        "name": name,
+        "version": version,
+        "default_locale": "en",
+        "permissions": rng.sample(PERMISSIONS, rng.randint(0, 8)),
+        "background": {"scripts": ["background.js"]},
+    }
+
+    hosts = rng.sample(HOSTS, rng.randint(0, 3))
+    if manifest["manifest_version"] == 3:
+        manifest["host_permissions"] = hosts
+    else:
+        manifest["permissions"] += hosts
+
+    if rng.random() < 0.3:
+        manifest["optional_permissions"] = rng.sample(PERMISSIONS, 2)
+
+    if rng.random() < 0.6:
+        manifest["content_scripts"] = [
+            {
+                "matches": rng.sample(HOSTS[1:], rng.randint(1, 3)),
+                "js": ["content.js"],
+            }
+        ]
+
+    if rng.random() < 0.5:
+        manifest["content_security_policy"] = rng.choice(CSP_POLICIES)
+
+    return manifest
+
+
+def build_version(
+    rng: random.Random, path: str, version: str, broken: float
+) -> None:
+    """Writes one version directory of a synthetic extension.
+
+    Args:
+        rng: A random.Random object.
+        path: The filesystem path of the version directory.
+        version: The extension version string.
+        broken: The fraction of manifests that should be broken.
+
+    Returns:
+        None
+    """
+    title = " ".join(rng.sample(WORDS, 2))
+    hosts = [f"https://host{rng.randint(0, 499)}.example.com"]
+    hosts += [f"https://cdn{rng.randint(0, 99)}.example.net" for _ in range(5)]
+
+    if rng.random() < 0.5:
+        key = rng.choice(MESSAGE_KEYS)
+        name = f"__MSG_{key}__"
+
+        for locale in rng.choice(LOCALES):
+            write_json(
+                f"{path}/_locales/{locale}/messages.json",
+                {key: {"message": f"{title} ({locale})"}},
+            )
+    else:
+        name = title
+
+    manifest = build_manifest(rng, name, version.split("_")[0])
+
+    os.makedirs(path, exist_ok=True)
+    with open(f"{path}/manifest.json", "w") as fileHandle:
+        content = json.dumps(manifest, indent=2)
+
+        if rng.random() < broken:
+            content = rng.choice([content[: len(content) // 2], "{}", ""])
+
+        fileHandle.write(content)
+
+    with open(f"{path}/background.js", "w") as fileHandle:
+        for host in hosts:
+            fileHandle.write(f'fetch("{host}/api/v1/" + id);\n')
+        fileHandle.write(rng.randint(20, 200) * "var x = function() {};\n")
+
+    with open(f"{path}/content.js", "w") as fileHandle:
+        fileHandle.write(f'const BASE = "{rng.choice(hosts)}";\n')
+
+    with open(f"{path}/popup.html", "w") as fileHandle:
+        fileHandle.write(f'<a href="{rng.choice(hosts)}/help">Help</a>\n')
+
+
+def generate(
+    path: str, count: int, versions: int, broken: float, seed: int
+) -> list:
+    """Builds a synthetic Chrome `Extensions/` tree at the passed-in path.
+
+    Args:
+        path: The filesystem path of the `Extensions/` directory.
+        count: The number of extensions to create.
+        versions: The maximum number of version directories per extension.
+        broken: The fraction of manifests that should be broken.
+        seed: The random seed, so trees are reproducible.
+
+    Returns:
+        A list of the generated extension identifiers.
+    """
+    rng = random.Random(seed)
+    ids = []
+
+    os.makedirs(f"{path}/Temp", exist_ok=True)
+
+    for _ in range(count):
+        id = random_id(rng)
+        major = rng.randint(1, 20)
+
+        for minor in range(rng.randint(1, versions)):
+            version = f"{major}.{minor}.{rng.randint(0, 99)}_0"
+            build_version(rng, f"{path}/{id}/{version}", version, broken)
+
+        ids.append(id)
+
+    return ids
+
+
+def protobuf_field(field: int, value: bytes) -> bytes:
+    """Returns a length-delimited protobuf field.
+
+    Args:
+        field: The field number.
+        value: The field's bytes.
+
+    Returns:
+        The encoded field.
+    """
+    encoded = b""
+
+    for number in (field << 3 | 2, len(value)):
+        while number > 0x7F:
+            encoded += bytes([number & 0x7F | 0x80])
+            number >>= 7
+        encoded += bytes([number])
+
+    return encoded + value
+
+
+def write_crx(source: str, filename: str, id: str) -> None:
+    """Packs an unpacked extension directory into an unsigned CRX3 file.
+
+    Args:
+        source: The filesystem path of an extension version directory.
+        filename: The .crx file to write.
+        id: The extension identifier stored in the header.
+
+    Returns:
+        None
+    """
+    archive = io.BytesIO()
+
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as package:
+        for root, dirs, names in os.walk(source):
+            for name in names:
+                path = os.path.join(root, name)
+                package.write(path, os.path.relpath(path, source))
+
+    crx_id = bytes.fromhex("".join(f"{ord(c) - 97:x}" for c in id))
+    header = protobuf_field(10000, protobuf_field(1, crx_id))
+
+    with open(filename, "wb") as fileHandle:
+        fileHandle.write(b"Cr24" + struct.pack("<II", 3, len(header)))
+        fileHandle.write(header + archive.getvalue())
+
+
+def pack(path: str, packages: str) -> int:
+    """Writes the newest version of each extension in a tree as a .crx.
+
+    Args:
+        path: The filesystem path of the `Extensions/` directory.
+        packages: The directory to write packages to.
+
+    Returns:
+        The number of packages written.
+    """
+    os.makedirs(packages, exist_ok=True)
+    count = 0
+
+    for id in sorted(os.listdir(path)):
+        versions = os.listdir(f"{path}/{id}")
+
+        if len(id) != 32 or not versions:
+            continue
+
+        version = max(
+            versions, key=lambda v: [int(n) for n in v[:-2].split(".")]
+        )
+        write_crx(f"{path}/{id}/{version}", f"{packages}/{id}.crx", id)
+        count += 1
+
+    return count
+
+
+def main() -> None:
+    """Builds a synthetic tree from the command-line arguments.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", help="directory to create the tree in")
+    parser.add_argument("-n", "--extensions", type=int, default=2000)
+    parser.add_argument("--versions", type=int, default=3)
+    parser.add_argument("--broken", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--crx", help="also write .crx packages to this path")
+    args = parser.parse_args()
+
+    ids = generate(
+        args.path, args.extensions, args.versions, args.broken, args.seed
+    )
+
+    print(f"Generated {len(ids)} extensions in {args.path}")
+
+    if args.crx:
+        print(f"Packed {pack(args.path, args.crx)} extensions in {args.crx}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""mock_server.py: A local CRXcavator and VirusTotal stand-in for benchmarks"""
+
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+
+from typing import Any
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+API_PREFIX = "/v1"
+CSP_ATTRIBUTES = [
+    "child-src",
+    "connect-src",
+    "font-src",
+    "form-action",
+    "frame-ancestors",
+    "frame-src",
+    "img-src",
+    "object-src",
+    "script-src",
+    "style-src",
+    "worker-src",
+]
+
+
+def get_random(seed: str) -> random.Random:
+    """Returns a random number generator seeded by the passed-in string, so
+    fixtures for the same extension are identical across runs.
+
+    Args:
+        seed: A seed string, such as an extension identifier.
+
+    Returns:
+        A random.Random object.
+    """
+    digest = hashlib.sha256(seed.encode("utf-8")).hexdigest()
+
+    return random.Random(int(digest[:16], 16))
+
+
+def build_report(id: str, versions: int) -> list:
+    """Returns a synthetic CRXcavator report for the passed-in extension ID.
+
+    Args:
+        id: An extension identifier string.
+        versions: The number of versions to include in the report.
+
+    Returns:
+        A list of report entries, oldest version first.
+    """
+    rng = get_random(id)
+    hosts = [f"host{rng.randint(0, 499)}.example.com" for _ in range(8)]
+    report = []
+
+    for number in range(versions):
+        csp = {"total": 0}
+        for attribute in rng.sample(CSP_ATTRIBUTES, rng.randint(0, 6)):
+            csp[attribute] = rng.choice([1, 10, 25])
+            csp["total"] += csp[attribute]
+
+        retire = {level: 10 * rng.randint(0, 4) for level in ["low", "medium"]}
+        retire.update({"high": 30 * rng.randint(0, 2), "critical": 0})
+        retire["total"] = sum(retire.values())
+
+        risk: dict = {
+            "csp": csp,
+            "retire": retire,
+            "webstore": {"total": rng.randint(0, 3), "rating_users": 1},
+            "permissions": {"total": 5 * rng.randint(0, 30)},
+            "optional_permissions": {"total": 5 * rng.randint(0, 5)},
+        }
+        risk["total"] = sum(value["total"] for value in risk.values())
+
+        report.append(
+            {
+                "extension_id": id,
+                "version": f"{rng.randint(1, 9)}.{number}.0",
+                "data": {
+                    "webstore": {
+                        "name": f"Synthetic {id[:8]}",
+                        "website": f"https://{id[:8]}.example.com",
+                        "last_updated": f"2020-{1 + number % 12:02d}-01",
+                        "rating": rng.uniform(1, 5),
+                    },
+                    "risk": risk,
+                    "extcalls": [f"https://{host}/path" for host in hosts],
+                },
+            }
+        )
+
+    return report
+
+
+def build_handler(options: Any) -> Any:
+    """Returns a request handler class configured by the passed-in options.
+
+    Args:
+        options: An argparse namespace of the mock server's options.
+
+    Returns:
+        A BaseHTTPRequestHandler subclass.
+    """
+    rng = random.Random(options.seed)
+    rng_lock = threading.Lock()
+
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            return
+
+        def do_GET(self) -> None:
+            self.respond("GET")
+
+        def do_POST(self) -> None:
+            self.respond("POST")
+
+        def send(self, code: int, content: Any) -> None:
+            body = json.dumps(content).encode("utf-8")
+
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if code == 429:
+                self.send_header("Retry-After", str(options.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def respond(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            values = json.loads(body) if body else {}
+
+            with rng_lock:
+                delay = max(rng.gauss(options.latency, options.jitter), 0)
+                roll = rng.random()
+
+            time.sleep(delay / 1000)
+
+            if roll < options.rate_limit_rate:
+                return self.send(429, {"error": "Too Many Requests"})
+            elif roll < options.rate_limit_rate + options.error_rate:
+                return self.send(502, {"error": "Bad Gateway"})
+
+            path = urlparse(self.path).path.rstrip("/")
+            if not path.startswith(API_PREFIX):
+                return self.send(404, {"error": "Not Found"})
+
+            route = path[len(API_PREFIX) :]  # noqa: E203
+            parts = route.split("/")
+
+            if route == "" and method == "GET":
+                self.send(200, {"text": "CRXcavator"})
+            elif route.startswith("/report/") and len(parts) == 3:
+                self.send(200, build_report(parts[2], options.versions))
+            elif route == "/submit" and method == "POST":
+                self.send(200, {"code": 800})
+            elif route == "/user/apikey":
+                if self.headers.get("API-Key"):
+                    self.send(200, {"email": "benchmark@example.com"})
+                else:
+                    self.send(401, {"error": "Not Authorized"})
+            elif route == "/virustotal/report" and method == "POST":
+                self.send(200, {"queued": len(values.get("urls", []))})
+            elif route == "/virustotal/results" and method == "POST":
+                results = []
+                for url in values.get("urls", []):
+                    positives = get_random(url).choice([0, 0, 0, 1, 2])
+                    results.append(
+                        {
+                            "url": url,
+                            "vt": {"positives": positives, "total": 70},
+                        }
+                    )
+                self.send(200, results)
+            else:
+                self.send(404, {"error": "Not Found"})
+
+    return MockHandler
+
+
+def build_server(options: Any) -> Any:
+    """Returns a threaded mock API server for the passed-in options.
+
+    Args:
+        options: An argparse namespace of the mock server's options.
+
+    Returns:
+        An object for the HTTP server.
+    """
+
+    class MockServer(ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+        request_queue_size = 128
+
+    return MockServer((options.host, options.port), build_handler(options))
+
+
+def build_parser() -> Any:
+    """Returns a configured object for the mock server's arguments.
+
+    Args:
+        None
+
+    Returns:
+        An object for argparse.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8574)
+    parser.add_argument(
+        "--latency", type=float, default=0, help="mean latency in ms"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0, help="latency deviation in ms"
+    )
+    parser.add_argument(
+        "--error_rate", type=float, default=0, help="fraction of 502s"
+    )
+    parser.add_argument(
+        "--rate_limit_rate", type=float, default=0, help="fraction of 429s"
+    )
+    parser.add_argument(
+        "--retry_after", type=int, default=1, help="seconds sent with 429s"
+    )
+    parser.add_argument(
+        "--versions", type=int, default=3, help="versions per report"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+    return parser
+
+
+def main() -> None:
+    """Runs the mock server until it is interrupted.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    options = build_parser().parse_args()
+    server = build_server(options)
+    uri = f"http://{options.host}:{server.server_address[1]}{API_PREFIX}"
+
+    print(f"\n\tServing a mock CRXcavator API on {uri}")
+    print(f"\tUse it with: mrxcavator --crxcavator_uri {uri}\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
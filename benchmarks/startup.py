@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""startup.py: Measures mrxcavator's startup cost for each CLI command"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(ROOT_DIR, "benchmarks", "startup_budget.json")
+HEADROOM = 1.1
+
+COMMANDS = {
+    "version": ["-v"],
+    "help": ["-h"],
+    "crxcavator_key": ["--crxcavator_key", "DEnDIwspwQkiMYZzuFbHOHUqDOpSaDIw"],
+    "crxcavator_uri": ["--crxcavator_uri", "https://api.crxcavator.io/v1"],
+    "virustotal_key": ["--virustotal_key", 64 * "a"],
+    "daemon_uri": ["--daemon_uri", ""],
+    "extensions": ["-e"],
+}
+
+
+def measure(args: list, home: str) -> tuple:
+    """Runs Python once with `-X importtime` and returns its timings.
+
+    Args:
+        args: A list of command-line arguments for the Python interpreter.
+        home: A string for the HOME directory to run mrxcavator with.
+
+    Returns:
+        A tuple of a dict of per-module import times and the wall time, both
+        in milliseconds.
+    """
+    command = [sys.executable, "-X", "importtime"] + args
+    env = dict(os.environ, HOME=home)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        command,
+        cwd=ROOT_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    wall = (time.perf_counter() - start) * 1000
+
+    imports = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            fields = line.split(":", 1)[1].split("|")
+            imports[fields[2].strip()] = int(fields[0]) / 1000
+
+    return imports, wall
+
+
+def main() -> None:
+    """Measures each command and compares the number of modules it imports,
+    beyond the interpreter's own, to the tracked budget. Import and wall
+    times are shown for reference only, since they depend on the host.
+
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument(
+        "--update", action="store_true", help="rewrite the budget file"
+    )
+    args = parser.parse_args()
+
+    budget = {}
+    if os.path.isfile(BUDGET_FILE):
+        with open(BUDGET_FILE) as fileHandle:
+            budget = json.load(fileHandle)
+
+    results = {}
+    over = []
+
+    with tempfile.TemporaryDirectory() as home:
+        measure(["mrxcavator.py"] + COMMANDS["crxcavator_key"], home)
+
+        runs = [measure(["-c", "pass"], home) for _ in range(args.runs)]
+        baseline = set(runs[0][0])
+        base_wall = statistics.median(run[1] for run in runs)
+
+        print(
+            f"Interpreter baseline: {len(baseline)} modules, "
+            f"{base_wall:.1f} ms wall (excluded below)\n"
+        )
+
+        print(
+            f"{'Command':<16}{'Modules':>9}{'Imports (ms)':>14}"
+            f"{'Wall (ms)':>12}{'Budget':>9}"
+        )
+
+        for name, command in COMMANDS.items():
+            command = ["mrxcavator.py"] + command
+            runs = [measure(command, home) for _ in range(args.runs)]
+            modules = len(set(runs[0][0]) - baseline)
+            imports = statistics.median(
+                sum(
+                    elapsed
+                    for module, elapsed in run[0].items()
+                    if module not in baseline
+                )
+                for run in runs
+            )
+            wall = statistics.median(run[1] for run in runs) - base_wall
+            results[name] = 5 * math.ceil(modules * HEADROOM / 5)
+
+            limit = budget.get(name)
+            status = ""
+            if limit is not None and modules > limit:
+                over.append(name)
+                status = "  OVER"
+
+            print(
+                f"{name:<16}{modules:>9}{imports:>14.1f}{wall:>12.1f}"
+                f"{limit if limit is not None else '-':>9}{status}"
+            )
+
+    if args.update:
+        with open(BUDGET_FILE, "w") as fileHandle:
+            json.dump(results, fileHandle, indent=4, sort_keys=True)
+            fileHandle.write("\n")
+
+        print(f"\nUpdated {BUDGET_FILE}")
+
+    elif over:
+        print(f"\nOver budget: {', '.join(over)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
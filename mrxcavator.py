@@ -14,29 +14,395 @@ import sys
 import math
 import time
 import json
+import struct
 import itertools
 import datetime
+import atexit
 import argparse
-import requests
-import asciichartpy  # type: ignore
-import termtables  # type: ignore
-import validators  # type: ignore
+import threading
 import configparser
 
-from packaging import version
-from tqdm import tqdm  # type: ignore
-from typing import Generator, Any
-from PyInquirer import prompt  # type: ignore
-from urllib.parse import urlparse
+from typing import Generator, NamedTuple, Optional, Tuple, Any
+from contextlib import contextmanager
+from urllib.parse import urlparse, parse_qs
 
 
 ROOT_DIR = "~/.mrxcavator"
 REPORT_DIR = "reports"
 CONFIG_FILE = "config.ini"
+INVENTORY_FILE = "inventory.json"
+HISTORY_DIR = "history"
+SNAPSHOT_FILE = "snapshot.json"
+VIRUSTOTAL_FILE = "virustotal.json"
+ARCHIVE_SUFFIXES = (".tar.gz", ".tgz", ".zip", ".jsonl", ".jsonl.gz")
+ARCHIVE_QUEUE = 64
+WATCH_DEBOUNCE = 2.0
+WATCH_POLL = 10
+INOTIFY_MASK = 0x100 | 0x80 | 0x1000000  # IN_CREATE|IN_MOVED_TO|IN_ONLYDIR
+INOTIFY_IN_ISDIR = 0x40000000
+INOTIFY_EVENT = struct.Struct("iIII")
+TABLE_SORT_COLUMNS = {"updated": 3, "rating": 4, "risk": 5}
+BUNDLE_MAGIC = b"MRXB0001"
+BUNDLE_HEADER = struct.Struct("<8sQ")
+BUNDLE_ENTRY = struct.Struct("<16sQI")
+LIST_MAGIC = b"MRXL0001"
+LIST_HEADER = struct.Struct("<8sQqQQ")
+EXTENSION_ID = re.compile("[a-p]{32}")
+EXTENSION_ID_HEX = str.maketrans("abcdefghijklmnop", "0123456789abcdef")
+IGNORED_EXTENSIONS = frozenset(
+    [
+        "nmmhkkegccagdldgiimedpiccmgmieda",
+        "pkedcjkdefgpdelpbcmbmeomcjbeemfm",
+    ]
+)
+CHROME_METADATA_DIR = "_metadata"
 CRX_PATH = "~/Library/Application Support/Google/Chrome/Default/Extensions/"
+DAEMON_PORT = 8573
+CACHE_TTL = 900
+VIRUSTOTAL_THROTTLE = 65
+VIRUSTOTAL_POLL = 5
+SUBMIT_WAIT_TIMEOUT = 900
+SUBMIT_POLL_MIN = 5
+SUBMIT_POLL_MAX = 120
+PREFETCH_WORKERS = 8
+PREFETCH_WAIT = 2.0
+PREFETCH_RETRIES = 2
+POLICY_VIOLATION_EXIT = 3
+TRANSPORTS = ("requests", "httpx")
+TRANSPORT_CONNECTIONS = 10
+ASYNC_CONCURRENCY = 10
+ASYNC_RETRIES = 3
+BATCH_WINDOW = 100
+CRXCAVATOR_API_URI = "https://api.crxcavator.io/v1"
+STATS_COMPONENTS = (
+    "total",
+    "csp",
+    "retire",
+    "webstore",
+    "permissions",
+    "optional_permissions",
+)
+STATS_PERCENTILES = (50, 90, 99)
+HISTORY_FIELDS = ("date", "version") + STATS_COMPONENTS
+HISTORY_RECORD = 8 * len(HISTORY_FIELDS)
+GRAPH_DATE_FORMATS = ("%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y")
+GRAPH_LABEL_WIDTH = 10
+GRAPH_COLORS = (
+    "\033[94m",
+    "\033[92m",
+    "\033[91m",
+    "\033[93m",
+    "\033[95m",
+    "\033[96m",
+)
+STATS_BINS = 10
+STATS_TOP = 10
+CSP_MISSING = 25
+CSP_DEFAULT = "script-src 'self'; object-src 'self'"
+CSP_RISKY_SOURCES = (
+    "'unsafe-inline'",
+    "'unsafe-eval'",
+    "*",
+    "http:",
+    "https:",
+    "data:",
+)
+CSP_FETCH_DIRECTIVES = (
+    "child-src",
+    "connect-src",
+    "font-src",
+    "frame-src",
+    "img-src",
+    "manifest-src",
+    "media-src",
+    "object-src",
+    "prefetch-src",
+    "script-src",
+    "style-src",
+    "worker-src",
+)
+CSP_DIRECTIVES = CSP_FETCH_DIRECTIVES + (
+    "default-src",
+    "base-uri",
+    "form-action",
+    "frame-ancestors",
+    "upgrade-insecure-requests",
+)
+CRX_MAGIC = b"Cr24"
+PACKAGE_SUFFIXES = (".crx", ".zip")
+PACKAGE_POOL_MIN = 64
+MESSAGES_LOCALES = ("en_US", "en_GB", "en")
+EXTCALL_SUFFIXES = (".js", ".mjs", ".html", ".htm")
+HASH_BUFFER = 1024 * 1024
+HASH_WORKERS = 8
+EXTCALL_POOL_MIN = 4 * 1024 * 1024
+EXTCALL_PATTERN = re.compile(
+    rb"(?:https?|wss?)://[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?::[0-9]{1,5})?"
+    rb"(?:/[^\s\"'`<>(){}\[\]\\|^]*)?"
+)
+HOST_RISK_ALL = 45
+HOST_RISK_WILDCARD = 20
+HOST_RISK_SPECIFIC = 10
+PERMISSION_RISK_UNKNOWN = 5
+PERMISSION_RISK = {
+    "<all_urls>": HOST_RISK_ALL,
+    "*://*/*": HOST_RISK_ALL,
+    "http://*/*": HOST_RISK_ALL,
+    "https://*/*": HOST_RISK_ALL,
+    "debugger": 45,
+    "nativeMessaging": 40,
+    "proxy": 40,
+    "webRequestBlocking": 40,
+    "cookies": 35,
+    "declarativeNetRequestWithHostAccess": 35,
+    "history": 35,
+    "management": 35,
+    "privacy": 35,
+    "webRequest": 30,
+    "clipboardRead": 30,
+    "desktopCapture": 30,
+    "downloads": 25,
+    "scripting": 25,
+    "tabs": 25,
+    "tabCapture": 25,
+    "webNavigation": 25,
+    "bookmarks": 20,
+    "contentSettings": 20,
+    "declarativeNetRequest": 20,
+    "geolocation": 20,
+    "topSites": 20,
+    "clipboardWrite": 15,
+    "pageCapture": 15,
+    "identity": 10,
+    "activeTab": 5,
+    "alarms": 0,
+    "contextMenus": 0,
+    "idle": 0,
+    "notifications": 0,
+    "storage": 0,
+    "unlimitedStorage": 0,
+}
 
 config = configparser.ConfigParser()
 extension_path = ""
+crx_packages = False
+transport: Any = None
+serving = False
+daemon_available = True
+report_cache: dict = {}
+virustotal_cache: dict = {}
+virustotal_jobs: dict = {}
+virustotal_lock = threading.Lock()
+inventory: dict = {}
+inventory_lock = threading.Lock()
+membership_lists: dict = {}
+offline_bundle: Any = None
+prefetched_reports: dict = {}
+timings: dict = {
+    "start": time.perf_counter(),
+    "phases": {},
+    "endpoints": {},
+    "api_calls": 0,
+    "retries": 0,
+    "errors": 0,
+    "bytes": 0,
+    "cache_hits": 0,
+}
+phase_stack = threading.local()
+
+
+class RiskSection(NamedTuple):
+    """One section of a report's risk data, such as 'csp' or 'retire'."""
+
+    total: int
+    items: Tuple[Tuple[str, Any], ...]
+
+    def get(self, key: str, default: Any = 0) -> Any:
+        """Returns the score of a single item in the section.
+
+        Args:
+            key: The item's name.
+            default: The value to return if the item isn't present.
+
+        Returns:
+            The item's score.
+        """
+        for name, value in self.items:
+            if name == key:
+                return value
+
+        return default
+
+
+class RiskBreakdown(NamedTuple):
+    """The risk data of a report version. Sections the report doesn't have are
+    None; sections mrxcavator doesn't know about are kept in 'other'."""
+
+    total: int
+    csp: Optional[RiskSection]
+    retire: Optional[RiskSection]
+    webstore: Optional[RiskSection]
+    permissions: Optional[RiskSection]
+    optional_permissions: Optional[RiskSection]
+    other: Tuple[Tuple[str, RiskSection], ...]
+
+    def sections(self) -> list:
+        """Returns every section that is present, ordered by name.
+
+        Args:
+            None
+
+        Returns:
+            A list of (name, RiskSection) tuples.
+        """
+        sections = list(self.other)
+
+        for name in self._fields[1:-1]:
+            if getattr(self, name) is not None:
+                sections.append((name, getattr(self, name)))
+
+        return sorted(sections)
+
+
+class WebstoreInfo(NamedTuple):
+    """The Chrome Web Store listing of a report version."""
+
+    name: str
+    website: str
+    last_updated: str
+    rating: float
+
+
+class ReportVersion(NamedTuple):
+    """A single version of an extension tracked by CRXcavator."""
+
+    version: str
+    webstore: WebstoreInfo
+    risk: RiskBreakdown
+    extcalls: Tuple[str, ...]
+
+
+class Extension(NamedTuple):
+    """A CRXcavator extension report, with its versions oldest first."""
+
+    id: str
+    versions: Tuple[ReportVersion, ...]
+
+    @property
+    def latest(self) -> ReportVersion:
+        """The newest version of the extension."""
+        return self.versions[-1]
+
+
+def parse_risk_section(section: Any) -> Optional[RiskSection]:
+    """Returns a RiskSection for a section of a report's risk data.
+
+    Args:
+        section: A dict of a risk section from the API's JSON.
+
+    Returns:
+        A RiskSection, or None if the section isn't a dict.
+    """
+    if not isinstance(section, dict):
+        return None
+
+    items = tuple(
+        (sys.intern(key), value)
+        for key, value in section.items()
+        if key != "total" and isinstance(value, (int, float, str))
+    )
+
+    return RiskSection(section.get("total", 0), items)
+
+
+def parse_risk(risk: dict) -> RiskBreakdown:
+    """Returns a RiskBreakdown for a report version's risk data.
+
+    Args:
+        risk: A dict of a report version's risk data from the API's JSON.
+
+    Returns:
+        A RiskBreakdown.
+    """
+    known = RiskBreakdown._fields[1:-1]
+    other = []
+
+    for name, section in risk.items():
+        if name not in known and isinstance(section, dict):
+            parsed = parse_risk_section(section)
+
+            if parsed is not None:
+                other.append((sys.intern(name), parsed))
+
+    return RiskBreakdown(
+        risk.get("total", 0),
+        parse_risk_section(risk.get("csp")),
+        parse_risk_section(risk.get("retire")),
+        parse_risk_section(risk.get("webstore")),
+        parse_risk_section(risk.get("permissions")),
+        parse_risk_section(risk.get("optional_permissions")),
+        tuple(other),
+    )
+
+
+def parse_report_version(entry: dict) -> ReportVersion:
+    """Returns a ReportVersion for one entry of a CRXcavator report.
+
+    Args:
+        entry: A dict of a report entry from the API's JSON.
+
+    Returns:
+        A ReportVersion.
+    """
+    data = entry.get("data") or {}
+    webstore = data.get("webstore") or {}
+    extcalls = data.get("extcalls") or []
+
+    return ReportVersion(
+        entry.get("version") or "",
+        WebstoreInfo(
+            sys.intern(webstore.get("name") or ""),
+            sys.intern(webstore.get("website") or ""),
+            webstore.get("last_updated") or "",
+            webstore.get("rating") or 0.0,
+        ),
+        parse_risk(data.get("risk") or {}),
+        tuple(sys.intern(url) for url in extcalls if isinstance(url, str)),
+    )
+
+
+def parse_report(results: Any) -> Optional[Extension]:
+    """Returns an Extension built in one pass from a CRXcavator report.
+
+    Only the fields mrxcavator uses are kept, so the raw JSON can be freed.
+    Strings repeated across versions are interned, and versions with the same
+    "external calls" share one tuple.
+
+    Args:
+        results: The decoded JSON of a CRXcavator report.
+
+    Returns:
+        An Extension, or None if the report is empty or malformed.
+    """
+    if not isinstance(results, list):
+        return None
+
+    entries = [entry for entry in results if isinstance(entry, dict)]
+
+    if len(entries) == 0:
+        return None
+
+    versions: list = []
+
+    for entry in entries:
+        version = parse_report_version(entry)
+
+        if versions and version.extcalls == versions[-1].extcalls:
+            version = version._replace(extcalls=versions[-1].extcalls)
+
+        versions.append(version)
+
+    return Extension(entries[-1].get("extension_id") or "", tuple(versions))
 
 
 def extensions_from_file(filename: str) -> list:
@@ -66,6 +432,142 @@ def extensions_from_file(filename: str) -> list:
     return []
 
 
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """Returns the shard index and count of a --shard value such as '2/4'.
+
+    Args:
+        shard: A string of the form 'i/N', where i runs from 1 to N.
+
+    Returns:
+        A tuple of the zero-based shard index and the shard count.
+    """
+    index, _, count = shard.partition("/")
+
+    if not (index.isdigit() and count.isdigit()):
+        error(f"The shard {shard} must look like i/N, e.g. 1/4.", True)
+    elif not 1 <= int(index) <= int(count):
+        error(f"The shard {shard} must be from 1/N to N/N, e.g. 1/4.", True)
+
+    return int(index) - 1, int(count)
+
+
+def non_negative_int(value: str) -> int:
+    """Returns an argparse value as an integer of zero or more.
+
+    Args:
+        value: The command-line value as a string.
+
+    Returns:
+        An integer.
+    """
+    if not value.isdigit():
+        raise argparse.ArgumentTypeError(f"'{value}' must be 0 or more")
+
+    return int(value)
+
+
+def get_shard(id: str, count: int) -> int:
+    """Returns the zero-based shard an extension belongs to.
+
+    The shard comes from a hash of the identifier alone, so every machine
+    splits the same list identically regardless of its order.
+
+    Args:
+        id: An extension identifier string.
+        count: The number of shards.
+
+    Returns:
+        An integer shard index.
+    """
+    import hashlib
+
+    digest = hashlib.blake2b(id.encode("utf-8"), digest_size=8).digest()
+
+    return int.from_bytes(digest, "big") % count
+
+
+def shard_extensions(extensions: list, shard: Optional[str]) -> list:
+    """Returns the passed-in extensions that belong to a --shard slice.
+
+    Args:
+        extensions: A list of extension dicts.
+        shard: A --shard value such as '2/4', or None for every extension.
+
+    Returns:
+        A list of extension dicts.
+    """
+    if not shard:
+        return extensions
+
+    index, count = parse_shard(shard)
+
+    return [ext for ext in extensions if get_shard(ext["id"], count) == index]
+
+
+def merge_outputs(filenames: list) -> str:
+    """Returns per-shard outputs combined into one fleet result.
+
+    NDJSON files (from --diff --ndjson or a .jsonl archive) are merged line
+    by line, and JSON objects keyed by extension identifier (such as --diff
+    snapshots) are merged key by key. A record seen in more than one file is
+    kept once, with the later file winning.
+
+    Args:
+        filenames: A list of output filenames.
+
+    Returns:
+        A string of the merged NDJSON, or of the merged JSON object.
+    """
+    import gzip
+
+    records: dict = {}
+    merged: dict = {}
+
+    for filename in filenames:
+        opener: Any = gzip.open if filename.endswith(".gz") else open
+
+        try:
+            with opener(filename, "rt", encoding="utf-8") as fileHandle:
+                content = fileHandle.read()
+        except (IOError, OSError):
+            error(f"Cannot read {filename}. Please check permissions.", True)
+
+        try:
+            document = json.loads(content)
+        except ValueError:
+            document = None
+
+        if isinstance(document, dict) and "id" not in document:
+            merged.update(document)
+            continue
+
+        for number, line in enumerate(content.splitlines(), 1):
+            if line.strip() == "":
+                continue
+
+            try:
+                record = json.loads(line)
+            except ValueError:
+                error(f"Line {number} of {filename} isn't valid JSON.", True)
+
+            if not isinstance(record, dict):
+                error(
+                    f"Line {number} of {filename} isn't a JSON object.", True
+                )
+
+            key = (record.get("id"), record.get("change"), record.get("rule"))
+            records[key] = record
+
+    if merged and records:
+        error("NDJSON and JSON object outputs can't be merged together.", True)
+    elif merged:
+        return json.dumps(merged, sort_keys=True, separators=(",", ":"))
+
+    ordered = sorted(records.values(), key=lambda record: record.get("id", ""))
+
+    return "".join(json.dumps(record) + "\n" for record in ordered)
+
+
 def get_extcalls(results: list) -> list:
     """Returns a list of unique, valid URIs based on the passed-in list.
 
@@ -75,15 +577,24 @@ def get_extcalls(results: list) -> list:
     Returns:
         A list of items.
     """
-    data = []
+    import validators  # type: ignore
+
+    data: dict = {}
+    domains: dict = {}
 
     for url in results:
+        if url in data:
+            continue
+
         netloc = urlparse(url).netloc
 
-        if validators.domain(netloc) and url not in data:
-            data.append(url)
+        if netloc not in domains:
+            domains[netloc] = bool(validators.domain(netloc))
+
+        if domains[netloc]:
+            data[url] = True
 
-    return data
+    return list(data)
 
 
 def chunker(seq: list, size: int) -> Generator:
@@ -125,29 +636,74 @@ def get_root_dir() -> str:
     return os.path.expanduser(f"{ROOT_DIR}/")
 
 
-def get_virustotal(report: dict, key: str) -> list:
-    """Returns a list of VirusTotal results for the passed-in hostnames.
+def get_virustotal_hosts(report: Extension) -> Tuple[list, list]:
+    """Returns the hostnames of an extension's "external calls" that should be
+    looked up on VirusTotal, and those that are blocklisted.
 
     Args:
-        report: A dict of a CRXcavator extension report.
-        key: The VirusTotal API key as a string.
+        report: An Extension of a CRXcavator extension report.
 
     Returns:
-        A list of VirusTotal results for passed-in hostnames.
+        A tuple of a list of hostnames to look up and a list of blocklisted
+        hostnames.
     """
-    if "extcalls" not in report[-1]["data"]:
-        return []
+    import validators  # type: ignore
 
-    urls = report[-1]["data"]["extcalls"]
-
-    data = []
-    for url in urls:
+    data: list = []
+    blocked: list = []
+    for url in report.latest.extcalls:
         netloc = urlparse(url).netloc
 
-        if validators.domain(netloc) and netloc not in data:
+        if (
+            netloc in data
+            or netloc in blocked
+            or not validators.domain(netloc)
+        ):
+            continue
+
+        listing = get_host_listing(netloc)
+
+        if listing == "blocked":
+            blocked.append(netloc)
+        elif listing != "allowed":
             data.append(netloc)
 
-    seconds = (130 * math.ceil(len(data) / 4)) - 65
+    return data, blocked
+
+
+def get_virustotal_seconds(hosts: int, throttle: float) -> float:
+    """Returns how long looking up hostnames on VirusTotal takes when each
+    group of 4 hostnames is throttled.
+
+    Args:
+        hosts: The number of hostnames to look up.
+        throttle: The seconds to wait between VirusTotal API calls.
+
+    Returns:
+        A number of seconds.
+    """
+    return max((2 * throttle * math.ceil(hosts / 4)) - throttle, 0)
+
+
+def get_virustotal(report: Extension, key: str) -> list:
+    """Returns a list of VirusTotal results for the passed-in hostnames.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+        key: The VirusTotal API key as a string.
+
+    Returns:
+        A list of VirusTotal results for passed-in hostnames.
+    """
+    data, blocked = get_virustotal_hosts(report)
+
+    results = [
+        {"url": host, "vt": {"positives": "blocklisted", "total": "-"}}
+        for host in blocked
+    ]
+
+    throttle = VIRUSTOTAL_THROTTLE if offline_bundle is None else 0
+    seconds = get_virustotal_seconds(len(data), throttle)
     duration = str(datetime.timedelta(seconds=seconds))
 
     print(
@@ -157,7 +713,6 @@ def get_virustotal(report: dict, key: str) -> list:
 
     print(f"Processing {len(data)} hosts...")
 
-    results = []
     first_chunk = 1
 
     for group in chunker(data, 4):
@@ -166,13 +721,17 @@ def get_virustotal(report: dict, key: str) -> list:
         if first_chunk == 1:
             first_chunk = 0
         else:
-            time.sleep(65)
+            with timed("throttle"):
+                time.sleep(throttle)
 
         submit_virustotal(group, key)
-        time.sleep(65)
-        results.append(get_virustotal_reports(group, key))
 
-    return list(itertools.chain(*results))
+        with timed("throttle"):
+            time.sleep(throttle)
+
+        results += get_virustotal_reports(group, key)
+
+    return results
 
 
 def get_virustotal_table(results: list) -> None:
@@ -184,6 +743,8 @@ def get_virustotal_table(results: list) -> None:
     Returns:
         None.
     """
+    import termtables  # type: ignore
+
     if len(results) == 0:
         error("No external calls were found for this extension.", True)
 
@@ -199,13 +760,14 @@ def get_virustotal_table(results: list) -> None:
         "\033[1mTotal\033[0m",
     ]
 
-    termtables.print(
-        data,
-        header=header,
-        style=termtables.styles.thin_double,
-        padding=(0, 1),
-        alignment="lll",
-    )
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="lll",
+        )
 
 
 def submit_virustotal(hosts: list, key: str) -> bool:
@@ -218,15 +780,10 @@ def submit_virustotal(hosts: list, key: str) -> bool:
     Returns:
         A boolean.
     """
-    if call_api(
-        "/virustotal/report",
-        "POST",
-        {"apiKey": key, "urls": hosts},
-        {},
-    ):
+    if offline_bundle is not None:
         return True
-    else:
-        return False
+
+    return call_client("submit_virustotal", hosts, virustotal_key=key)
 
 
 def get_virustotal_reports(hosts: list, key: str) -> dict:
@@ -239,12 +796,15 @@ def get_virustotal_reports(hosts: list, key: str) -> dict:
     Returns:
         A dict of VirusTotal results for passed-in hostnames.
     """
-    reports = call_api(
-        "/virustotal/results",
-        "POST",
-        {"apiKey": key, "urls": hosts},
-        {},
-    )
+    if offline_bundle is not None:
+        return get_offline_results(
+            "/virustotal/results", "POST", {"urls": hosts}
+        )
+
+    reports = call_client("virustotal_results", hosts, virustotal_key=key)
+
+    if reports:
+        save_virustotal_verdicts(reports)
 
     if reports:
         return reports
@@ -252,835 +812,6382 @@ def get_virustotal_reports(hosts: list, key: str) -> dict:
         return {}
 
 
-def extension_is_ignored(id: str) -> bool:
-    """Returns a boolean to designate if a passed-in extension ID is within the
-    ignored list or not. These ignored extensions are ones that get installed
-    by Google and normally "hidden" from view (i.e. chrome:///extensions)
+def load_virustotal_verdicts() -> dict:
+    """Returns the VirusTotal verdicts stored by earlier runs.
 
     Args:
-        id: An extension identifier string.
+        None
 
     Returns:
-        A boolean result.
+        A dict of [timestamp, result] lists keyed by hostname.
     """
-    ignored = [
-        "nmmhkkegccagdldgiimedpiccmgmieda",
-        "pkedcjkdefgpdelpbcmbmeomcjbeemfm",
-    ]
+    try:
+        with open(get_root_dir() + VIRUSTOTAL_FILE) as fileHandle:
+            verdicts = json.load(fileHandle)
+    except (IOError, ValueError):
+        verdicts = {}
 
-    if id in ignored:
-        return True
-    else:
-        return False
+    return verdicts if isinstance(verdicts, dict) else {}
 
 
-def error(message: str, fatal=False) -> bool:
-    """Prints a passed-in message and then exits with False or a failure exit.
+def save_virustotal_verdicts(results: Any) -> bool:
+    """Stores VirusTotal verdicts so they can be exported to an offline
+    snapshot bundle.
 
     Args:
-        message: A message string.
+        results: A list of VirusTotal results from the API.
 
     Returns:
-        False or exits the application with a failure status code.
+        A boolean result.
     """
-    print(f"\n\t{message}\n")
-    if fatal is True:
-        sys.exit(1)
-    else:
+    if not isinstance(results, list):
         return False
 
+    verdicts = load_virustotal_verdicts()
 
-def call_api(end_point: str, method: str, values=None, headers=None) -> dict:
-    """Calls an API endpoint with a passed-in HTTP method and an optional dict
-    of values for APIs that required parameters to be sent in the request.
+    for result in results:
+        if isinstance(result, dict) and "url" in result:
+            verdicts[result["url"]] = [int(time.time()), result]
+
+    os.makedirs(get_root_dir(), exist_ok=True)
+
+    return write_atomic(
+        get_root_dir() + VIRUSTOTAL_FILE, json.dumps(verdicts, sort_keys=True)
+    )
+
+
+def extension_is_ignored(id: str) -> bool:
+    """Returns a boolean to designate if a passed-in extension ID is within the
+    ignored list or not. These ignored extensions are ones that get installed
+    by Google and normally "hidden" from view (i.e. chrome:///extensions)
 
     Args:
-        end_point: An API endpoint path string.
-        method: The HTTP method string to use for the API call.
-        values: An optional dict of values to pass as API parameters.
-        headers: An optional dict of headers to pass to the API.
+        id: An extension identifier string.
 
     Returns:
-        A dict of API results or an empty dict.
+        A boolean result.
     """
-    endpoint = config.get("custom", "crxcavator_api_uri") + end_point
+    return id in IGNORED_EXTENSIONS
 
-    if method == "GET":
-        response = requests.get(endpoint, json=values, headers=headers)
-    elif method == "POST":
-        response = requests.post(endpoint, json=values, headers=headers)
-    else:
-        error(f"'{method}' is not a valid HTTP method.", True)
 
-    if response.status_code == 200:
-        return json.loads(response.content.decode("utf-8"))
-    elif response.status_code == 401:
-        error("401 - API Not Authorized - Please check your API token.", True)
-    elif response.status_code == 403:
-        error("403 - API Error - Please check your API parameters.", True)
-    elif response.status_code == 404:
-        error("404 - API Not Found - Check your API configuration.", True)
-    elif response.status_code == 500:
-        error("500 - Server Error - Check your API configuration.", True)
-    elif response.status_code == 502:
-        error("502 - Bad Gateway - Retrying in five seconds...", False)
-        time.sleep(5)
-        call_api(end_point, method, values, headers)
-    else:
-        error("An unknown API error has occurred.", True)
+class MembershipList(NamedTuple):
+    """A compiled allowlist or blocklist, memory-mapped from its index file.
 
-    return {}
+    Extension IDs are stored as sorted 16-byte records (each ID character is
+    one of 16 letters, so it packs into a nibble), and hostnames as a sorted
+    blob with an offset table. Both are searched with a binary search, so
+    lookups are exact and loading doesn't depend on the size of the list.
+    """
 
+    data: Any
+    ids: int
+    hosts: int
 
-def version_count(report: dict) -> int:
-    """Returns a count of CRXcavator-tracked versions for an extension.
+    def record(self, index: int) -> bytes:
+        """Returns the packed extension ID at the passed-in index.
+
+        Args:
+            index: The index of the record.
+
+        Returns:
+            16 bytes of the packed extension ID.
+        """
+        start = LIST_HEADER.size + index * 16
+        end = start + 16
+
+        return self.data[start:end]
+
+    def hostname(self, index: int) -> bytes:
+        """Returns the hostname at the passed-in index.
+
+        Args:
+            index: The index of the hostname.
+
+        Returns:
+            The hostname as UTF-8 bytes.
+        """
+        table = LIST_HEADER.size + self.ids * 16
+        blob = table + (self.hosts + 1) * 8
+        start, end = struct.unpack_from("<QQ", self.data, table + index * 8)
+        start += blob
+        end += blob
+
+        return self.data[start:end]
+
+    def has_id(self, id: str) -> bool:
+        """Returns whether the list holds an extension ID.
+
+        Args:
+            id: An extension identifier string.
+
+        Returns:
+            A boolean result.
+        """
+        key = pack_extension_id(id)
+
+        if key is None:
+            return False
+
+        return search_sorted(self.record, self.ids, key)
+
+    def has_host(self, host: str) -> bool:
+        """Returns whether the list holds a hostname or any of its parent
+        domains, so 'example.com' also matches 'cdn.example.com'.
+
+        Args:
+            host: A hostname string.
+
+        Returns:
+            A boolean result.
+        """
+        labels = host.lower().rstrip(".").split(".")
+
+        for index in range(len(labels)):
+            key = ".".join(labels[index:]).encode("utf-8")
+
+            if search_sorted(self.hostname, self.hosts, key):
+                return True
+
+        return False
+
+
+def search_sorted(read: Any, count: int, key: bytes) -> bool:
+    """Returns whether a sorted sequence of byte strings holds the key.
 
     Args:
-        report: A dict of a CRXcavator extension report.
+        read: A function returning the item at an index.
+        count: The number of items.
+        key: The byte string to look for.
 
     Returns:
-        An integer count of versions.
+        A boolean result.
     """
-    total = 0
+    low, high = 0, count
 
-    for entry in report:
-        if entry["version"]:
-            total += 1
+    while low < high:
+        middle = (low + high) // 2
+        item = read(middle)
 
-    return total
+        if item == key:
+            return True
+        elif item < key:
+            low = middle + 1
+        else:
+            high = middle
 
+    return False
 
-def export_report(id: str, report: str, filename: str) -> bool:
-    """Exports a report summary to a file.
+
+def pack_extension_id(id: str) -> Optional[bytes]:
+    """Returns an extension ID packed into 16 bytes.
 
     Args:
         id: An extension identifier string.
-        report: A string of the report summary.
-        filename: The chosen filename as a string.
+
+    Returns:
+        16 bytes, or None if the string isn't an extension ID.
+    """
+    if not EXTENSION_ID.fullmatch(id):
+        return None
+
+    return bytes.fromhex(id.translate(EXTENSION_ID_HEX))
+
+
+def get_list_index(kind: str) -> str:
+    """Returns the filesystem path of a compiled allowlist or blocklist.
+
+    Args:
+        kind: Either 'allowlist' or 'blocklist'.
+
+    Returns:
+        A string for the path of the index file.
+    """
+    return f"{get_root_dir()}{kind}.idx"
+
+
+def compile_membership_list(source: str, index: str) -> Tuple[int, int]:
+    """Compiles a text file of extension IDs and hostnames into an index.
+
+    The file holds one entry per line, and '#' starts a comment. Entries of
+    32 letters from 'a' to 'p' are extension IDs; anything else is a
+    hostname, and URLs and '*.' wildcards are reduced to their hostname.
+
+    Args:
+        source: The filename of the text list.
+        index: The filename of the index to write.
+
+    Returns:
+        A tuple of the number of extension IDs and hostnames.
+    """
+    from array import array
+
+    ids = set()
+    hosts = set()
+
+    try:
+        status = os.stat(source)
+
+        with open(source, encoding="utf-8") as fileHandle:
+            for line in fileHandle:
+                entry = line.split("#", 1)[0].strip().lower()
+
+                if entry == "":
+                    continue
+
+                key = pack_extension_id(entry)
+
+                if key is not None:
+                    ids.add(key)
+                    continue
+
+                if "://" in entry:
+                    entry = urlparse(entry).hostname or ""
+
+                entry = entry.strip(".")
+
+                if entry.startswith("*."):
+                    entry = entry[2:]
+
+                if entry:
+                    hosts.add(entry.encode("utf-8"))
+    except (IOError, UnicodeDecodeError):
+        error(f"Cannot read {source}. Please check permissions.", True)
+
+    names = sorted(hosts)
+    offsets = array("Q", [0])
+    offsets.extend(itertools.accumulate(map(len, names)))
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    header = LIST_HEADER.pack(
+        LIST_MAGIC,
+        status.st_size,
+        status.st_mtime_ns,
+        len(ids),
+        len(names),
+    )
+
+    os.makedirs(os.path.dirname(index), exist_ok=True)
+    write_atomic(
+        index,
+        b"".join(
+            [header, b"".join(sorted(ids)), offsets.tobytes(), b"".join(names)]
+        ),
+    )
+
+    return len(ids), len(names)
+
+
+def get_membership_list(kind: str) -> Optional[MembershipList]:
+    """Returns the configured allowlist or blocklist, compiling its index
+    again whenever the text list has changed.
+
+    Args:
+        kind: Either 'allowlist' or 'blocklist'.
+
+    Returns:
+        A MembershipList, or None if no list is configured.
+    """
+    import mmap
+
+    if kind in membership_lists:
+        return membership_lists[kind]
+
+    membership_lists[kind] = None
+    source = config.get("custom", kind, fallback="")
+
+    if source == "":
+        return None
+
+    try:
+        status = os.stat(source)
+    except OSError:
+        error(f"The {kind} {source} does not exist.")
+        return None
+
+    index = get_list_index(kind)
+
+    for attempt in range(2):
+        try:
+            with open(index, "rb") as fileHandle:
+                data = mmap.mmap(
+                    fileHandle.fileno(), 0, access=mmap.ACCESS_READ
+                )
+            magic, size, mtime, ids, hosts = LIST_HEADER.unpack_from(data)
+        except (IOError, OSError, ValueError, struct.error):
+            magic = b""
+
+        if magic == LIST_MAGIC and (size, mtime) == (
+            status.st_size,
+            status.st_mtime_ns,
+        ):
+            membership_lists[kind] = MembershipList(data, ids, hosts)
+            break
+
+        compile_membership_list(source, index)
+
+    return membership_lists[kind]
+
+
+def get_extension_listing(id: str) -> str:
+    """Returns whether an extension ID is on the blocklist or allowlist.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        'blocked', 'allowed' or an empty string. The blocklist wins if an ID
+        is on both lists.
+    """
+    for kind, listing in (("blocklist", "blocked"), ("allowlist", "allowed")):
+        entries = get_membership_list(kind)
+
+        if entries is not None and entries.has_id(id):
+            return listing
+
+    return ""
+
+
+def get_host_listing(host: str) -> str:
+    """Returns whether a hostname is on the blocklist or allowlist.
+
+    Args:
+        host: A hostname string.
+
+    Returns:
+        'blocked', 'allowed' or an empty string. The blocklist wins if a host
+        is on both lists.
+    """
+    for kind, listing in (("blocklist", "blocked"), ("allowlist", "allowed")):
+        entries = get_membership_list(kind)
+
+        if entries is not None and entries.has_host(host):
+            return listing
+
+    return ""
+
+
+def screen_extensions(extensions: list) -> list:
+    """Returns the passed-in extensions that aren't on the allowlist or the
+    blocklist, so batch runs make no API calls for listed extensions.
+    Blocklisted extensions are flagged on the way.
+
+    Args:
+        extensions: A list of extension dicts.
+
+    Returns:
+        A list of extension dicts.
+    """
+    remaining = []
+    allowed = 0
+    blocked = []
+
+    for extension in extensions:
+        listing = get_extension_listing(extension["id"])
+
+        if listing == "allowed":
+            allowed += 1
+        elif listing == "blocked":
+            blocked.append(f"{extension['name']} ({extension['id']})")
+        else:
+            remaining.append(extension)
+
+    if blocked:
+        blocked.sort()
+        print("\nBlocklisted:\n  > " + "\n  > ".join(blocked) + "\n")
+
+    if allowed:
+        print(f"\n  Skipped {allowed} allowlisted extensions.\n")
+
+    return remaining
+
+
+class MrxcavatorError(Exception):
+    """The base class of the exceptions that AsyncClient and the other
+    library entry points raise instead of exiting."""
+
+
+class APIError(MrxcavatorError):
+    """An API call that failed.
+
+    Attributes:
+        status: The HTTP status code, or 0 if the API couldn't be reached.
+        retry_after: The seconds to wait before retrying, or None if the call
+            shouldn't be retried.
+    """
+
+    def __init__(
+        self, message: str, status: int = 0, retry_after: Any = None
+    ) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+def error(message: str, fatal=False) -> bool:
+    """Prints a passed-in message and then exits with False or a failure exit.
+
+    Args:
+        message: A message string.
+
+    Returns:
+        False or exits the application with a failure status code.
+    """
+    print(f"\n\t{message}\n")
+    if fatal is True:
+        sys.exit(1)
+    else:
+        return False
+
+
+class Transport:
+    """Sends the HTTP requests of API calls over a shared, pooled client.
+
+    The default 'requests' backend sends one request per connection at a
+    time. The optional 'httpx' backend (pip install 'httpx[http2]')
+    negotiates HTTP/2 with HTTPS servers and multiplexes the in-flight
+    requests of every thread over a single connection.
+    """
+
+    def __init__(
+        self, name: str = "requests", connections: int = TRANSPORT_CONNECTIONS
+    ) -> None:
+        """Creates the backend's client.
+
+        Args:
+            name: The backend's name, one of TRANSPORTS.
+            connections: The number of connections kept for reuse.
+
+        Returns:
+            None.
+
+        Raises:
+            MrxcavatorError: The backend is unknown or not installed.
+        """
+        self.name = name
+
+        if name == "requests":
+            import requests
+
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=connections)
+            self.client: Any = requests.Session()
+            self.client.mount("http://", adapter)
+            self.client.mount("https://", adapter)
+            self.errors: tuple = (requests.exceptions.ConnectionError,)
+        elif name == "httpx":
+            try:
+                import httpx  # type: ignore
+
+                self.client = httpx.Client(http2=True, timeout=None)
+            except ImportError:
+                raise MrxcavatorError(
+                    "The httpx transport needs httpx with HTTP/2 support: "
+                    "pip install 'httpx[http2]'"
+                ) from None
+
+            self.errors = (httpx.TransportError,)
+        else:
+            raise MrxcavatorError(
+                f"'{name}' is not a valid transport. Choose one of: "
+                f"{', '.join(TRANSPORTS)}."
+            )
+
+    def request(self, method: str, uri: str, values=None, headers=None) -> Any:
+        """Sends an HTTP request with an optional JSON body.
+
+        Args:
+            method: The HTTP method string to use.
+            uri: The full URI string to send the request to.
+            values: An optional dict of values to send as a JSON body.
+            headers: An optional dict of headers to send.
+
+        Returns:
+            A response object with status_code, headers and content.
+        """
+        return self.client.request(method, uri, json=values, headers=headers)
+
+    def close(self) -> None:
+        """Closes the backend's pooled connections.
+
+        Args:
+            None
+
+        Returns:
+            None.
+        """
+        self.client.close()
+
+
+def get_transport() -> Transport:
+    """Returns the shared HTTP transport so that API calls reuse connections.
+
+    Args:
+        None
+
+    Returns:
+        A Transport for the configured backend.
+    """
+    global transport
+
+    if transport is None:
+        try:
+            transport = Transport(
+                config.get("custom", "transport", fallback="requests")
+            )
+        except MrxcavatorError as failure:
+            error(str(failure), True)
+
+    return transport
+
+
+def use_daemon() -> bool:
+    """Returns a boolean for whether calls should be routed to a daemon.
+
+    Args:
+        None
+
+    Returns:
+        A boolean result.
+    """
+    daemon_uri = config.get("custom", "daemon_uri", fallback="")
+
+    if daemon_uri and daemon_available and not serving and not offline_bundle:
+        return True
+    else:
+        return False
+
+
+def get_api_uri() -> str:
+    """Returns the base URI that API calls should be sent to. When a daemon URI
+    is configured (and this process is not the daemon), calls are routed to it.
+
+    Args:
+        None
+
+    Returns:
+        A string for the base URI of API calls.
+    """
+    if use_daemon():
+        return config.get("custom", "daemon_uri")
+
+    return config.get("custom", "crxcavator_api_uri")
+
+
+def api_request(end_point: str, method: str, values=None, headers=None) -> Any:
+    """Sends an HTTP request to an API endpoint and returns the raw response.
+
+    Args:
+        end_point: An API endpoint path string.
+        method: The HTTP method string to use for the API call.
+        values: An optional dict of values to pass as API parameters.
+        headers: An optional dict of headers to pass to the API.
+
+    Returns:
+        A response object from the configured Transport.
+
+    Raises:
+        APIError: Neither the daemon nor the API could be reached.
+    """
+    global daemon_available
+
+    endpoint = get_api_uri() + end_point
+
+    if method not in ["GET", "POST"]:
+        error(f"'{method}' is not a valid HTTP method.", True)
+
+    try:
+        with timed("network"):
+            start = time.perf_counter()
+            response = get_transport().request(
+                method, endpoint, values, headers
+            )
+            record_api_call(end_point, time.perf_counter() - start, response)
+
+        return response
+    except get_transport().errors:
+        if not use_daemon():
+            raise APIError(f"The API at {get_api_uri()} is unreachable.")
+
+        error("The mrxcavator daemon is unreachable. Using the API directly.")
+        daemon_available = False
+
+        return api_request(end_point, method, values, headers)
+
+
+@contextmanager
+def timed(phase: str) -> Generator:
+    """Records the wall time spent within a named phase of a run. Time spent
+    in a nested phase is only counted towards the innermost phase.
+
+    Args:
+        phase: The name of the phase as a string.
+
+    Returns:
+        A context manager (or decorator) that times the phase.
+    """
+    if not hasattr(phase_stack, "frames"):
+        phase_stack.frames = []
+
+    start = time.perf_counter()
+    phase_stack.frames.append(0.0)
+
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        nested = phase_stack.frames.pop()
+
+        phases = timings["phases"]
+        phases[phase] = phases.get(phase, 0.0) + elapsed - nested
+
+        if phase_stack.frames:
+            phase_stack.frames[-1] += elapsed
+
+
+def record_api_call(end_point: str, elapsed: float, response: Any) -> None:
+    """Records the latency and size of an API call for its endpoint.
+
+    Args:
+        end_point: An API endpoint path string.
+        elapsed: The number of seconds the API call took.
+        response: The response object of the API call.
+
+    Returns:
+        None.
+    """
+    name = re.sub("/[a-p]{32}", "/<id>", end_point) or "/"
+
+    timings["endpoints"].setdefault(name, []).append(elapsed)
+    timings["api_calls"] += 1
+    timings["bytes"] += len(response.content)
+
+
+def percentile(values: list, percent: float) -> float:
+    """Returns the nearest-rank percentile of the passed-in values.
+
+    Args:
+        values: A sorted list of numbers.
+        percent: The percentile to return, from 0 to 100.
+
+    Returns:
+        The value at the percentile.
+    """
+    rank = max(math.ceil(percent / 100 * len(values)), 1)
+
+    return values[rank - 1]
+
+
+def get_timings() -> dict:
+    """Returns a summary of the timings and API statistics of this run.
+
+    Args:
+        None
+
+    Returns:
+        A dict of per-phase wall times, per-endpoint latency percentiles and
+        API counters.
+    """
+    duration = time.perf_counter() - timings["start"]
+    phases = dict(timings["phases"])
+    phases["other"] = max(duration - sum(phases.values()), 0.0)
+
+    endpoints = {}
+    for name, latencies in timings["endpoints"].items():
+        latencies = sorted(latencies)
+        endpoints[name] = {
+            "calls": len(latencies),
+            "p50": percentile(latencies, 50),
+            "p90": percentile(latencies, 90),
+            "p99": percentile(latencies, 99),
+            "max": latencies[-1],
+        }
+
+    return {
+        "duration": duration,
+        "phases": phases,
+        "endpoints": endpoints,
+        "api_calls": timings["api_calls"],
+        "retries": timings["retries"],
+        "errors": timings["errors"],
+        "bytes": timings["bytes"],
+        "cache_hits": timings["cache_hits"],
+    }
+
+
+def print_timings() -> None:
+    """Prints a summary of the timings and API statistics of this run.
+
+    Args:
+        None
+
+    Returns:
+        None.
+    """
+    summary = get_timings()
+
+    output = f"\nTimings ({summary['duration']:.3f}s)\n{'='*60}"
+    for phase, elapsed in sorted(
+        summary["phases"].items(), key=lambda item: item[1], reverse=True
+    ):
+        output += f"\n  {elapsed:.3f}s\t{phase}"
+
+    if summary["endpoints"]:
+        output += f"\n\n\nAPI Latency (ms)\n{'='*60}"
+        output += f"\n  Calls\tp50\tp90\tp99\tMax\tEndpoint\n{'-'*60}"
+
+        for name, stats in sorted(summary["endpoints"].items()):
+            output += f"\n  {stats['calls']}"
+            for key in ["p50", "p90", "p99", "max"]:
+                output += f"\t{stats[key] * 1000:.0f}"
+            output += f"\t{name}"
+
+    output += f"\n\n\nAPI Statistics\n{'='*60}"
+    output += f"\n  {summary['api_calls']}\tCalls"
+    output += f"\n  {summary['retries']}\tRetries"
+    output += f"\n  {summary['errors']}\tErrors"
+    output += f"\n  {summary['bytes']}\tBytes Received"
+    output += f"\n  {summary['cache_hits']}\tCache Hits"
+
+    print(output + "\n", file=sys.stderr)
+
+
+def write_timings(filename: str) -> None:
+    """Writes a JSON summary of the timings and API statistics of this run.
+
+    Args:
+        filename: The chosen filename as a string.
+
+    Returns:
+        None.
+    """
+    try:
+        with open(filename, "w") as fileHandle:
+            json.dump(get_timings(), fileHandle, indent=2)
+    except IOError:
+        error(f"Cannot write to {filename} -  check permissions.")
+
+
+def start_profile(filename: str) -> None:
+    """Profiles the rest of this run with cProfile and saves the stats file
+    to the passed-in filename when mrxcavator exits.
+
+    Args:
+        filename: The chosen filename as a string.
+
+    Returns:
+        None.
+    """
+    import cProfile
+
+    profile = cProfile.Profile()
+
+    def save_profile() -> None:
+        profile.disable()
+        profile.dump_stats(filename)
+        print(f"\n>> Profile saved in {filename} <<\n", file=sys.stderr)
+
+    atexit.register(save_profile)
+    profile.enable()
+
+
+def get_api_results(response: Any) -> Any:
+    """Returns the decoded JSON of a successful API response.
+
+    Args:
+        response: A response object from a Transport.
+
+    Returns:
+        The decoded JSON of the response.
+
+    Raises:
+        APIError: The API returned an error status or invalid JSON. Bad
+            gateway and rate limit errors carry a retry_after delay.
+    """
+    status = response.status_code
+
+    if status == 200:
+        try:
+            return json.loads(response.content.decode("utf-8"))
+        except ValueError:
+            raise APIError("The API returned invalid JSON.", status) from None
+    elif status == 401:
+        message = "401 - API Not Authorized - Please check your API token."
+    elif status == 403:
+        message = "403 - API Error - Please check your API parameters."
+    elif status == 404:
+        message = "404 - API Not Found - Check your API configuration."
+    elif status == 500:
+        message = "500 - Server Error - Check your API configuration."
+    elif status == 502:
+        raise APIError("502 - Bad Gateway", status, 5)
+    elif status == 429:
+        delay = response.headers.get("Retry-After", "5")
+        delay = int(delay) if delay.isdigit() else 5
+
+        raise APIError("429 - Rate Limited", status, delay)
+    else:
+        message = f"{status} - An unknown API error has occurred."
+
+    raise APIError(message, status)
+
+
+class RateLimiter:
+    """Limits the API calls of one or more AsyncClients to a number in flight
+    at once and, optionally, a number started per second. A rate limit
+    response pauses every call that shares the limiter.
+
+    The limiter must be used from a single event loop.
+    """
+
+    def __init__(
+        self, rate: float = 0, concurrency: int = ASYNC_CONCURRENCY
+    ) -> None:
+        """Creates a limiter.
+
+        Args:
+            rate: The calls to start per second, or 0 for no limit.
+            concurrency: The number of calls in flight at once.
+
+        Returns:
+            None.
+        """
+        self.rate = rate
+        self.concurrency = concurrency
+        self.slots: Any = None
+        self.next_start = 0.0
+
+    async def __aenter__(self) -> "RateLimiter":
+        import asyncio
+
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.concurrency)
+
+        await self.slots.acquire()
+
+        now = time.monotonic()
+        start = max(now, self.next_start)
+
+        if self.rate > 0:
+            self.next_start = start + 1 / self.rate
+
+        if start > now:
+            await asyncio.sleep(start - now)
+
+        return self
+
+    async def __aexit__(self, kind: Any, value: Any, traceback: Any) -> None:
+        self.slots.release()
+
+    def pause(self, seconds: float) -> None:
+        """Holds back the calls that haven't started yet.
+
+        Args:
+            seconds: The number of seconds to wait from now.
+
+        Returns:
+            None.
+        """
+        self.next_start = max(self.next_start, time.monotonic() + seconds)
+
+
+class AsyncClient:
+    """An asyncio client for the CRXcavator API, for embedding mrxcavator in
+    other services. It raises MrxcavatorError (or APIError) instead of
+    exiting and returns data instead of printing.
+
+    Every call goes through a RateLimiter, which can be shared by several
+    clients, so thousands of calls can be awaited at once. Bad gateway and
+    rate limit errors are retried. With the 'httpx' transport calls are
+    multiplexed over HTTP/2; with 'requests' they run on worker threads.
+
+        async with AsyncClient(api_key=key) as client:
+            reports = await asyncio.gather(*map(client.report, ids))
+    """
+
+    def __init__(
+        self,
+        api_uri: str = CRXCAVATOR_API_URI,
+        api_key: str = "",
+        virustotal_key: str = "",
+        transport: str = "requests",
+        limiter: Optional[RateLimiter] = None,
+        retries: int = ASYNC_RETRIES,
+    ) -> None:
+        """Creates a client.
+
+        Args:
+            api_uri: The base URI of the CRXcavator API.
+            api_key: A CRXcavator API key, needed by test_crxcavator_key().
+            virustotal_key: A VirusTotal API key, needed by the VirusTotal
+                calls.
+            transport: The HTTP transport's name, one of TRANSPORTS.
+            limiter: A RateLimiter to share, or None for a default one.
+            retries: The number of times a retryable error is retried.
+
+        Returns:
+            None.
+
+        Raises:
+            MrxcavatorError: The transport is unknown or not installed.
+        """
+        self.api_uri = api_uri.rstrip("/")
+        self.api_key = api_key
+        self.virustotal_key = virustotal_key
+        self.limiter = limiter if limiter is not None else RateLimiter()
+        self.retries = retries
+        self.http: Any = None
+        self.executor: Any = None
+        self.transport = Transport(transport, self.limiter.concurrency)
+        self.errors = self.transport.errors
+
+        if transport == "httpx":
+            import httpx  # type: ignore
+
+            self.http = httpx.AsyncClient(http2=True, timeout=None)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            self.executor = ThreadPoolExecutor(self.limiter.concurrency)
+
+    @classmethod
+    def from_config(cls, filename: str = "", **options: Any) -> "AsyncClient":
+        """Creates a client from an mrxcavator configuration file.
+
+        Args:
+            filename: The configuration filename, or an empty string for
+                ~/.mrxcavator/config.ini.
+            options: Other AsyncClient arguments, such as a shared limiter.
+
+        Returns:
+            An AsyncClient.
+
+        Raises:
+            MrxcavatorError: The configuration file can't be read.
+        """
+        settings = configparser.ConfigParser()
+        filename = filename or get_root_dir() + "config.ini"
+
+        if not settings.read(filename) or not settings.has_section("custom"):
+            raise MrxcavatorError(f"Cannot read the configuration {filename}.")
+
+        custom = settings["custom"]
+
+        return cls(
+            api_uri=custom.get("crxcavator_api_uri", CRXCAVATOR_API_URI),
+            api_key=custom.get("crxcavator_api_key", ""),
+            virustotal_key=custom.get("virustotal_api_key", ""),
+            transport=custom.get("transport", "requests"),
+            **options,
+        )
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, kind: Any, value: Any, traceback: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes the client's connections and worker threads.
+
+        Args:
+            None
+
+        Returns:
+            None.
+        """
+        if self.http is not None:
+            await self.http.aclose()
+        else:
+            self.executor.shutdown(wait=False)
+
+        self.transport.close()
+
+    async def call(
+        self, end_point: str, method: str, values=None, headers=None
+    ) -> Any:
+        """Calls an API endpoint and returns its decoded JSON.
+
+        Args:
+            end_point: An API endpoint path string.
+            method: The HTTP method string to use for the API call.
+            values: An optional dict of values to pass as API parameters.
+            headers: An optional dict of headers to pass to the API.
+
+        Returns:
+            The decoded JSON of the API's response.
+
+        Raises:
+            APIError: The call failed, or was still failing after retries.
+        """
+        import asyncio
+
+        uri = self.api_uri + end_point
+        loop = asyncio.get_event_loop()
+
+        for attempt in range(self.retries + 1):
+            async with self.limiter:
+                start = time.perf_counter()
+
+                try:
+                    if self.http is not None:
+                        response = await self.http.request(
+                            method, uri, json=values, headers=headers
+                        )
+                    else:
+                        response = await loop.run_in_executor(
+                            self.executor,
+                            self.transport.request,
+                            method,
+                            uri,
+                            values,
+                            headers,
+                        )
+                except self.errors:
+                    raise APIError(
+                        f"The API at {self.api_uri} is unreachable."
+                    ) from None
+
+                record_api_call(
+                    end_point, time.perf_counter() - start, response
+                )
+
+            try:
+                return get_api_results(response)
+            except APIError as failure:
+                timings["errors"] += 1
+
+                if failure.retry_after is None or attempt == self.retries:
+                    raise
+
+                timings["retries"] += 1
+
+                if failure.status == 429:
+                    self.limiter.pause(failure.retry_after)
+                else:
+                    await asyncio.sleep(failure.retry_after)
+
+    async def report_results(self, id: str, fresh: bool = False) -> Any:
+        """Requests an extension's CRXcavator report as decoded JSON.
+
+        Args:
+            id: An extension identifier string.
+            fresh: Whether to skip the mrxcavator daemon's report cache.
+
+        Returns:
+            The decoded JSON of the report.
+        """
+        headers = {"Cache-Control": "no-cache"} if fresh else None
+
+        return await self.call("/report/" + id, "GET", None, headers)
+
+    async def report(self, id: str) -> Optional[Extension]:
+        """Requests an extension's CRXcavator report.
+
+        Args:
+            id: An extension identifier string.
+
+        Returns:
+            An Extension of report results, or None if there are no results.
+        """
+        return parse_report(await self.report_results(id))
+
+    async def submit(self, id: str) -> bool:
+        """Submits an extension for CRXcavator to process.
+
+        Args:
+            id: An extension identifier string.
+
+        Returns:
+            A boolean for whether CRXcavator accepted the extension.
+        """
+        result = await self.call("/submit", "POST", {"extension_id": id})
+
+        return not (isinstance(result, dict) and result.get("code") == 802)
+
+    async def submit_virustotal(self, hosts: list) -> bool:
+        """Submits hostnames for VirusTotal to scan.
+
+        Args:
+            hosts: A list of hostnames.
+
+        Returns:
+            A boolean result.
+
+        Raises:
+            MrxcavatorError: No VirusTotal API key was given.
+        """
+        result = await self.call(
+            "/virustotal/report",
+            "POST",
+            {"apiKey": self.get_virustotal_key(), "urls": hosts},
+            {},
+        )
+
+        return bool(result)
+
+    async def virustotal_results(self, hosts: list) -> list:
+        """Requests VirusTotal results for hostnames submitted earlier.
+
+        Args:
+            hosts: A list of hostnames.
+
+        Returns:
+            A list of VirusTotal result dicts.
+
+        Raises:
+            MrxcavatorError: No VirusTotal API key was given.
+        """
+        results = await self.call(
+            "/virustotal/results",
+            "POST",
+            {"apiKey": self.get_virustotal_key(), "urls": hosts},
+            {},
+        )
+
+        return results if isinstance(results, list) else []
+
+    async def test_crxcavator_key(self) -> bool:
+        """Tests the client's CRXcavator API key.
+
+        Args:
+            None
+
+        Returns:
+            A boolean for whether the API accepted the key.
+
+        Raises:
+            MrxcavatorError: No CRXcavator API key was given.
+        """
+        if not self.api_key:
+            raise MrxcavatorError("No CRXcavator API key has been set yet.")
+
+        try:
+            result = await self.call(
+                "/user/apikey", "GET", {}, {"API-Key": self.api_key}
+            )
+        except APIError as failure:
+            if failure.status == 401:
+                return False
+
+            raise
+
+        return bool(result)
+
+    async def test_crxcavator_uri(self) -> bool:
+        """Tests that the client's API URI answers as CRXcavator.
+
+        Args:
+            None
+
+        Returns:
+            A boolean result.
+        """
+        result = await self.call("", "GET")
+
+        return isinstance(result, dict) and result.get("text") == "CRXcavator"
+
+    async def test_virustotal_key(self) -> bool:
+        """Tests the client's VirusTotal API key.
+
+        Args:
+            None
+
+        Returns:
+            A boolean for whether the API accepted the key.
+
+        Raises:
+            MrxcavatorError: No VirusTotal API key was given.
+        """
+        try:
+            return await self.submit_virustotal(["google.com"])
+        except APIError as failure:
+            if failure.status in (401, 403):
+                return False
+
+            raise
+
+    def get_virustotal_key(self) -> str:
+        """Returns the client's VirusTotal API key.
+
+        Args:
+            None
+
+        Returns:
+            The VirusTotal API key as a string.
+
+        Raises:
+            MrxcavatorError: No VirusTotal API key was given.
+        """
+        if not self.virustotal_key:
+            raise MrxcavatorError("No VirusTotal API key has been set yet.")
+
+        return self.virustotal_key
+
+
+def version_count(report: Extension) -> int:
+    """Returns a count of CRXcavator-tracked versions for an extension.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        An integer count of versions.
+    """
+    total = 0
+
+    for entry in report.versions:
+        if entry.version:
+            total += 1
+
+    return total
+
+
+def export_report(id: str, report: str, filename: str) -> bool:
+    """Exports a report summary to a file.
+
+    Args:
+        id: An extension identifier string.
+        report: A string of the report summary.
+        filename: The chosen filename as a string.
 
     Returns:
         A boolean result for exporting the report summary to a file.
     """
-    if filename == "empty" or filename == "":
-        filename = f"{get_report_dir()}{id}.txt"
-    else:
-        filename = f"{get_report_dir()}{filename}"
+    if filename == "empty" or filename == "":
+        filename = f"{get_report_dir()}{id}.txt"
+    else:
+        filename = f"{get_report_dir()}{filename}"
+
+    if save_report(filename, report):
+        print(f"\n>> Report saved in {filename} <<\n")
+        return True
+    else:
+        error(f"A report for {id} could not be saved.")
+        return False
+
+
+def select_rows(rows: Any, key: Optional[int], top: int) -> Any:
+    """Returns table rows ordered by a column, largest first, and limited to
+    the top N. With a limit only N rows are held at a time.
+
+    Args:
+        rows: An iterable of table rows.
+        key: The index of the column to sort by, or None to keep the order.
+        top: The number of rows to keep, or 0 for every row.
+
+    Returns:
+        An iterable of table rows.
+    """
+    import heapq
+
+    if key is None and top == 0:
+        return rows
+    elif key is None:
+        return itertools.islice(rows, top)
+
+    def sort_key(row: list) -> Any:
+        if key == TABLE_SORT_COLUMNS["updated"]:
+            return parse_version_date(row[key])
+
+        return row[key]
+
+    if top > 0:
+        return heapq.nlargest(top, rows, key=sort_key)
+
+    return sorted(rows, key=sort_key, reverse=True)
+
+
+def get_page_size() -> int:
+    """Returns how many table rows fit on a page of the terminal, or 0 if
+    output isn't interactive and shouldn't be paged.
+
+    Args:
+        None
+
+    Returns:
+        An integer number of rows.
+    """
+    import shutil
+
+    if not (sys.stdout.isatty() and sys.stdin.isatty()):
+        return 0
+
+    return max(shutil.get_terminal_size().lines - 2, 1)
+
+
+def stream_table(rows: Any, header: list, widths: list, alignment: str) -> int:
+    """Prints a table one row at a time with fixed column widths, so rows
+    show up as soon as they're available. On a terminal the table pauses
+    after every page.
+
+    Args:
+        rows: An iterable of table rows.
+        header: A list of column names.
+        widths: A list of column widths.
+        alignment: A string of 'l' or 'r' for each column.
+
+    Returns:
+        An integer count of the printed rows.
+    """
+    import termtables  # type: ignore
+
+    style = termtables.styles.thin_double
+    widths = [max(width, len(name)) for width, name in zip(widths, header)]
+
+    def line(left: str, fill: str, middle: str, right: str) -> str:
+        return (
+            left + middle.join(fill * (width + 2) for width in widths) + right
+        )
+
+    def cells(values: list, bold: bool = False) -> str:
+        output = []
+
+        for value, width, align in zip(values, widths, alignment):
+            text = str(value)[:width]
+            padding = " " * (width - len(text))
+
+            if bold:
+                text = f"\033[1m{text}\033[0m"
+
+            output.append(
+                f" {text}{padding} " if align == "l" else f" {padding}{text} "
+            )
+
+        return style[1] + style[1].join(output) + style[1]
+
+    page = get_page_size()
+    count = 0
+    shown = 3
+
+    print(line(style[2], style[0], style[8], style[3]))
+    print(cells(header, True))
+    print(line(style[11], style[12], style[13], style[14]), flush=True)
+
+    for row in rows:
+        with timed("render"):
+            print(cells(row), flush=True)
+
+        count += 1
+        shown += 1
+
+        if page and shown >= page:
+            shown = 0
+
+            try:
+                answer = input("-- More -- (Enter to continue, q to quit)")
+            except EOFError:
+                answer = "q"
+
+            sys.stdout.write("\033[1A\033[K")
+
+            if answer.strip().lower() == "q":
+                break
+
+    print(line(style[4], style[0], style[9], style[5]))
+
+    return count
+
+
+def get_reports_table(
+    extensions: list,
+    sort: Optional[str] = None,
+    top: int = 0,
+    stream: bool = False,
+) -> None:
+    """Builds a table of installed extension details from CRXcavator.
+
+    Args:
+        extensions: A list of extension identifier strings.
+        sort: 'risk', 'rating' or 'updated' to order rows by, largest first.
+        top: The number of rows to show, or 0 for every row. Rows are sorted
+            by risk unless another sort is given.
+        stream: Whether to print each row as soon as its report arrives.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    def build_rows() -> Generator:
+        ids = [extension["id"] for extension in extensions]
+
+        for id, _, report in fetch_reports(ids):
+            if report:
+                latest = report.latest
+
+                yield [
+                    latest.webstore.name,
+                    id,
+                    latest.version,
+                    latest.webstore.last_updated,
+                    round(latest.webstore.rating, 2),
+                    latest.risk.total,
+                ]
+
+    if top > 0 and sort is None:
+        sort = "risk"
+
+    rows = select_rows(build_rows(), TABLE_SORT_COLUMNS.get(sort or ""), top)
+    names = ["Name", "Identifier", "Version", "Updated", "Rating", "Risk"]
+
+    if stream:
+        stream_table(rows, names, [30, 32, 12, 18, 6, 5], "llllrr")
+        return
+
+    data = list(rows)
+    header = [f"\033[1m{name}\033[0m" for name in names]
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="llllll",
+        )
+
+
+def get_risk_row(report: Extension) -> list:
+    """Returns the risk components of a report's newest version.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        A list of numbers in the order of STATS_COMPONENTS; missing sections
+        count as 0.
+    """
+    risk = report.latest.risk
+    row = [risk.total]
+
+    for name in STATS_COMPONENTS[1:]:
+        section = getattr(risk, name)
+        row.append(0 if section is None else section.total)
+
+    return row
+
+
+def get_histogram(values: Any, low: float, high: float) -> list:
+    """Returns STATS_BINS equal-width bins of the passed-in values, matching
+    numpy.histogram's edges and closing the last bin on the right.
+
+    Args:
+        values: A sequence of numbers.
+        low: The smallest value.
+        high: The largest value.
+
+    Returns:
+        A list of (low, high, count) tuples.
+    """
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+
+    width = (high - low) / STATS_BINS
+    counts = [0] * STATS_BINS
+
+    for value in values:
+        counts[min(int((value - low) / width), STATS_BINS - 1)] += 1
+
+    return [
+        (low + width * bin, low + width * (bin + 1), counts[bin])
+        for bin in range(STATS_BINS)
+    ]
+
+
+def get_risk_stats_python(rows: list) -> dict:
+    """Returns fleet risk statistics using column arrays from the standard
+    library, for when NumPy isn't installed.
+
+    Args:
+        rows: A list of rows from get_risk_row().
+
+    Returns:
+        A dict of statistics in the same shape as get_risk_stats().
+    """
+    from array import array
+
+    count = len(rows)
+    columns = [
+        array("d", (row[index] for row in rows))
+        for index in range(len(STATS_COMPONENTS))
+    ]
+    components = {}
+    means = []
+    deviations = []
+
+    for name, column in zip(STATS_COMPONENTS, columns):
+        ordered = sorted(column)
+        mean = sum(column) / count
+        std = math.sqrt(sum((value - mean) ** 2 for value in column) / count)
+
+        components[name] = {
+            "mean": mean,
+            "std": std,
+            "min": ordered[0],
+            "max": ordered[-1],
+        }
+
+        for percent in STATS_PERCENTILES:
+            components[name][f"p{percent}"] = percentile(ordered, percent)
+
+        means.append(mean)
+        deviations.append(std)
+
+    correlations: list = []
+
+    for x, x_column in enumerate(columns):
+        correlations.append([])
+
+        for y, y_column in enumerate(columns):
+            if deviations[x] == 0 or deviations[y] == 0:
+                correlations[x].append(None)
+                continue
+
+            covariance = sum(
+                (a - means[x]) * (b - means[y])
+                for a, b in zip(x_column, y_column)
+            )
+            correlations[x].append(
+                covariance / count / (deviations[x] * deviations[y])
+            )
+
+    total = columns[0]
+    top = sorted(range(count), key=lambda index: -total[index])
+
+    return {
+        "count": count,
+        "backend": "Python",
+        "components": components,
+        "histogram": get_histogram(
+            total, components["total"]["min"], components["total"]["max"]
+        ),
+        "correlations": correlations,
+        "top": top[:STATS_TOP],
+    }
+
+
+def get_risk_stats(rows: list) -> dict:
+    """Returns fleet risk statistics for the passed-in risk rows.
+
+    The rows are loaded into a NumPy matrix when NumPy is installed, so every
+    statistic is computed column-wise in a single vectorized pass.
+    Percentiles are nearest-rank, as they are for timings.
+
+    Args:
+        rows: A non-empty list of rows from get_risk_row().
+
+    Returns:
+        A dict of the count, per-component summary statistics, a histogram of
+        total risk, a correlation matrix of components, and the row indices
+        of the riskiest extensions.
+    """
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        return get_risk_stats_python(rows)
+
+    import warnings
+
+    count = len(rows)
+    matrix = numpy.array(rows, dtype=float).reshape(count, -1)
+    ordered = numpy.sort(matrix, axis=0)
+    ranks = [max(math.ceil(p / 100 * count), 1) - 1 for p in STATS_PERCENTILES]
+
+    summary = {
+        "mean": matrix.mean(axis=0),
+        "std": matrix.std(axis=0),
+        "min": ordered[0],
+        "max": ordered[-1],
+    }
+
+    for percent, row in zip(STATS_PERCENTILES, ordered[ranks]):
+        summary[f"p{percent}"] = row
+
+    components = {
+        name: {key: float(value[index]) for key, value in summary.items()}
+        for index, name in enumerate(STATS_COMPONENTS)
+    }
+
+    counts, edges = numpy.histogram(matrix[:, 0], bins=STATS_BINS)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        correlations = numpy.corrcoef(matrix, rowvar=False)
+
+    top = numpy.argsort(-matrix[:, 0], kind="stable")[:STATS_TOP]
+
+    return {
+        "count": count,
+        "backend": f"NumPy {numpy.__version__}",
+        "components": components,
+        "histogram": [
+            (float(edges[bin]), float(edges[bin + 1]), int(counts[bin]))
+            for bin in range(STATS_BINS)
+        ],
+        "correlations": [
+            [None if numpy.isnan(value) else float(value) for value in row]
+            for row in correlations.reshape(len(STATS_COMPONENTS), -1)
+        ],
+        "top": [int(index) for index in top],
+    }
+
+
+def get_stats_table(reports: list) -> None:
+    """Prints fleet risk statistics for the passed-in reports.
+
+    Args:
+        reports: A list of Extensions of CRXcavator extension reports.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    if len(reports) == 0:
+        error("No reports were found for these extensions.", True)
+
+    with timed("stats"):
+        stats = get_risk_stats([get_risk_row(report) for report in reports])
+
+    bold = "\033[1m{}\033[0m".format
+    names = [name.replace("_permissions", "") for name in STATS_COMPONENTS]
+    columns = ["mean", "std", "min"]
+    columns += [f"p{percent}" for percent in STATS_PERCENTILES] + ["max"]
+
+    print(f"\nFleet Risk Statistics\n{'='*60}")
+    print(f"  Extensions:\t\t{stats['count']}")
+    print(f"  Computed With:\t{stats['backend']}\n")
+
+    with timed("render"):
+        termtables.print(
+            [
+                [name]
+                + [round(stats["components"][key][col], 1) for col in columns]
+                for name, key in zip(names, STATS_COMPONENTS)
+            ],
+            header=[bold("Component")] + [bold(c.title()) for c in columns],
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="l" + "r" * len(columns),
+        )
+
+        print(f"\nTotal Risk Distribution\n{'='*60}")
+        largest = max(count for low, high, count in stats["histogram"]) or 1
+
+        for low, high, count in stats["histogram"]:
+            bar = "\u2588" * math.ceil(40 * count / largest)
+            print(f"  {low:>7.0f} - {high:<7.0f} {bar} {count}")
+
+        print(f"\nComponent Correlations\n{'='*60}")
+        termtables.print(
+            [
+                [name]
+                + ["-" if value is None else f"{value:.2f}" for value in row]
+                for name, row in zip(names, stats["correlations"])
+            ],
+            header=[""] + [bold(name) for name in names],
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="l" + "r" * len(names),
+        )
+
+        print(f"\nHighest Total Risk\n{'='*60}")
+        termtables.print(
+            [
+                [
+                    reports[index].latest.webstore.name,
+                    reports[index].id,
+                    reports[index].latest.risk.total,
+                ]
+                for index in stats["top"]
+            ],
+            header=[bold("Name"), bold("Identifier"), bold("Risk")],
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="llr",
+        )
+
+
+@timed("render")
+def get_report_summary(report: Extension) -> str:
+    """Prints a formatted report of information for the given extension.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        A string of the report summary.
+    """
+    id = report.id
+    version = report.latest.version
+    versions = version_count(report)
+
+    webstore = report.latest.webstore
+    risk = report.latest.risk
+
+    output = f"\nExtension Overview\n{'='*60}\n"
+    output += f"  Extension Name:\t{webstore.name}\n"
+    output += f"  Extension ID:\t\t{id}\n"
+
+    if webstore.website != "":
+        output += f"  Web Site:\t\t{webstore.website}\n"
+
+    output += f"\n  Newest Version:\t{version} ({webstore.last_updated})"
+    output += f"\n  Versions Known:\t{versions}"
+    output += f"\n  Store Rating:\t\t{round(webstore.rating,2)} stars\n"
+    output += f"\n  Total Risk Score:\t{risk.total}"
+
+    if risk.csp is not None:
+        output += f"\n\n\nContent Security Policy\n{'='*60}"
+        output += f"\n  {risk.csp.total}\tTotal\n{'-'*60}"
+
+        csp_attribute_total = 0
+        for key, value in risk.csp.items:
+            output += f"\n  {value}\t{key}"
+            csp_attribute_total += int(value)
+
+        if risk.csp.total > csp_attribute_total:
+            remainder = risk.csp.total - csp_attribute_total
+            missing = int(remainder / 25)
+            output += f"\n  {remainder}\t{missing} attributes not set"
+
+    if risk.retire is not None:
+        output += f"\n\n\nRetireJS\n{'='*60}"
+        output += f"\n  {risk.retire.total}\tTotal\n{'-'*60}"
+        output += f"\n  {risk.retire.get('low')}\tLow"
+        output += f"\n  {risk.retire.get('medium')}\tMedium"
+        output += f"\n  {risk.retire.get('high')}\tHigh"
+        output += f"\n  {risk.retire.get('critical')}\tCritical"
+
+    if risk.webstore is not None and risk.webstore.total > 0:
+        output += f"\n\n\nWeb Store\n{'='*60}"
+        output += f"\n  {risk.webstore.total}\tTotal\n{'-'*60}"
+
+        for key, score in risk.webstore.items:
+            value = key.title().replace("_", " ")
+            output += f"\n  {score}\t{value}"
+
+    perms_required = 0
+    perms_optional = 0
+
+    if risk.permissions is not None:
+        perms_required = risk.permissions.total
+
+    if risk.optional_permissions is not None:
+        perms_optional = risk.optional_permissions.total
+
+    perms_total = perms_required + perms_optional
+
+    if perms_total > 0:
+        output += f"\n\n\nPermissions\n{'='*60}"
+        output += f"\n  {perms_total}\tTotal\n{'-'*60}"
+        output += f"\n  {perms_required}\tRequired"
+        output += f"\n  {perms_optional}\tOptional"
+
+    if report.latest.extcalls:
+        output += f"\n\n\nExternal Calls\n{'='*60}"
+        for result in get_extcalls(list(report.latest.extcalls)):
+            output += f"\n  - {result}"
+
+    return output + "\n"
+
+
+def save_report(filename: str, content: str) -> bool:
+    """Writes passed-in content to the passed-in filename.
+
+    Args:
+        filename: The chosen filename as a string.
+        content: The chosen content to write as a string.
+
+    Returns:
+        A boolean result.
+    """
+    if not os.path.isdir(get_report_dir()):
+        try:
+            os.mkdir(get_report_dir())
+        except IOError:
+            error(
+                f"Cannot create {get_report_dir()} - check permissions.",
+                True,
+            )
+
+    try:
+        with open(filename, "w") as fileHandle:
+            fileHandle.write(content.strip())
+    except IOError:
+        error(f"Cannot write to {filename} -  check permissions.", True)
+
+    return True
+
+
+class ReportArchive:
+    """Streams report summaries, and optionally their raw JSON, into a single
+    .tar.gz, .zip or JSON Lines (.jsonl, .jsonl.gz) file.
+
+    Entries are written by a background thread, so fetching the next report
+    doesn't wait on compression or disk. The archive is built in a temporary
+    file and renamed into place by close(), so a crash never leaves a partial
+    archive behind.
+    """
+
+    def __init__(self, filename: str, raw: bool = False) -> None:
+        """Opens the temporary archive and starts the writer thread.
+
+        Args:
+            filename: The archive's filename; its suffix picks the format.
+            raw: Whether to store each report's raw JSON next to its summary.
+
+        Returns:
+            None.
+        """
+        import queue
+        import tempfile
+
+        self.filename = filename
+        self.raw = raw
+        self.count = 0
+        self.failure: Optional[BaseException] = None
+        self.entries: Any = queue.Queue(maxsize=ARCHIVE_QUEUE)
+
+        if filename.endswith((".tar.gz", ".tgz")):
+            self.format = "tar"
+        elif filename.endswith(".zip"):
+            self.format = "zip"
+        elif filename.endswith((".jsonl", ".jsonl.gz")):
+            self.format = "jsonl"
+        else:
+            error(f"Archives must end in {', '.join(ARCHIVE_SUFFIXES)}.", True)
+
+        directory = os.path.dirname(os.path.abspath(filename))
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+            handle, self.temporary = tempfile.mkstemp(
+                dir=directory, suffix=".tmp"
+            )
+            os.close(handle)
+        except (IOError, OSError):
+            error(f"Cannot write to {filename} -  check permissions.", True)
+
+        self.writer = threading.Thread(target=self.write_entries, daemon=True)
+        self.writer.start()
+
+    def __enter__(self) -> "ReportArchive":
+        return self
+
+    def __exit__(self, kind: Any, value: Any, traceback: Any) -> None:
+        self.close(kind is None)
+
+    def add(self, id: str, summary: str, results: Any = None) -> None:
+        """Queues a report for the writer thread.
+
+        Args:
+            id: An extension identifier string.
+            summary: A string of the report summary.
+            results: The report's decoded JSON, stored if the archive is raw.
+
+        Returns:
+            None.
+        """
+        if self.failure is None:
+            self.entries.put((id, summary.strip(), results))
+
+    def write_entries(self) -> None:
+        """Writes queued entries until close() queues None.
+
+        Args:
+            None
+
+        Returns:
+            None.
+        """
+        import gzip
+        import tarfile
+        import zipfile
+
+        try:
+            if self.format == "tar":
+                archive: Any = tarfile.open(self.temporary, "w:gz")
+            elif self.format == "zip":
+                archive = zipfile.ZipFile(
+                    self.temporary, "w", zipfile.ZIP_DEFLATED
+                )
+            elif self.filename.endswith(".gz"):
+                archive = gzip.open(self.temporary, "wt", encoding="utf-8")
+            else:
+                archive = open(self.temporary, "w", encoding="utf-8")
+        except (IOError, OSError) as exception:
+            self.failure = exception
+            archive = None
+
+        while True:
+            entry = self.entries.get()
+
+            if entry is None:
+                break
+            elif self.failure is not None:
+                continue
+
+            try:
+                self.write_entry(archive, *entry)
+                self.count += 1
+            except (IOError, OSError) as exception:
+                self.failure = exception
+
+        try:
+            if archive is not None:
+                archive.close()
+        except (IOError, OSError) as exception:
+            self.failure = exception
+
+    def write_entry(
+        self, archive: Any, id: str, summary: str, results: Any
+    ) -> None:
+        """Writes one report to the open archive.
+
+        Args:
+            archive: The open tarfile, zipfile or text file.
+            id: An extension identifier string.
+            summary: A string of the report summary.
+            results: The report's decoded JSON, or None.
+
+        Returns:
+            None.
+        """
+        import io
+        import tarfile
+
+        if self.format == "jsonl":
+            line = {"id": id, "summary": summary}
+
+            if self.raw:
+                line["report"] = results
+
+            archive.write(json.dumps(line) + "\n")
+            return
+
+        members = [(f"{id}.txt", summary.encode("utf-8"))]
+
+        if self.raw:
+            members.append((f"{id}.json", json.dumps(results).encode("utf-8")))
+
+        for name, data in members:
+            if self.format == "tar":
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(time.time())
+                info.mode = 0o644
+                archive.addfile(info, io.BytesIO(data))
+            else:
+                archive.writestr(name, data)
+
+    def close(self, commit: bool = True) -> bool:
+        """Waits for the writer thread, then flushes the finished archive to
+        disk and renames it into place, or removes it if the run failed.
+
+        Args:
+            commit: Whether to keep the archive.
+
+        Returns:
+            A boolean result.
+        """
+        self.entries.put(None)
+        self.writer.join()
+
+        if commit and self.failure is None:
+            try:
+                with open(self.temporary, "rb+") as fileHandle:
+                    os.fsync(fileHandle.fileno())
+
+                os.chmod(self.temporary, 0o644)
+                os.replace(self.temporary, self.filename)
+                print(
+                    f"\n>> {self.count} reports saved in {self.filename} <<\n"
+                )
+                return True
+            except (IOError, OSError) as exception:
+                self.failure = exception
+
+        try:
+            os.remove(self.temporary)
+        except OSError:
+            pass
+
+        if self.failure is not None:
+            error(f"Cannot write to {self.filename} -  check permissions.")
+
+        return False
+
+
+def submit_extension(id: str) -> bool:
+    """Submits an extension (by ID) for CRXcavator to process.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        A boolean result.
+    """
+    with get_batch_client() as schedule:
+        return get_submission(id, schedule("submit", id))
+
+
+def get_submission(id: str, future: Any) -> bool:
+    """Returns the result of a submission scheduled on get_batch_client().
+
+    Args:
+        id: An extension identifier string.
+        future: A Future of AsyncClient.submit().
+
+    Returns:
+        A boolean for whether the extension was accepted or is ignored.
+    """
+    try:
+        with timed("network"):
+            accepted = future.result()
+    except MrxcavatorError as failure:
+        error(str(failure), True)
+
+    if not accepted and extension_is_ignored(id) is False:
+        error(f"{id} is not a valid extension. Please check your input.")
+        return False
+    else:
+        return True
+
+
+def submit_extensions(extensions: list, path: str) -> None:
+    """Submits many extensions (by ID) for CRXcavator to process. The
+    submissions run concurrently through get_batch_client().
+
+    Args:
+        extensions: A list of extension identifier strings.
+        path: The system's directory path to Chrome extensions as a string.
+
+    Returns:
+        None.
+    """
+    from tqdm import tqdm  # type: ignore
+
+    successful = []
+    failed = []
+
+    print(f"\nSubmitting extensions found in {path}\n")
+
+    with get_batch_client() as schedule:
+        submissions = [
+            (extension, schedule("submit", extension["id"]))
+            for extension in extensions
+        ]
+
+        for extension, future in tqdm(submissions, bar_format="{l_bar}{bar}"):
+            if get_submission(extension["id"], future):
+                successful.append(extension["name"])
+            else:
+                failed.append(extension["name"])
+
+    if len(successful) > 0:
+        successful.sort()
+        print("\nSuccessful:\n  > " + "\n  > ".join(successful))
+    if len(failed) > 0:
+        failed.sort()
+        print("\n\nFailed:\n  > " + "\n  > ".join(failed))
+
+
+def report_has_version(report: Optional[Extension], version: str) -> bool:
+    """Returns whether a report covers a submitted version of an extension.
+
+    Args:
+        report: An Extension of a CRXcavator extension report, or None.
+        version: The submitted version string, or an empty string if it's
+            unknown, in which case any report will do.
+
+    Returns:
+        A boolean result.
+    """
+    if report is None:
+        return False
+    elif version == "":
+        return True
+
+    return any(entry.version == version for entry in report.versions)
+
+
+def submit_and_wait(extensions: list, timeout: int) -> list:
+    """Submits the passed-in extensions, then polls for their reports and
+    prints each one as soon as it covers the submitted local version.
+
+    Each extension is polled on its own schedule, with a delay that starts at
+    SUBMIT_POLL_MIN seconds and doubles (with jitter) up to SUBMIT_POLL_MAX
+    seconds while its report is missing or stale. Submissions, and the polls
+    that fall due together, run concurrently through get_batch_client().
+    Polls skip the daemon's report cache.
+
+    Args:
+        extensions: A list of extension dicts.
+        timeout: The overall number of seconds to wait for reports.
+
+    Returns:
+        A list of the extension dicts whose reports didn't arrive in time.
+    """
+    import heapq
+    import random
+
+    deadline = time.monotonic() + timeout
+    pending: dict = {}
+    queue: list = []
+
+    with get_batch_client() as schedule:
+        submissions = [
+            (extension, schedule("submit", extension["id"]))
+            for extension in extensions
+        ]
+
+        for extension, future in submissions:
+            if not get_submission(extension["id"], future):
+                continue
+
+            version = extension.get("version", "TBD")
+            version = "" if version == "TBD" else version.split("_")[0]
+            pending[extension["id"]] = [extension, version, SUBMIT_POLL_MIN]
+            heapq.heappush(
+                queue, (time.monotonic() + SUBMIT_POLL_MIN, extension["id"])
+            )
+
+        print(
+            f"\nSubmitted {len(pending)} extensions. Waiting up to "
+            f"{datetime.timedelta(seconds=timeout)} for their reports...\n"
+        )
+
+        while queue and queue[0][0] <= deadline:
+            with timed("throttle"):
+                time.sleep(max(0.0, queue[0][0] - time.monotonic()))
+
+            polls = []
+            while queue and queue[0][0] <= time.monotonic():
+                id = heapq.heappop(queue)[1]
+                polls.append((id, schedule("report_results", id, True)))
+
+            for id, future in polls:
+                try:
+                    with timed("network"):
+                        results = future.result()
+                except MrxcavatorError as failure:
+                    error(str(failure), True)
+
+                extension, version, delay = pending[id]
+                report = parse_report(results)
+
+                if report is not None:
+                    append_history(report)
+
+                if report is not None and report_has_version(report, version):
+                    del pending[id]
+                    print(
+                        f"{get_report_summary(report)}\n{60*'~'}", flush=True
+                    )
+                    continue
+
+                delay = min(delay * 2, SUBMIT_POLL_MAX)
+                pending[id][2] = delay
+                heapq.heappush(
+                    queue,
+                    (time.monotonic() + delay * random.uniform(0.8, 1.2), id),
+                )
+
+    if pending:
+        missing = sorted(
+            f"{extension['name']} ({id})"
+            for id, (extension, _, _) in pending.items()
+        )
+        print("\nTimed out waiting for:\n  > " + "\n  > ".join(missing))
+
+    return [extension for extension, _, _ in pending.values()]
+
+
+def get_report_results(id: str) -> Tuple[Any, Optional[Extension]]:
+    """Requests the CRXcavator report (in JSON) for the given extension ID and
+    keeps the decoded JSON alongside the parsed report.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        A tuple of the decoded JSON and an Extension of report results, or
+        None if there are no results. A report prefetched by the picker is
+        used instead of calling the API again, unless its prefetch failed.
+        Each report is also appended to the extension's local risk history.
+    """
+    future = prefetched_reports.pop(id, None)
+    prefetched = None
+
+    if future is not None:
+        try:
+            prefetched = future.result()
+        except Exception:
+            prefetched = None
+
+    results, report = prefetched if prefetched else fetch_report(id)
+
+    if report is not None:
+        append_history(report)
+
+    return results, report
+
+
+def get_report(id: str) -> Optional[Extension]:
+    """Requests the CRXcavator report (in JSON) for the given extension ID.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        An Extension of report results, or None if there are no results. Each
+        report is also appended to the extension's local risk history.
+    """
+    return get_report_results(id)[1]
+
+
+def get_reports(
+    extensions: list, export: bool, archive: Optional[ReportArchive] = None
+) -> None:
+    """Retrieves a report summary for each passed-in extension ID in a list.
+
+    Args:
+        extensions: A list of extension identifier strings.
+        export: A boolean for whether to export each report to a file.
+        archive: A ReportArchive to stream each report into, if any.
+
+    Returns:
+        None.
+    """
+    ids = [
+        extension["id"] if isinstance(extension, dict) else extension
+        for extension in extensions
+    ]
+
+    for id, results, report in fetch_reports(ids):
+        if report:
+            summary = get_report_summary(report)
+            print(f"{summary}\n{60*'~'}")
+            if archive is not None:
+                archive.add(id, summary, results)
+            elif export is True:
+                export_report(id, summary, "")
+
+
+def metric_labels(labels: dict) -> str:
+    """Returns an OpenMetrics label set for the passed-in labels.
+
+    Args:
+        labels: A dict of label names and values.
+
+    Returns:
+        A string of the formatted label set.
+    """
+    pairs = []
+
+    for name, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        value = value.replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+def build_metrics(extensions: list) -> str:
+    """Returns an OpenMetrics textfile of risk scores for the passed-in
+    extensions, fleet-level aggregates, and this run's API statistics.
+
+    Args:
+        extensions: A list of extension identifier strings.
+
+    Returns:
+        A string of the OpenMetrics textfile content.
+    """
+    risks = []
+    missing = 0
+
+    output = (
+        "# HELP mrxcavator_extension_risk CRXcavator risk score of the "
+        "newest version of an extension.\n"
+        "# TYPE mrxcavator_extension_risk gauge\n"
+    )
+
+    ids = [extension["id"] for extension in extensions]
+
+    for id, _, report in fetch_reports(ids):
+        if not report:
+            missing += 1
+            continue
+
+        risk = report.latest.risk
+        labels = {
+            "id": id,
+            "name": report.latest.webstore.name,
+            "version": report.latest.version,
+        }
+
+        output += (
+            f"mrxcavator_extension_risk"
+            f"{metric_labels(dict(labels, component='total'))} "
+            f"{risk.total}\n"
+        )
+
+        for component, section in risk.sections():
+            output += (
+                f"mrxcavator_extension_risk"
+                f"{metric_labels(dict(labels, component=component))} "
+                f"{section.total}\n"
+            )
+
+        risks.append(risk.total)
+
+    output += (
+        "# HELP mrxcavator_fleet_extensions Extensions in this run.\n"
+        "# TYPE mrxcavator_fleet_extensions gauge\n"
+        f'mrxcavator_fleet_extensions{{state="reported"}} {len(risks)}\n'
+        f'mrxcavator_fleet_extensions{{state="missing"}} {missing}\n'
+    )
+
+    if risks:
+        output += (
+            "# HELP mrxcavator_fleet_risk Aggregate risk of the fleet.\n"
+            "# TYPE mrxcavator_fleet_risk gauge\n"
+            f'mrxcavator_fleet_risk{{stat="sum"}} {sum(risks)}\n'
+            f'mrxcavator_fleet_risk{{stat="min"}} {min(risks)}\n'
+            f'mrxcavator_fleet_risk{{stat="max"}} {max(risks)}\n'
+            f'mrxcavator_fleet_risk{{stat="mean"}} '
+            f"{sum(risks) / len(risks):.2f}\n"
+        )
+
+    summary = get_timings()
+    run_metrics = [
+        ("duration_seconds", "Duration of the run.", summary["duration"]),
+        ("api_calls", "API calls made by the run.", summary["api_calls"]),
+        ("api_errors", "API errors seen by the run.", summary["errors"]),
+        ("cache_hits", "Cache hits seen by the run.", summary["cache_hits"]),
+        ("timestamp_seconds", "Time the run finished.", time.time()),
+    ]
+
+    for name, description, value in run_metrics:
+        output += (
+            f"# HELP mrxcavator_run_{name} {description}\n"
+            f"# TYPE mrxcavator_run_{name} gauge\n"
+            f"mrxcavator_run_{name} {round(value, 3)}\n"
+        )
+
+    return output + "# EOF\n"
+
+
+def write_atomic(filename: str, content: Any) -> bool:
+    """Writes passed-in content to a temporary file next to the passed-in
+    filename and then renames it into place, so readers never see a partially
+    written file.
+
+    Args:
+        filename: The chosen filename as a string.
+        content: The chosen content to write as a string or bytes.
+
+    Returns:
+        A boolean result.
+    """
+    import tempfile
+
+    directory = os.path.dirname(os.path.abspath(filename))
+
+    try:
+        handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        mode = "wb" if isinstance(content, bytes) else "w"
+
+        with os.fdopen(handle, mode) as fileHandle:
+            fileHandle.write(content)
+            fileHandle.flush()
+            os.fsync(fileHandle.fileno())
+
+        os.chmod(temporary, 0o644)
+        os.replace(temporary, filename)
+    except (IOError, OSError):
+        error(f"Cannot write to {filename} -  check permissions.", True)
+
+    return True
+
+
+def export_metrics(extensions: list, filename: str) -> bool:
+    """Exports an OpenMetrics textfile for the passed-in extensions.
+
+    Args:
+        extensions: A list of extension identifier strings.
+        filename: The chosen filename as a string.
+
+    Returns:
+        A boolean result for exporting the metrics to a file.
+    """
+    if write_atomic(filename, build_metrics(extensions)):
+        print(f"\n>> Metrics saved in {filename} <<\n")
+        return True
+    else:
+        error(f"Metrics could not be saved in {filename}.")
+        return False
+
+
+def write_config(filename: str) -> bool:
+    """Writes the state of ConfigParser to the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+
+    Returns:
+        A boolean result.
+    """
+    if not os.path.isdir(get_root_dir()):
+        try:
+            os.mkdir(get_root_dir())
+        except IOError:
+            error(
+                f"Cannot create {get_root_dir()} - check permissions.",
+                True,
+            )
+
+    try:
+        with open(filename, "w") as fileHandle:
+            config.write(fileHandle)
+    except IOError:
+        error(f"Cannot write to {filename}. Please check permissions.", True)
+
+    return True
+
+
+def build_config(filename: str) -> bool:
+    """Builds a default configuration and says it  to the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+
+    Returns:
+        A boolean result.
+    """
+    config["DEFAULT"] = {
+        "crxcavator_api_uri": CRXCAVATOR_API_URI,
+        "crxcavator_api_key": "",
+        "virustotal_api_key": "",
+        "extension_path": CRX_PATH,
+        "daemon_uri": "",
+        "allowlist": "",
+        "blocklist": "",
+        "transport": "requests",
+    }
+    config.add_section("custom")
+
+    if write_config(filename):
+        return True
+    else:
+        return False
+
+
+def load_config(filename: str) -> bool:
+    """Loads ConfigParser with configuration data from the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+
+    Returns:
+        A boolean result.
+    """
+    config.read(filename)
+
+    if config.sections() == []:
+        error(f"{filename} does not exist, or is corrupted. Creating it...")
+
+        if not build_config(filename):
+            return False
+
+    return True
+
+
+def set_extension_path(filename: str, path: str) -> bool:
+    """Configures the system's directory path to Chrome extensions.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        path: The system's directory path to Chrome extensions as a string.
+
+    Returns:
+        A boolean result.
+    """
+    if os.path.isdir(os.path.expanduser(path)) is True:
+        if path[-1] != "/":
+            path = path + "/"
+
+        config.set("custom", "extension_path", path)
+
+        if not write_config(filename):
+            return False
+    else:
+        error(f"The provided extension path, {path}, does not exist.", True)
+
+    return True
+
+
+def set_crxcavator_key(filename: str, key: str) -> bool:
+    """Configures the CRXcavator API key into the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        key: The CRXcavator API key as a string.
+
+    Returns:
+        A boolean result.
+    """
+    if len(key) != 32 or re.match("^[a-zA-Z]+$", key) is False:
+        error(f"The provided API key, {key}, is incorrectly formatted.", True)
+    else:
+        config.set("custom", "crxcavator_api_key", key)
+
+        if not write_config(filename):
+            return False
+
+    return True
+
+
+def set_crxcavator_uri(filename: str, uri: str) -> bool:
+    """Configures the CRXcavator API URI into the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        uri: The CRXcavator URI for API calls as a string.
+
+    Returns:
+        A boolean result.
+    """
+    import validators  # type: ignore
+
+    if validators.url(uri) is True:
+        config.set("custom", "crxcavator_api_uri", uri)
+
+        if not write_config(filename):
+            return False
+    else:
+        error(f"The provided API URI, {uri}, is incorrectly formatted.", True)
+
+    return True
+
+
+def set_virustotal_key(filename: str, key: str) -> bool:
+    """Configures the VirusTotal API key into the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        key: The VirusTotal API key as a string.
+
+    Returns:
+        A boolean result.
+    """
+    if len(key) != 64 or re.match("^[a-f0-9]+$", key) is False:
+        error(f"The provided API key, {key}, is incorrectly formatted.", True)
+    else:
+        config.set("custom", "virustotal_api_key", key)
+
+        if not write_config(filename):
+            return False
+
+    return True
+
+
+def set_daemon_uri(filename: str, uri: str) -> bool:
+    """Configures the mrxcavator daemon URI into the passed-in filename. An
+    empty URI disables routing API calls through the daemon.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        uri: The mrxcavator daemon URI as a string.
+
+    Returns:
+        A boolean result.
+    """
+    import validators  # type: ignore
+
+    if uri == "" or validators.url(uri) is True:
+        config.set("custom", "daemon_uri", uri.rstrip("/"))
+
+        if not write_config(filename):
+            return False
+    else:
+        error(
+            f"The provided daemon URI, {uri}, is incorrectly formatted.", True
+        )
+
+    return True
+
+
+def set_membership_list(filename: str, kind: str, path: str) -> bool:
+    """Configures an allowlist or blocklist file and compiles its index. An
+    empty path disables the list.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        kind: Either 'allowlist' or 'blocklist'.
+        path: The filename of a text list of extension IDs and hostnames.
+
+    Returns:
+        A boolean result.
+    """
+    if path != "":
+        path = os.path.abspath(os.path.expanduser(path))
+
+        if not os.path.isfile(path):
+            error(f"The provided {kind}, {path}, does not exist.", True)
+
+        ids, hosts = compile_membership_list(path, get_list_index(kind))
+        print(f"\n\tCompiled {ids} extension IDs and {hosts} hostnames.")
+
+    config.set("custom", kind, path)
+
+    if not write_config(filename):
+        return False
+
+    return True
+
+
+def set_transport(filename: str, name: str) -> bool:
+    """Configures the HTTP transport backend into the passed-in filename.
+
+    Args:
+        filename: The mrxcavator configuration filename as a string.
+        name: The transport backend's name, one of TRANSPORTS.
+
+    Returns:
+        A boolean result.
+    """
+    try:
+        Transport(name).close()
+    except MrxcavatorError as failure:
+        error(str(failure), True)
+
+    config.set("custom", "transport", name)
+
+    if not write_config(filename):
+        return False
+
+    return True
+
+
+def test_crxcavator_key() -> bool:
+    """Performs an API call to CRXcavator to test the configured API key.
+
+    Args:
+        None
+
+    Returns:
+        A boolean result.
+    """
+    key = config.get("custom", "crxcavator_api_key")
+
+    if key:
+        if call_client("test_crxcavator_key"):
+            return True
+        else:
+            error(
+                "401 - API Not Authorized - Please check your API token.", True
+            )
+            return False
+    else:
+        error("No CRXcavator API key has been set yet.")
+        return False
+
+
+def test_crxcavator_uri() -> bool:
+    """Performs an API call to CRXcavator to test the configured URI.
+
+    Args:
+        None
+
+    Returns:
+        A boolean result.
+    """
+    return call_client("test_crxcavator_uri")
+
+
+def test_virustotal_key() -> bool:
+    """Performs a VirusTotal API call to test the configured API key.
+
+    Args:
+        None
+
+    Returns:
+        A boolean result.
+    """
+    key = config.get("custom", "virustotal_api_key")
+
+    if key:
+        if call_client("test_virustotal_key"):
+            return True
+        else:
+            error("The VirusTotal API key was not accepted.", True)
+            return False
+    else:
+        error("No VirusTotal API key has been set yet.")
+        return False
+
+
+def get_crx_path(id: str = "") -> str:
+    """Returns a filesystem path to the system's Chrome Extension directory. An
+    optional extentension ID may be passed in to append to the retuned path.
+
+    Args:
+        id: An optional extension identifier string.
+
+    Returns:
+        A string with the appropriate filesystem path for a(n) extension(s).
+    """
+    return os.path.expanduser(extension_path) + id
+
+
+def find_extension_directories(path: str) -> list:
+    """Return all valid Chrome extension directories from a passed-in path.
+
+    Args:
+        path: The filesystem path to Chrome extensions.
+
+    Returns:
+        A list containing Chrome extension directories.
+    """
+    directories = []
+    path = get_crx_path()
+
+    if os.path.isdir(os.path.expanduser(path)) is True:
+        for dir in next(os.walk(path))[1]:
+            if len(dir) == 32:
+                directories.append(dir)
+
+    return directories
+
+
+def get_extension_messages_path(path: str) -> str:
+    """Return the path to an extension's most appropriate messages.json file.
+
+    Args:
+        path: The filesystem path to a specific Chrome extension.
+
+    Returns:
+        A string to the most appropriate messages.json file.
+    """
+    for locale in MESSAGES_LOCALES:
+        messages = f"{path}/_locales/{locale}/messages.json"
+
+        if os.path.isfile(messages):
+            return messages
+
+    return ""
+
+
+def get_extension_messages_name(name: str, messages: dict) -> str:
+    """Returns the 'name' of a Chrome extension via a messages.json file.
+
+    Args:
+        name: The canonical reference string for a messages.json value.
+        messages: A dict representation for a represented messages.json file.
+
+    Returns:
+        A string for the 'name' of a Chrome extension via a messages.json file.
+    """
+    match = re.search("__MSG_(.+?)__", name)
+    name = ""
+
+    if match:
+        switcher = {
+            "APP_NAME": "app_name",
+            "CHROME_EXTENSION_NAME": "chrome_extension_name",
+            "appName": "appName",
+            "extName": "extName",
+        }
+
+        messages_key = switcher.get(match.group(1), match.group(1)).lower()
+
+        for key, value in messages.items():
+            if key.lower() == messages_key and isinstance(value, dict):
+                name = value.get("message", "")
+
+    return name
+
+
+def read_manifest(id: str, version: str) -> dict:
+    """Returns the parsed manifest.json of a locally installed extension.
+
+    Args:
+        id: An extension identifier string.
+        version: The extension version that is used to search file paths.
+
+    Returns:
+        A dict of the manifest, or an empty dict if it can't be parsed.
+    """
+    manifest_path = f"{get_crx_path(id)}/{version}/manifest.json"
+
+    try:
+        with open(manifest_path, encoding="utf-8-sig") as manifestHandle:
+            manifest = json.load(manifestHandle)
+    except (IOError, ValueError):
+        return {}
+
+    if isinstance(manifest, dict):
+        return manifest
+    else:
+        return {}
+
+
+def get_manifest_name(manifest: dict, path: str, package: Any = None) -> str:
+    """Returns the 'name' of a Chrome extension from its parsed manifest,
+    resolving `__MSG_` names through the extension's messages.json file.
+
+    Args:
+        manifest: A dict of a parsed manifest.json file.
+        path: The filesystem path to a specific Chrome extension version.
+        package: An optional open ZipFile to read messages.json from instead.
+
+    Returns:
+        A string for the 'name' of a Chrome extension.
+    """
+    name = manifest.get("name", "")
+
+    if not isinstance(name, str):
+        name = ""
+    elif re.match("^__MSG", name) is not None:
+        try:
+            if package is None:
+                messages_path = get_extension_messages_path(path)
+
+                with open(messages_path, encoding="utf-8-sig") as msgHandle:
+                    messages = json.load(msgHandle)
+            else:
+                messages = read_package_json(
+                    package, get_package_messages_path(package)
+                )
+
+            name = get_extension_messages_name(name, messages)
+        except (IOError, ValueError, KeyError, AttributeError):
+            name = ""
+
+    return name or "**Unknown Name**"
+
+
+def get_extension_name(id: str, version: str) -> str:
+    """Returns the 'name' of a Chrome extension by finding the correct source.
+
+    Args:
+        id: An extension identifier string.
+        version: The extension version that is used to search file paths.
+
+    Returns:
+        A string for the 'name' of a Chrome extension.
+    """
+    crx_base = f"{get_crx_path(id)}/{version}/"
+
+    return get_manifest_name(read_manifest(id, version), crx_base)
+
+
+def get_manifest_strings(manifest: dict, key: str) -> list:
+    """Returns a list of strings for a manifest key, ignoring invalid values.
+
+    Args:
+        manifest: A dict of a parsed manifest.json file.
+        key: A manifest key expected to hold a list of strings.
+
+    Returns:
+        A list of strings.
+    """
+    values = manifest.get(key, [])
+
+    if not isinstance(values, list):
+        return []
+
+    return [value for value in values if isinstance(value, str)]
+
+
+def is_host_permission(permission: str) -> bool:
+    """Returns whether a manifest permission is a host match pattern.
+
+    Args:
+        permission: A permission string from a manifest.
+
+    Returns:
+        A boolean of whether the permission grants host access.
+    """
+    return permission == "<all_urls>" or "://" in permission
+
+
+def get_manifest_permissions(manifest: dict) -> dict:
+    """Returns the permissions, host access and CSP declared by a manifest.
+
+    Manifest V2 mixes host patterns into 'permissions' whereas Manifest V3
+    declares them separately under 'host_permissions'; both are normalized.
+
+    Args:
+        manifest: A dict of a parsed manifest.json file.
+
+    Returns:
+        A dict of permission lists and the effective CSP string.
+    """
+    required = get_manifest_strings(manifest, "permissions")
+    optional = get_manifest_strings(manifest, "optional_permissions")
+
+    hosts = [perm for perm in required if is_host_permission(perm)]
+    optional_hosts = [perm for perm in optional if is_host_permission(perm)]
+
+    hosts += get_manifest_strings(manifest, "host_permissions")
+    optional_hosts += get_manifest_strings(
+        manifest, "optional_host_permissions"
+    )
+
+    matches = []
+    content_scripts = manifest.get("content_scripts", [])
+
+    if isinstance(content_scripts, list):
+        for script in content_scripts:
+            if isinstance(script, dict):
+                matches += get_manifest_strings(script, "matches")
+
+    csp = manifest.get("content_security_policy", "")
+
+    if isinstance(csp, dict):
+        csp = csp.get("extension_pages", "")
+
+    if not isinstance(csp, str) or csp.strip() == "":
+        csp = CSP_DEFAULT
+
+    return {
+        "permissions": [p for p in required if not is_host_permission(p)],
+        "optional_permissions": [
+            p for p in optional if not is_host_permission(p)
+        ],
+        "host_permissions": hosts,
+        "optional_host_permissions": optional_hosts,
+        "content_scripts": matches,
+        "csp": csp,
+    }
+
+
+def get_permission_risk(permission: str) -> int:
+    """Returns the local risk weight of a single manifest permission.
+
+    Args:
+        permission: A permission string or host match pattern.
+
+    Returns:
+        An integer of the permission's risk.
+    """
+    if permission in PERMISSION_RISK:
+        return PERMISSION_RISK[permission]
+    elif is_host_permission(permission):
+        if "*" in permission.split("://", 1)[-1].split("/", 1)[0]:
+            return HOST_RISK_WILDCARD
+        else:
+            return HOST_RISK_SPECIFIC
+    else:
+        return PERMISSION_RISK_UNKNOWN
+
+
+def get_permissions_risk(permissions: list) -> dict:
+    """Returns a risk breakdown for a list of permissions.
+
+    Args:
+        permissions: A list of permission strings and host match patterns.
+
+    Returns:
+        A dict of each unique permission's risk and a 'total' key.
+    """
+    risk: dict = {}
+
+    for permission in permissions:
+        risk[permission] = get_permission_risk(permission)
+
+    risk["total"] = sum(risk.values())
+
+    return risk
+
+
+def parse_csp(csp: str) -> dict:
+    """Returns the directives of a Content Security Policy string.
+
+    Args:
+        csp: A Content Security Policy string.
+
+    Returns:
+        A dict of lowercased directive names to lists of source values.
+    """
+    directives: dict = {}
+
+    for directive in csp.split(";"):
+        tokens = directive.split()
+
+        if tokens and tokens[0].lower() not in directives:
+            directives[tokens[0].lower()] = tokens[1:]
+
+    return directives
+
+
+def get_csp_risk(csp: str) -> dict:
+    """Returns a risk breakdown of a Content Security Policy string.
+
+    Each directive that is set scores 1, plus 10 for every risky source it
+    allows; each directive that is not set scores CSP_MISSING. Fetch
+    directives fall back to 'default-src' as they do in browsers.
+
+    Args:
+        csp: A Content Security Policy string.
+
+    Returns:
+        A dict of each set directive's risk and a 'total' key.
+    """
+    directives = parse_csp(csp)
+    risk: dict = {}
+    missing = 0
+
+    for name in CSP_DIRECTIVES:
+        sources = directives.get(name)
+
+        if sources is None and name in CSP_FETCH_DIRECTIVES:
+            sources = directives.get("default-src")
+
+        if sources is None:
+            missing += CSP_MISSING
+        else:
+            risky = [src for src in sources if src in CSP_RISKY_SOURCES]
+            risk[name] = 1 + 10 * len(risky)
+
+    risk["total"] = sum(risk.values()) + missing
+
+    return risk
+
+
+def get_local_risk(manifest: dict) -> dict:
+    """Returns a local risk estimate of an extension based on its manifest.
+
+    The result mirrors the 'permissions', 'optional_permissions' and 'csp'
+    sections of a CRXcavator report's risk data so that extensions can be
+    triaged without an API call. Content script matches count towards the
+    required permissions since they grant the same host access.
+
+    Args:
+        manifest: A dict of a parsed manifest.json file.
+
+    Returns:
+        A dict of local risk data.
+    """
+    perms = get_manifest_permissions(manifest)
+
+    required = perms["permissions"] + perms["host_permissions"]
+    required += perms["content_scripts"]
+    optional = perms["optional_permissions"]
+    optional += perms["optional_host_permissions"]
+
+    risk = {
+        "permissions": get_permissions_risk(required),
+        "optional_permissions": get_permissions_risk(optional),
+        "csp": get_csp_risk(perms["csp"]),
+    }
+
+    risk["total"] = sum(section["total"] for section in risk.values())
+
+    return risk
+
+
+def get_local_risk_summary(extension: dict) -> str:
+    """Returns a formatted summary of an extension's local risk estimate.
+
+    Args:
+        extension: A dict of installed extension meta data with a manifest.
+
+    Returns:
+        A string of the local risk summary.
+    """
+    manifest = extension["manifest"]
+    risk = get_local_risk(manifest)
+
+    output = f"\nLocal Risk Estimate\n{'='*60}\n"
+    output += f"  Extension Name:\t{extension['name']}\n"
+    output += f"  Extension ID:\t\t{extension['id']}\n"
+    output += f"\n  Local Version:\t{extension['version'].split('_')[0]}"
+    output += f"\n  Manifest Version:\t{manifest.get('manifest_version', 2)}\n"
+    output += f"\n  Total Risk Score:\t{risk['total']}"
+
+    csp_total = risk["csp"]["total"]
+    csp_attributes = {k: v for k, v in risk["csp"].items() if k != "total"}
+    csp_missing = len(CSP_DIRECTIVES) - len(csp_attributes)
+
+    output += f"\n\n\nContent Security Policy\n{'='*60}"
+    output += f"\n  {csp_total}\tTotal\n{'-'*60}"
+
+    for key, value in csp_attributes.items():
+        output += f"\n  {value}\t{key}"
+
+    if csp_missing > 0:
+        remainder = csp_missing * CSP_MISSING
+        output += f"\n  {remainder}\t{csp_missing} attributes not set"
+
+    for section, title in (
+        ("permissions", "Required Permissions"),
+        ("optional_permissions", "Optional Permissions"),
+    ):
+        perms = risk[section]
+
+        if perms["total"] == 0 and len(perms) == 1:
+            continue
+
+        output += f"\n\n\n{title}\n{'='*60}"
+        output += f"\n  {perms['total']}\tTotal\n{'-'*60}"
+
+        for key in sorted(perms, key=lambda k: (-perms[k], k)):
+            if key != "total":
+                output += f"\n  {perms[key]}\t{key}"
+
+    return output + "\n"
+
+
+@timed("scan")
+def get_local_risks(extensions: list, minimum: int = 0) -> list:
+    """Returns installed extensions with their local risk, riskiest first.
+
+    Args:
+        extensions: A list of installed extension meta data with manifests.
+        minimum: The lowest total risk score to include.
+
+    Returns:
+        A list of extension dicts with an added 'risk' key.
+    """
+    results = []
+
+    for extension in extensions:
+        risk = get_local_risk(extension["manifest"])
+
+        if risk["total"] >= minimum:
+            results.append(dict(extension, risk=risk))
+
+    return sorted(results, key=lambda ext: -ext["risk"]["total"])
+
+
+def get_local_risks_table(extensions: list, path: str) -> None:
+    """Prints a table of installed extensions' local risk estimates.
+
+    Args:
+        extensions: A list of extension dicts from get_local_risks().
+        path: A string for the path to installed Chrome extensions.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    print(f"\nLocal Risk Estimates for {path}")
+
+    data = []
+    for ext in extensions:
+        risk = ext["risk"]
+
+        data.append(
+            [
+                ext["name"][:40],
+                ext["id"],
+                risk["total"],
+                risk["csp"]["total"],
+                risk["permissions"]["total"],
+                risk["optional_permissions"]["total"],
+            ]
+        )
+
+    header = [
+        "\033[1mName\033[0m",
+        "\033[1mIdentifier\033[0m",
+        "\033[1mTotal\033[0m",
+        "\033[1mCSP\033[0m",
+        "\033[1mRequired\033[0m",
+        "\033[1mOptional\033[0m",
+    ]
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="llrrrr",
+        )
+
+
+def get_latest_local_version(extension_dir: str) -> str:
+    """Returns the latest local version for a passed-in extension path.
+
+    Args:
+        extension_dir: A string for the path to a given local extension.
+
+    Returns:
+        A string for the version of the most recent local version available,
+        or an empty string if there are no versions.
+    """
+    from packaging import version
+
+    vers = []
+
+    for dir in next(os.walk(get_crx_path(extension_dir)))[1]:
+        vers.append(version.parse(dir))
+
+    if len(vers) == 0:
+        return ""
+
+    return str(max(vers))
+
+
+def read_varint(data: bytes, pos: int) -> tuple:
+    """Returns a protobuf varint and the position following it.
+
+    Args:
+        data: The bytes of a protobuf message.
+        pos: The offset of the varint.
+
+    Returns:
+        A tuple of the decoded integer and the next offset.
+    """
+    value = 0
+    shift = 0
+
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint")
+
+        byte = data[pos]
+        value |= (byte & 0x7F) << shift
+        pos += 1
+        shift += 7
+
+        if byte & 0x80 == 0:
+            return value, pos
+
+
+def parse_protobuf(data: bytes) -> dict:
+    """Returns the length-delimited fields of a protobuf message.
+
+    Only the wire types a CRX3 header uses are understood; other fields are
+    skipped.
+
+    Args:
+        data: The bytes of a protobuf message.
+
+    Returns:
+        A dict of field numbers to lists of bytes values.
+    """
+    fields: dict = {}
+    pos = 0
+
+    while pos < len(data):
+        key, pos = read_varint(data, pos)
+        field, wire_type = key >> 3, key & 0x07
+
+        if wire_type == 0:
+            value, pos = read_varint(data, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 5:
+            pos += 4
+        elif wire_type == 2:
+            length, pos = read_varint(data, pos)
+            end = pos + length
+            fields.setdefault(field, []).append(data[pos:end])
+            pos = end
+        else:
+            raise ValueError(f"Unsupported wire type {wire_type}")
+
+    return fields
+
+
+def crx_id_from_bytes(data: bytes) -> str:
+    """Returns an extension identifier for the first 16 bytes of a digest.
+
+    Args:
+        data: A CRX identifier or a SHA-256 digest of a public key.
+
+    Returns:
+        An extension identifier string, using the letters 'a' through 'p'.
+    """
+    return "".join(chr(ord("a") + int(c, 16)) for c in data[:16].hex())
+
+
+def read_crx_id(handle: Any) -> str:
+    """Returns the extension identifier stored in a CRX package's header.
+
+    The handle is left positioned at the start of the file. Zip archives and
+    headers without an identifier return an empty string.
+
+    Args:
+        handle: A binary file object of a package.
+
+    Returns:
+        An extension identifier string, or an empty string.
+    """
+    import struct
+    import hashlib
+
+    try:
+        magic, version, length = struct.unpack("<4sII", handle.read(12))
+
+        if magic != CRX_MAGIC:
+            return ""
+
+        if version == 2:
+            handle.read(4)
+            key = handle.read(length)
+            return crx_id_from_bytes(hashlib.sha256(key).digest())
+
+        header = parse_protobuf(handle.read(length))
+
+        for signed_data in header.get(10000, []):
+            for crx_id in parse_protobuf(signed_data).get(1, []):
+                if len(crx_id) == 16:
+                    return crx_id_from_bytes(crx_id)
+
+        for proof in header.get(2, []) + header.get(3, []):
+            for key in parse_protobuf(proof).get(1, []):
+                return crx_id_from_bytes(hashlib.sha256(key).digest())
+    except (struct.error, ValueError):
+        pass
+    finally:
+        handle.seek(0)
+
+    return ""
+
+
+def read_package_json(package: Any, name: str) -> Any:
+    """Returns a parsed JSON file from within a package's zip archive.
+
+    Args:
+        package: An open ZipFile of an extension package.
+        name: The archive member's name.
+
+    Returns:
+        The parsed JSON value.
+    """
+    return json.loads(package.read(name).decode("utf-8-sig"))
+
+
+def get_package_messages_path(package: Any) -> str:
+    """Returns the most appropriate messages.json member of a package.
+
+    Args:
+        package: An open ZipFile of an extension package.
+
+    Returns:
+        A string of the archive member's name, or an empty string.
+    """
+    names = set(package.namelist())
+
+    for locale in MESSAGES_LOCALES:
+        messages = f"_locales/{locale}/messages.json"
+
+        if messages in names:
+            return messages
+
+    return ""
+
+
+def read_package(path: str) -> dict:
+    """Returns an extension's meta data read in place from a .crx or .zip.
+
+    The zip's central directory is found from the end of the file, so a CRX
+    header in front of it is skipped without copying or extracting anything.
+    This runs in worker processes, so it must stay a module-level function.
+
+    Args:
+        path: The filesystem path to a package.
+
+    Returns:
+        A dict of extension meta data including its manifest, or an empty
+        dict if the package can't be read.
+    """
+    import zipfile
+
+    try:
+        with open(path, "rb") as fileHandle:
+            id = read_crx_id(fileHandle)
+
+            with zipfile.ZipFile(fileHandle) as package:
+                manifest = read_package_json(package, "manifest.json")
+
+                if not isinstance(manifest, dict):
+                    return {}
+
+                name = get_manifest_name(manifest, "", package)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+        return {}
+
+    if id == "":
+        id = os.path.splitext(os.path.basename(path))[0]
+
+    version = manifest.get("version", "")
+
+    return {
+        "name": name,
+        "version": version if isinstance(version, str) else "",
+        "id": id,
+        "package": path,
+        "manifest": manifest,
+    }
+
+
+def find_packages(path: str) -> list:
+    """Returns all .crx and .zip packages beneath a passed-in path.
+
+    Args:
+        path: The filesystem path to a directory of packages.
+
+    Returns:
+        A list of package paths.
+    """
+    packages = []
+
+    for root, dirs, names in os.walk(os.path.expanduser(path)):
+        dirs.sort()
+
+        for name in sorted(names):
+            if name.lower().endswith(PACKAGE_SUFFIXES):
+                packages.append(os.path.join(root, name))
+
+    return packages
+
+
+def get_package_extensions(path: str, manifests: bool = False) -> list:
+    """Returns a list of extensions from a directory of .crx/.zip packages.
+
+    Large directories are read by a process pool. When several packages hold
+    the same extension, only the newest version is kept.
+
+    Args:
+        path: The filesystem path to a directory of packages.
+        manifests: Whether to include each parsed manifest.json file.
+
+    Returns:
+        A list of extension meta data in the same shape as
+        get_installed_extensions().
+    """
+    from packaging import version
+
+    packages = find_packages(path)
+    workers = os.cpu_count() or 1
+
+    if workers == 1 or len(packages) < PACKAGE_POOL_MIN:
+        results = [read_package(package) for package in packages]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        chunksize = max(1, min(64, len(packages) // (workers * 4)))
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(read_package, packages, chunksize=chunksize)
+            )
+
+    extensions: dict = {}
+
+    for extension in results:
+        if not extension or extension_is_ignored(extension["id"]):
+            continue
+
+        if manifests is False:
+            del extension["manifest"]
+
+        newest = extensions.get(extension["id"])
+
+        if newest is None or version.parse(
+            extension["version"]
+        ) > version.parse(newest["version"]):
+            extensions[extension["id"]] = extension
+
+    return list(extensions.values())
+
+
+@timed("scan")
+def get_installed_extensions(path: str, manifests: bool = False) -> list:
+    """Returns a list of installed extensions based on a passed-in path.
+
+    Args:
+        path: A string for the path to installed Chrome extensions.
+        manifests: Whether to include each parsed manifest.json file.
+
+    Returns:
+        A list of extension identifiers that are locally installed for Chrome.
+    """
+    extensions: list = []
+
+    if offline_bundle is not None and manifests is False:
+        return offline_bundle.get("inventory") or []
+
+    if crx_packages:
+        return get_package_extensions(path, manifests)
+
+    if manifests is False:
+        response = daemon_request("/mrxcavator/extensions", "GET")
+
+        if response is not None:
+            return json.loads(response.content.decode("utf-8"))
+
+    for dir in find_extension_directories(path):
+        version = get_latest_local_version(dir)
+
+        if version == "" or extension_is_ignored(dir):
+            continue
+
+        manifest = read_manifest(dir, version)
+        name = get_manifest_name(manifest, f"{get_crx_path(dir)}/{version}/")
+        extension: dict = {"name": name, "version": version, "id": dir}
+
+        if manifests:
+            extension["manifest"] = manifest
+
+        extensions.append(extension)
+
+    return extensions
+
+
+def get_extensions_table(
+    extensions: list, path: str, top: int = 0, stream: bool = False
+) -> None:
+    """Prints a table of installed extensions.
+
+    Args:
+        extensions: A list of installed extension meta data.
+        path: A string for the path to installed Chrome extensions.
+        top: The number of rows to show, or 0 for every row.
+        stream: Whether to print rows with fixed widths as they're listed.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    print(f"\nExtensions Found in {path}")
+
+    data = (
+        [ext["name"], ext["version"].split("_")[0], ext["id"]]
+        for ext in extensions
+    )
+    rows = select_rows(data, None, top)
+    names = ["Name", "Version", "Identifier"]
+
+    if stream:
+        stream_table(rows, names, [40, 16, 32], "lll")
+        return
+
+    header = [f"\033[1m{name}\033[0m" for name in names]
+
+    with timed("render"):
+        termtables.print(
+            list(rows),
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="lll",
+        )
+
+
+def find_extcall_files(path: str) -> list:
+    """Returns the JavaScript and HTML files beneath an extension version.
+
+    Args:
+        path: The filesystem path to a specific Chrome extension version.
+
+    Returns:
+        A list of tuples of each file's path and size in bytes.
+    """
+    files = []
+
+    for root, dirs, names in os.walk(path):
+        dirs.sort()
+
+        for name in sorted(names):
+            if name.lower().endswith(EXTCALL_SUFFIXES):
+                file = os.path.join(root, name)
+
+                try:
+                    files.append((file, os.path.getsize(file)))
+                except OSError:
+                    continue
+
+    return files
+
+
+def scan_package_extcalls(filename: str) -> dict:
+    """Returns the unique URLs referenced by a package's JS and HTML files.
+
+    Members are read straight out of the archive rather than extracted.
+
+    Args:
+        filename: The path of a .crx or .zip package to scan.
+
+    Returns:
+        A dict of URL strings in order of appearance.
+    """
+    import zipfile
+
+    urls: dict = {}
+
+    try:
+        with zipfile.ZipFile(filename) as package:
+            for member in package.infolist():
+                if member.filename.lower().endswith(EXTCALL_SUFFIXES):
+                    for match in EXTCALL_PATTERN.finditer(
+                        package.read(member)
+                    ):
+                        url = match.group().rstrip(b".,;:!?")
+                        urls[url.decode("ascii", "ignore")] = True
+    except (OSError, ValueError, zipfile.BadZipFile):
+        return {}
+
+    return urls
+
+
+def scan_file_extcalls(filename: str) -> list:
+    """Returns the unique URLs referenced by a file, in order of appearance.
+
+    The file is memory-mapped so large bundles are matched without being
+    copied into memory. Packages are scanned member by member. This runs in
+    worker processes, so it must stay a module-level function.
+
+    Args:
+        filename: The path of a file or package to scan.
+
+    Returns:
+        A list of URL strings.
+    """
+    import mmap
+
+    if filename.lower().endswith(PACKAGE_SUFFIXES):
+        return list(scan_package_extcalls(filename))
+
+    urls: dict = {}
+
+    try:
+        with open(filename, "rb") as fileHandle:
+            if os.fstat(fileHandle.fileno()).st_size == 0:
+                return []
+
+            with mmap.mmap(
+                fileHandle.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                for match in EXTCALL_PATTERN.finditer(data):
+                    url = match.group().rstrip(b".,;:!?")
+                    urls[url.decode("ascii", "ignore")] = True
+    except (OSError, ValueError):
+        return []
+
+    return list(urls)
+
+
+@timed("scan")
+def scan_files_extcalls(files: list) -> list:
+    """Returns the URLs referenced by each file, scanning in parallel.
+
+    Small sets of files, or any on a single CPU, are scanned in-process since
+    starting a process pool costs more than it saves.
+
+    Args:
+        files: A list of tuples of file paths and sizes in bytes.
+
+    Returns:
+        A list of URL lists in the same order as the passed-in files.
+    """
+    names = [file for file, size in files]
+    workers = os.cpu_count() or 1
+
+    if workers == 1 or sum(size for file, size in files) < EXTCALL_POOL_MIN:
+        return [scan_file_extcalls(name) for name in names]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    chunksize = max(1, min(64, len(names) // (workers * 4)))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(scan_file_extcalls, names, chunksize=chunksize)
+        )
+
+
+def find_extension_files(extension: dict) -> list:
+    """Returns the files to scan for an extension, which is its package
+    itself when it was read from a .crx or .zip.
+
+    Args:
+        extension: A dict of installed extension meta data.
+
+    Returns:
+        A list of tuples of each file's path and size in bytes.
+    """
+    if "package" in extension:
+        try:
+            size = os.path.getsize(extension["package"])
+        except OSError:
+            return []
+
+        return [(extension["package"], size)]
+
+    path = f"{get_crx_path(extension['id'])}/{extension['version']}/"
+
+    return find_extcall_files(path)
+
+
+def get_local_extcalls(extension: dict) -> list:
+    """Returns the "external calls" of a locally installed extension version.
+
+    The list is deduplicated and filtered the same way get_extcalls() filters
+    a CRXcavator report's "extcalls" list.
+
+    Args:
+        extension: A dict of installed extension meta data.
+
+    Returns:
+        A list of URL strings.
+    """
+    files = find_extension_files(extension)
+
+    return get_extcalls(list(itertools.chain(*scan_files_extcalls(files))))
+
+
+def get_extcalls_diff(local: list, report: Optional[Extension]) -> list:
+    """Returns local and reported "external calls" with where each was found.
+
+    Args:
+        local: A list of URL strings found by scanning locally.
+        report: An Extension of a CRXcavator extension report, or None.
+
+    Returns:
+        A list of [url, source] lists, sorted by hostname.
+    """
+    reported = []
+
+    if report is not None:
+        reported = get_extcalls(list(report.latest.extcalls))
+
+    sources = {url: "local" for url in local}
+
+    for url in reported:
+        sources[url] = "both" if url in sources else "api"
+
+    return sorted(
+        ([url, source] for url, source in sources.items()),
+        key=lambda item: (urlparse(item[0]).netloc, item[0]),
+    )
+
+
+def get_extcalls_table(results: list, report: bool) -> None:
+    """Prints a table of an extension's locally scanned "external calls."
+
+    Args:
+        results: A list of [url, source] lists from get_extcalls_diff().
+        report: A boolean for whether a CRXcavator report was compared.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    if len(results) == 0:
+        error("No external calls were found for this extension.", True)
+
+    data = []
+    for url, source in results:
+        listing = get_host_listing(urlparse(url).netloc)
+        cell = f"{url[:100]} [{listing}]" if listing else url[:100]
+
+        if report:
+            data.append([cell, source.title()])
+        else:
+            data.append([cell])
+
+    header = ["\033[1mURL\033[0m"]
+
+    if report:
+        header.append("\033[1mFound By\033[0m")
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="l" * len(header),
+        )
+
+    if report:
+        counts = {"both": 0, "local": 0, "api": 0}
+
+        for url, source in results:
+            counts[source] += 1
+
+        print(
+            f"\n  {counts['both']} found by both, {counts['local']} only "
+            f"locally, {counts['api']} only by CRXcavator\n"
+        )
+
+
+def get_extcalls_all_table(extensions: list) -> None:
+    """Scans all passed-in extensions for "external calls" and prints a table.
+
+    Every extension's files are scanned by a single pool so that one large
+    extension doesn't leave the other workers idle.
+
+    Args:
+        extensions: A list of installed extension meta data.
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    files = []
+    owners = []
+
+    for ext in extensions:
+        for file in find_extension_files(ext):
+            files.append(file)
+            owners.append(ext["id"])
+
+    scanned: dict = {ext["id"]: [] for ext in extensions}
+    sizes: dict = {ext["id"]: [0, 0] for ext in extensions}
+
+    for owner, file, urls in zip(owners, files, scan_files_extcalls(files)):
+        scanned[owner].append(urls)
+        sizes[owner][0] += 1
+        sizes[owner][1] += file[1]
+
+    data = []
+    for ext in extensions:
+        urls = get_extcalls(list(itertools.chain(*scanned[ext["id"]])))
+        hosts = {urlparse(url).netloc for url in urls}
+
+        data.append(
+            [
+                ext["name"][:40],
+                ext["id"],
+                sizes[ext["id"]][0],
+                f"{sizes[ext['id']][1] / 1024:.0f} KiB",
+                len(urls),
+                len(hosts),
+            ]
+        )
+
+    header = [
+        "\033[1mName\033[0m",
+        "\033[1mIdentifier\033[0m",
+        "\033[1mFiles\033[0m",
+        "\033[1mSize\033[0m",
+        "\033[1mURLs\033[0m",
+        "\033[1mHosts\033[0m",
+    ]
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="llrrrr",
+        )
+
+
+def load_inventory_index() -> dict:
+    """Returns the local inventory index of previously hashed files.
+
+    Args:
+        None
+
+    Returns:
+        A dict with 'files' and 'packages' keys mapping paths to their size,
+        modification time and digests.
+    """
+    try:
+        with open(get_root_dir() + INVENTORY_FILE) as fileHandle:
+            index = json.load(fileHandle)
+    except (IOError, ValueError):
+        index = {}
+
+    if not isinstance(index, dict):
+        index = {}
+
+    index.setdefault("files", {})
+    index.setdefault("packages", {})
+
+    return index
+
+
+def save_inventory_index(index: dict) -> bool:
+    """Writes the local inventory index of hashed files.
+
+    Args:
+        index: A dict from load_inventory_index().
+
+    Returns:
+        A boolean result.
+    """
+    os.makedirs(get_root_dir(), exist_ok=True)
+
+    return write_atomic(
+        get_root_dir() + INVENTORY_FILE, json.dumps(index, sort_keys=True)
+    )
+
+
+def hash_file(filename: str) -> str:
+    """Returns the SHA-256 digest of a file.
+
+    Large files are memory-mapped; hashlib releases the GIL while hashing, so
+    several files are hashed in parallel by a thread pool.
+
+    Args:
+        filename: The path of a file to hash.
+
+    Returns:
+        A hex string of the file's digest.
+    """
+    import mmap
+    import hashlib
+
+    digest = hashlib.sha256()
+
+    with open(filename, "rb") as fileHandle:
+        size = os.fstat(fileHandle.fileno()).st_size
+
+        if size >= HASH_BUFFER:
+            with mmap.mmap(
+                fileHandle.fileno(), 0, access=mmap.ACCESS_READ
+            ) as data:
+                digest.update(data)
+        else:
+            digest.update(fileHandle.read())
+
+    return digest.hexdigest()
+
+
+def get_tree_hash(leaves: list) -> str:
+    """Returns a Merkle tree hash of an extension version's files.
+
+    Each leaf hashes a file's relative path with its digest, leaves are
+    ordered by path, and each level hashes pairs of nodes; an odd node is
+    carried up as-is. Leaves and nodes use different prefixes so one can't be
+    passed off as the other.
+
+    Args:
+        leaves: A list of [relative path, hex digest] lists.
+
+    Returns:
+        A hex string of the tree's root hash.
+    """
+    import hashlib
+
+    nodes = [
+        hashlib.sha256(
+            b"\x00" + path.encode("utf-8") + b"\x00" + bytes.fromhex(digest)
+        ).digest()
+        for path, digest in sorted(leaves)
+    ]
+
+    if len(nodes) == 0:
+        return hashlib.sha256(b"").hexdigest()
+
+    while len(nodes) > 1:
+        level = []
+
+        for left, right in itertools.zip_longest(nodes[::2], nodes[1::2]):
+            if right is None:
+                level.append(left)
+            else:
+                level.append(hashlib.sha256(b"\x01" + left + right).digest())
+
+        nodes = level
+
+    return nodes[0].hex()
+
+
+def hash_package(filename: str) -> list:
+    """Returns the digest of each file inside a .crx or .zip package.
+
+    Args:
+        filename: The path of a package.
+
+    Returns:
+        A list of [relative path, hex digest] lists, without Chrome's
+        _metadata directory.
+    """
+    import zipfile
+    import hashlib
+
+    leaves = []
+
+    with zipfile.ZipFile(filename) as package:
+        for member in package.infolist():
+            if member.filename.startswith(CHROME_METADATA_DIR + "/"):
+                continue
+            elif not member.is_dir():
+                digest = hashlib.sha256(package.read(member)).hexdigest()
+                leaves.append([member.filename, digest])
+
+    return leaves
+
+
+def find_version_files(path: str) -> list:
+    """Returns every file beneath an extension version with its metadata.
+    Chrome's own _metadata directory is skipped, so an installed version has
+    the same files as the package it was installed from.
+
+    Args:
+        path: The filesystem path to a specific Chrome extension version.
+
+    Returns:
+        A list of [path, relative path, size, mtime_ns] lists.
+    """
+    files = []
+
+    for root, dirs, names in os.walk(path):
+        start = len(path)
+        base = root[start:].strip(os.sep).replace(os.sep, "/")
+
+        if base == "" and CHROME_METADATA_DIR in dirs:
+            dirs.remove(CHROME_METADATA_DIR)
+
+        for name in names:
+            file = os.path.join(root, name)
+
+            try:
+                stat = os.stat(file)
+            except OSError:
+                continue
+
+            relative = f"{base}/{name}" if base else name
+            files.append([file, relative, stat.st_size, stat.st_mtime_ns])
+
+    return files
+
+
+@timed("scan")
+def hash_extensions(extensions: list) -> list:
+    """Returns per-file digests and a tree hash for each passed-in extension.
+
+    Files whose size and modification time match the inventory index reuse
+    their stored digest, so only new or changed files are read. The index is
+    updated afterwards.
+
+    Args:
+        extensions: A list of installed extension meta data.
+
+    Returns:
+        A list of extension dicts with added 'files', 'tree' and 'hashed'
+        keys; 'hashed' counts the files that had to be read.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    index = load_inventory_index()
+    entries: dict = {}
+    packages = set()
+    versions = []
+    pending = []
+
+    for ext in extensions:
+        if "package" in ext:
+            try:
+                stat = os.stat(ext["package"])
+            except OSError:
+                stat = None
+
+            if stat is not None:
+                files = [[ext["package"], "", stat.st_size, stat.st_mtime_ns]]
+                packages.add(ext["package"])
+            else:
+                files = []
+        else:
+            files = find_version_files(
+                f"{get_crx_path(ext['id'])}/{ext['version']}/"
+            )
+
+        for file, relative, size, mtime in files:
+            if file in entries:
+                continue
+
+            cached = index["packages" if file in packages else "files"].get(
+                file
+            )
+
+            if cached and cached[:2] == [size, mtime]:
+                entries[file] = cached
+            else:
+                entries[file] = [size, mtime]
+                pending.append(file)
+
+        versions.append((ext, files))
+
+    def hash_entry(file: str) -> Any:
+        import zipfile
+
+        try:
+            if file in packages:
+                return hash_package(file)
+            else:
+                return hash_file(file)
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return None
+
+    workers = min(HASH_WORKERS, (os.cpu_count() or 1) * 2)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for file, digest in zip(pending, executor.map(hash_entry, pending)):
+            if digest is None:
+                del entries[file]
+            else:
+                entries[file].append(digest)
+
+    changed = set(pending)
+    results = []
+
+    for ext, files in versions:
+        leaves = []
+        hashed = 0
+
+        for file, relative, size, mtime in files:
+            if file not in entries:
+                continue
+            elif file in packages:
+                leaves += entries[file][2]
+            else:
+                leaves.append([relative, entries[file][2]])
+
+            hashed += 1 if file in changed else 0
+
+        results.append(
+            dict(
+                ext,
+                files=sorted(leaves),
+                tree=get_tree_hash(leaves),
+                hashed=hashed,
+            )
+        )
+
+    scanned = tuple(
+        get_crx_path(ext["id"]) + "/"
+        for ext, files in versions
+        if "package" not in ext
+    )
+
+    for file in list(index["files"]):
+        if file.startswith(scanned) and file not in entries:
+            del index["files"][file]
+
+    for file in list(index["packages"]):
+        if file not in entries and not os.path.isfile(file):
+            del index["packages"][file]
+
+    for file, entry in entries.items():
+        index["packages" if file in packages else "files"][file] = entry
+
+    save_inventory_index(index)
+
+    return results
+
+
+def get_hashes_table(results: list) -> None:
+    """Prints a table of the tree hash of each passed-in extension.
+
+    Args:
+        results: A list of extension dicts from hash_extensions().
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    data = []
+    for ext in results:
+        data.append(
+            [
+                ext["name"][:30],
+                ext["id"],
+                ext["version"].split("_")[0],
+                len(ext["files"]),
+                ext["hashed"],
+                ext["tree"][:16],
+            ]
+        )
+
+    header = [
+        "\033[1mName\033[0m",
+        "\033[1mIdentifier\033[0m",
+        "\033[1mVersion\033[0m",
+        "\033[1mFiles\033[0m",
+        "\033[1mHashed\033[0m",
+        "\033[1mTree Hash\033[0m",
+    ]
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="lllrrl",
+        )
+
+
+def get_hash_summary(result: dict) -> str:
+    """Returns a formatted list of an extension's file digests.
+
+    Args:
+        result: An extension dict from hash_extensions().
+
+    Returns:
+        A string of the hash summary.
+    """
+    output = f"\nExtension Hashes\n{'='*60}\n"
+    output += f"  Extension Name:\t{result['name']}\n"
+    output += f"  Extension ID:\t\t{result['id']}\n"
+    output += f"  Local Version:\t{result['version'].split('_')[0]}\n"
+    output += f"\n  Tree Hash:\t\t{result['tree']}"
+    output += f"\n\n\nFiles ({len(result['files'])})\n{'='*60}"
+
+    for path, digest in result["files"]:
+        output += f"\n  {digest}  {path}"
+
+    return output + "\n"
+
+
+def get_history_file(id: str) -> str:
+    """Returns the filesystem path of an extension's risk history.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        A string for the path of the history file.
+    """
+    return f"{get_root_dir()}{HISTORY_DIR}/{id}.bin"
+
+
+def parse_version_date(value: str) -> int:
+    """Returns a report version's Web Store 'last_updated' date as a Unix
+    timestamp.
+
+    Args:
+        value: A date string from a report.
+
+    Returns:
+        An integer of seconds since the epoch, or 0 if it can't be parsed.
+    """
+    for format in GRAPH_DATE_FORMATS:
+        try:
+            date = datetime.datetime.strptime(value, format)
+        except ValueError:
+            continue
+
+        return int(date.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+    return 0
+
+
+def get_history_rows(report: Extension) -> list:
+    """Returns a history row for each version of a report, oldest first.
+
+    A version's date is never earlier than the version before it, so rows
+    stay in date order even when a date can't be parsed. Versions are stored
+    as a CRC-32 of their version string, and risk scores are rounded to
+    integers; a score that isn't a number is stored as 0.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        A list of rows in the order of HISTORY_FIELDS.
+    """
+    import zlib
+
+    rows = []
+    date = 0
+
+    for version in report.versions:
+        date = max(parse_version_date(version.webstore.last_updated), date)
+        checksum = zlib.crc32(version.version.encode("utf-8"))
+        risk = [
+            (
+                int(round(value))
+                if isinstance(value, (int, float)) and math.isfinite(value)
+                else 0
+            )
+            for value in get_risk_row(Extension(report.id, (version,)))
+        ]
+        rows.append([date, checksum] + risk)
+
+    return rows
+
+
+def load_history(id: str) -> dict:
+    """Returns an extension's stored risk history as column arrays.
+
+    The file holds fixed-size records of little-endian 64-bit integers, so it
+    is read with a single array.frombytes() and split into columns with
+    strided slices. A partially written trailing record is ignored.
+
+    Args:
+        id: An extension identifier string.
+
+    Returns:
+        A dict of array.array columns keyed by HISTORY_FIELDS.
+    """
+    from array import array
+
+    values = array("q")
+
+    try:
+        with open(get_history_file(id), "rb") as fileHandle:
+            data = fileHandle.read()
+    except IOError:
+        data = b""
+
+    end = len(data) - len(data) % HISTORY_RECORD
+    values.frombytes(data[:end])
+
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    step = len(HISTORY_FIELDS)
+
+    return {
+        name: values[index::step] for index, name in enumerate(HISTORY_FIELDS)
+    }
+
+
+def append_history(report: Extension) -> int:
+    """Appends a report's versions that aren't in the stored history yet.
+
+    Versions dated before the newest stored record are never appended, so the
+    history stays in date order. A history that can't be written is skipped
+    without affecting the report.
+
+    Args:
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        An integer count of the appended records.
+    """
+    from array import array
+
+    filename = get_history_file(report.id)
+    history = load_history(report.id)
+    size = len(history["date"]) * HISTORY_RECORD
+    stored = set(zip(history["date"], history["version"]))
+    last = history["date"][-1] if stored else -1
+
+    rows = [
+        row
+        for row in get_history_rows(report)
+        if row[0] >= last and (row[0], row[1]) not in stored
+    ]
+
+    if len(rows) == 0:
+        return 0
+
+    try:
+        values = array("q", itertools.chain(*rows))
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    try:
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+        with open(filename, "ab") as fileHandle:
+            fileHandle.truncate(size)
+            fileHandle.write(values.tobytes())
+    except (IOError, OSError):
+        return 0
+
+    return len(rows)
+
+
+def downsample(values: list, width: int) -> list:
+    """Returns values reduced to at most the passed-in width, keeping the
+    minimum and maximum of each bucket in the order they occurred so peaks
+    and dips survive.
+
+    Args:
+        values: A list of numbers, which may include NaN gaps.
+        width: The largest number of values to return.
+
+    Returns:
+        A list of numbers.
+    """
+    if len(values) <= width:
+        return list(values)
+
+    buckets = max(width // 2, 1)
+    result = []
+
+    for bucket in range(buckets):
+        start = bucket * len(values) // buckets
+        end = (bucket + 1) * len(values) // buckets
+        points = [
+            (index, value)
+            for index, value in enumerate(values[start:end])
+            if not math.isnan(value)
+        ]
+
+        if len(points) == 0:
+            result += [math.nan, math.nan]
+            continue
+
+        low = min(points, key=lambda point: point[1])
+        high = max(points, key=lambda point: point[1])
+        result += [point[1] for point in sorted({low, high})]
+
+    return result
+
+
+def align_histories(histories: list) -> list:
+    """Returns risk totals of several extensions on one shared time axis.
+
+    Each extension keeps its last known total until its next version and is
+    NaN before its first version.
+
+    Args:
+        histories: A list of dicts of history columns from load_history().
+
+    Returns:
+        A list of equal-length lists of risk totals.
+    """
+    dates = sorted(set(itertools.chain(*(h["date"] for h in histories))))
+    series = []
+
+    for history in histories:
+        values = []
+        index = 0
+        total = math.nan
+
+        for date in dates:
+            while index < len(history["date"]):
+                if history["date"][index] > date:
+                    break
+
+                total = history["total"][index]
+                index += 1
+
+            values.append(total)
+
+        series.append(values)
+
+    return series
+
+
+@timed("render")
+def plot_risk(series: list, width: int) -> str:
+    """Returns a chart of one or more series of risk scores.
+
+    Args:
+        series: A list of lists of risk totals, which may include NaN gaps.
+        width: The largest number of points to plot per series.
+
+    Returns:
+        A string of the rendered graph.
+    """
+    import asciichartpy  # type: ignore
+
+    series = [downsample(values, width) for values in series]
+    values = [v for v in itertools.chain(*series) if not math.isnan(v)]
+
+    return asciichartpy.plot(
+        series,
+        {
+            "min": min(values) - 5,
+            "max": max(values) + 5,
+            "height": 25,
+            "format": "{:8.0f}",
+            "colors": GRAPH_COLORS if len(series) > 1 else [None],
+        },
+    )
+
+
+def get_graph_width() -> int:
+    """Returns how many points fit across the terminal next to the labels.
+
+    Args:
+        None
+
+    Returns:
+        An integer number of points.
+    """
+    import shutil
+
+    return max(shutil.get_terminal_size().columns - GRAPH_LABEL_WIDTH, 20)
+
+
+def build_risk_graph(results: Extension, width: int) -> str:
+    """Returns a graph of an extension's risk scores over time.
+
+    Args:
+        results: An Extension of a CRXcavator extension report.
+        width: The largest number of points to plot.
+
+    Returns:
+        A string of the rendered graph.
+    """
+    data = []
+    for item in results.versions:
+        data.append(item.risk.total)
+
+    return plot_risk([data], width)
+
+
+def get_risk_graph(ids: str) -> None:
+    """Prints a graph of one or more extensions' risk scores over time.
+
+    Each report that is fetched is appended to the local risk history, and
+    the graph is drawn from that history, so extensions with history still
+    graph when their report can't be fetched.
+
+    Args:
+        ids: Comma-separated extension identifier strings.
+
+    Returns:
+        None.
+    """
+    width = get_graph_width()
+    extensions = [id for id in ids.split(",") if id]
+
+    if len(extensions) == 1:
+        response = daemon_request(
+            f"/mrxcavator/graph/{extensions[0]}?width={width}", "GET"
+        )
+
+        if response is not None:
+            print(response.content.decode("utf-8"))
+            return
+
+    histories = []
+    names = []
+
+    for id in extensions:
+        report = get_report(id)
+        history = load_history(id)
+
+        if len(history["date"]) == 0 and report is not None:
+            history = {
+                name: column
+                for name, column in zip(
+                    HISTORY_FIELDS, zip(*get_history_rows(report))
+                )
+            }
+
+        if len(history["date"]) == 0:
+            error(f"No results were found for {id}.")
+            continue
+
+        histories.append(history)
+        names.append(f"{report.latest.webstore.name} ({id})" if report else id)
+
+    if len(histories) == 0:
+        error("No risk history was found.", True)
+    elif len(histories) == 1:
+        print(plot_risk([list(histories[0]["total"])], width))
+    else:
+        print(plot_risk(align_histories(histories), width))
+
+        for color, name in zip(itertools.cycle(GRAPH_COLORS), names):
+            print(f"  {color}\u25a0\033[0m {name}")
+
+
+def get_snapshot_file() -> str:
+    """Returns the filesystem path of the snapshot used by --diff.
+
+    Args:
+        None
+
+    Returns:
+        A string for the path of the snapshot file.
+    """
+    return get_root_dir() + SNAPSHOT_FILE
+
+
+def load_snapshot(filename: str) -> dict:
+    """Returns the snapshot saved by the previous --diff run.
+
+    Args:
+        filename: The snapshot filename as a string.
+
+    Returns:
+        A dict of snapshot entries keyed by extension identifier, which is
+        empty if there is no readable snapshot yet.
+    """
+    try:
+        with open(filename) as fileHandle:
+            snapshot = json.load(fileHandle)
+    except (IOError, ValueError):
+        snapshot = {}
+
+    if not isinstance(snapshot, dict):
+        snapshot = {}
+
+    return {
+        id: entry
+        for id, entry in snapshot.items()
+        if isinstance(entry, dict) and "fingerprint" in entry
+    }
+
+
+def save_snapshot(filename: str, snapshot: dict) -> bool:
+    """Writes a --diff snapshot.
+
+    Args:
+        filename: The snapshot filename as a string.
+        snapshot: A dict of snapshot entries keyed by extension identifier.
+
+    Returns:
+        A boolean result.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+
+    return write_atomic(
+        filename, json.dumps(snapshot, sort_keys=True, separators=(",", ":"))
+    )
+
+
+def get_snapshot_entry(extension: dict, report: Extension) -> dict:
+    """Returns the fields of an extension that --diff tracks between runs.
+
+    Permissions come from the report's permission scores and, when the
+    extension was read with its manifest, from the local manifest. The
+    fingerprint covers every other field, so unchanged extensions are
+    recognized with a single string comparison.
+
+    Args:
+        extension: An extension dict, optionally with a 'manifest' key.
+        report: An Extension of a CRXcavator extension report.
+
+    Returns:
+        A dict of the extension's snapshot entry.
+    """
+    import hashlib
+
+    latest = report.latest
+    permissions: set = set()
+
+    for section in (latest.risk.permissions, latest.risk.optional_permissions):
+        if section is not None:
+            permissions.update(name for name, _ in section.items)
+
+    if "manifest" in extension:
+        declared = get_manifest_permissions(extension["manifest"])
+        del declared["csp"]
+        permissions.update(itertools.chain(*declared.values()))
+
+    entry = {
+        "name": latest.webstore.name or extension.get("name", ""),
+        "version": latest.version,
+        "risk": latest.risk.total,
+        "permissions": sorted(permissions),
+        "extcalls": sorted(set(latest.extcalls)),
+    }
+
+    digest = hashlib.blake2b(
+        json.dumps(entry, sort_keys=True).encode("utf-8"), digest_size=8
+    )
+    entry["fingerprint"] = digest.hexdigest()
+
+    return entry
+
+
+def get_changes(id: str, old: Optional[dict], new: Optional[dict]) -> list:
+    """Returns the changes between two snapshot entries of an extension.
+
+    Args:
+        id: An extension identifier string.
+        old: The previous snapshot entry, or None if the extension is new.
+        new: The current snapshot entry, or None if it was removed.
+
+    Returns:
+        A list of change dicts with 'id', 'name', 'change', 'old' and 'new'
+        keys, which is empty if the extension didn't change.
+    """
+    if old is not None and new is not None:
+        if old["fingerprint"] == new["fingerprint"]:
+            return []
+    elif new is not None:
+        return [
+            {
+                "id": id,
+                "name": new["name"],
+                "change": "added",
+                "old": None,
+                "new": new["version"],
+            }
+        ]
+    elif old is not None:
+        return [
+            {
+                "id": id,
+                "name": old["name"],
+                "change": "removed",
+                "old": old["version"],
+                "new": None,
+            }
+        ]
+    else:
+        return []
+
+    changes = []
+
+    for field, change in [("version", "version"), ("risk", "risk")]:
+        if old.get(field) != new[field]:
+            changes.append(
+                {
+                    "id": id,
+                    "name": new["name"],
+                    "change": change,
+                    "old": old.get(field),
+                    "new": new[field],
+                }
+            )
+
+    for field in ("permissions", "extcalls"):
+        before = set(old.get(field, []))
+        added = [value for value in new[field] if value not in before]
+        after = set(new[field])
+        removed = [value for value in sorted(before) if value not in after]
+
+        if added or removed:
+            changes.append(
+                {
+                    "id": id,
+                    "name": new["name"],
+                    "change": field,
+                    "old": removed,
+                    "new": added,
+                }
+            )
+
+    return changes
+
+
+def diff_extensions(
+    extensions: list, filename: str, shard: Optional[str] = None
+) -> list:
+    """Compares the passed-in extensions against the previous snapshot in a
+    single pass, then saves the current state as the new snapshot.
+
+    Extensions whose report can't be fetched keep their previous entry, so a
+    failed request isn't reported as a removal. With a --shard slice, only
+    the previous entries in that slice are compared; the others are saved
+    back unchanged, so shards sharing a snapshot keep each other's state.
+
+    Args:
+        extensions: A list of extension dicts.
+        filename: The snapshot filename as a string.
+        shard: A --shard value such as '2/4', or None for every extension.
+
+    Returns:
+        A list of change dicts from get_changes().
+    """
+    previous = load_snapshot(filename)
+    snapshot = {}
+    changes = []
+
+    if shard:
+        index, count = parse_shard(shard)
+
+        for id in list(previous):
+            if get_shard(id, count) != index:
+                snapshot[id] = previous.pop(id)
+
+    extensions = shard_extensions(extensions, shard)
+    reports = fetch_reports(extension["id"] for extension in extensions)
+
+    for extension, (id, _, report) in zip(extensions, reports):
+        old = previous.pop(id, None)
+
+        if report is None:
+            if old is not None:
+                snapshot[id] = old
+            continue
+
+        snapshot[id] = get_snapshot_entry(extension, report)
+        changes += get_changes(id, old, snapshot[id])
+
+    for id, old in sorted(previous.items()):
+        changes += get_changes(id, old, None)
+
+    save_snapshot(filename, snapshot)
+
+    return changes
+
+
+def format_change(value: Any) -> str:
+    """Returns a change's old or new value for the --diff table.
+
+    Args:
+        value: A value from a change dict.
+
+    Returns:
+        A string of the value.
+    """
+    if value is None:
+        return ""
+    elif isinstance(value, list):
+        return ", ".join(value[:3]) + (" ..." if len(value) > 3 else "")
+
+    return str(value)
+
+
+def get_changes_table(changes: list) -> None:
+    """Prints a table of the changes found by --diff.
+
+    Args:
+        changes: A list of change dicts from diff_extensions().
+
+    Returns:
+        None.
+    """
+    import termtables  # type: ignore
+
+    if len(changes) == 0:
+        print("\n\tNo changes since the last run.\n")
+        return
+
+    data = []
+    for change in changes:
+        data.append(
+            [
+                change["name"][:30],
+                change["id"],
+                change["change"],
+                format_change(change["old"])[:40],
+                format_change(change["new"])[:40],
+            ]
+        )
+
+    header = [
+        "\033[1mName\033[0m",
+        "\033[1mIdentifier\033[0m",
+        "\033[1mChange\033[0m",
+        "\033[1mBefore\033[0m",
+        "\033[1mAfter\033[0m",
+    ]
+
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="lllll",
+        )
+
+
+def print_ndjson(records: list) -> None:
+    """Prints records, such as --diff changes or policy violations, as
+    newline-delimited JSON.
+
+    Args:
+        records: A list of dicts.
+
+    Returns:
+        None.
+    """
+    sys.stdout.write("".join(json.dumps(record) + "\n" for record in records))
+
+
+class SnapshotBundle(NamedTuple):
+    """An offline snapshot bundle, memory-mapped from its file.
+
+    The bundle starts with an index of fixed-size entries sorted by a hash of
+    each record's key, followed by the records, each of which is its key and
+    its zlib-compressed JSON. A lookup binary searches the index and
+    decompresses only the one record it needs.
+    """
+
+    data: Any
+    entries: int
+
+    def get(self, key: str) -> Any:
+        """Returns the decoded record stored under a key.
+
+        Args:
+            key: A record key such as 'report/<id>' or 'virustotal/<host>'.
+
+        Returns:
+            The record's decoded JSON, or None if the bundle lacks the key.
+        """
+        import zlib
+
+        digest = get_bundle_digest(key)
+        records = BUNDLE_HEADER.size + self.entries * BUNDLE_ENTRY.size
+        low, high = 0, self.entries
+
+        while low < high:
+            middle = (low + high) // 2
+            entry = BUNDLE_HEADER.size + middle * BUNDLE_ENTRY.size
+            found, offset, length = BUNDLE_ENTRY.unpack_from(self.data, entry)
+
+            if found < digest:
+                low = middle + 1
+            elif found > digest:
+                high = middle
+            else:
+                start = records + offset
+                end = start + length
+                name, _, payload = self.data[start:end].partition(b"\n")
+
+                if name != key.encode("utf-8"):
+                    return None
+
+                return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+        return None
+
+
+def get_bundle_digest(key: str) -> bytes:
+    """Returns the index hash of a snapshot bundle record key.
+
+    Args:
+        key: A record key string.
+
+    Returns:
+        16 bytes of the key's BLAKE2b digest.
+    """
+    import hashlib
+
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+
+
+def build_snapshot_bundle(records: dict) -> bytes:
+    """Returns a snapshot bundle holding the passed-in records.
+
+    Args:
+        records: A dict of JSON-serializable records keyed by string.
+
+    Returns:
+        The bundle's content as bytes.
+    """
+    import zlib
+
+    index = []
+    blobs = []
+    offset = 0
+
+    for digest, key in sorted((get_bundle_digest(k), k) for k in records):
+        payload = json.dumps(records[key], separators=(",", ":"))
+        blob = key.encode("utf-8") + b"\n" + zlib.compress(payload.encode())
+        index.append(BUNDLE_ENTRY.pack(digest, offset, len(blob)))
+        blobs.append(blob)
+        offset += len(blob)
+
+    header = BUNDLE_HEADER.pack(BUNDLE_MAGIC, len(index))
+
+    return header + b"".join(index) + b"".join(blobs)
+
+
+def export_snapshot_bundle(extensions: list, filename: str) -> bool:
+    """Writes an offline snapshot bundle of the passed-in extensions' reports,
+    the stored VirusTotal verdicts for their external calls, and the
+    extension inventory.
+
+    Args:
+        extensions: A list of extension dicts.
+        filename: The chosen filename as a string.
+
+    Returns:
+        A boolean result for exporting the bundle to a file.
+    """
+    verdicts = load_virustotal_verdicts()
+    records: dict = {}
+    inventory = []
+    reports = 0
+
+    ids = [extension["id"] for extension in extensions]
+
+    for extension, (_, results, report) in zip(extensions, fetch_reports(ids)):
+        inventory.append(
+            {key: extension[key] for key in ("id", "name", "version")}
+        )
+
+        if report is None:
+            continue
+
+        records[f"report/{extension['id']}"] = results
+        reports += 1
+
+        for url in report.latest.extcalls:
+            host = urlparse(url).netloc
+
+            if host in verdicts:
+                records[f"virustotal/{host}"] = verdicts[host][1]
+
+    records["inventory"] = inventory
+    hosts = len(records) - reports - 1
+
+    if write_atomic(filename, build_snapshot_bundle(records)):
+        print(
+            f"\n>> Snapshot of {reports} reports and {hosts} VirusTotal "
+            f"verdicts saved in {filename} <<\n"
+        )
+        return True
+    else:
+        error(f"A snapshot could not be saved in {filename}.")
+        return False
+
+
+def open_snapshot_bundle(filename: str) -> SnapshotBundle:
+    """Memory-maps an offline snapshot bundle.
+
+    Args:
+        filename: The bundle's filename as a string.
+
+    Returns:
+        A SnapshotBundle.
+    """
+    import mmap
+
+    try:
+        with open(filename, "rb") as fileHandle:
+            data = mmap.mmap(fileHandle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, entries = BUNDLE_HEADER.unpack_from(data)
+    except (IOError, OSError, ValueError, struct.error):
+        magic = b""
+
+    if magic != BUNDLE_MAGIC:
+        error(f"{filename} is not an mrxcavator snapshot bundle.", True)
+
+    return SnapshotBundle(data, entries)
+
+
+def get_offline_results(end_point: str, method: str, values=None) -> Any:
+    """Answers an API call from the offline snapshot bundle.
+
+    Args:
+        end_point: An API endpoint path string.
+        method: The HTTP method string of the API call.
+        values: An optional dict of values sent with the API call.
+
+    Returns:
+        The API results the bundle holds for the call.
+    """
+    route = urlparse(end_point).path.rstrip("/")
+
+    if method == "GET" and route.startswith("/report/"):
+        return offline_bundle.get(route[1:]) or []
+    elif method == "POST" and route == "/virustotal/report":
+        return {"offline": True}
+    elif method == "POST" and route == "/virustotal/results":
+        results = [
+            offline_bundle.get(f"virustotal/{host}")
+            for host in (values or {}).get("urls", [])
+        ]
+        return [result for result in results if result is not None]
+
+    error(f"{route} is not available in offline mode.", True)
+
+
+def split_policy_list(value: str) -> frozenset:
+    """Returns the entries of a comma- or newline-separated policy value.
+
+    Args:
+        value: A policy rule's value string.
+
+    Returns:
+        A frozenset of entry strings.
+    """
+    return frozenset(
+        entry.strip() for entry in re.split("[,\n]", value) if entry.strip()
+    )
+
+
+def compile_policy_rule(key: str, value: str) -> Any:
+    """Returns a predicate for one rule of a policy file.
+
+    Args:
+        key: The rule's name, such as 'max_risk' or 'banned_domains'.
+        value: The rule's value string.
+
+    Returns:
+        A function that takes a ReportVersion and returns a string describing
+        the violation, or None if the version passes.
+    """
+
+    def get_section(version: ReportVersion, name: str) -> Any:
+        section = getattr(version.risk, name)
+        return section.total if section is not None else None
+
+    if key == "max_risk":
+        read: Any = lambda version: version.risk.total
+    elif key == "min_rating":
+        read = lambda version: version.webstore.rating  # noqa: E731
+    elif key.startswith("max_retire_"):
+        item = key.split("max_retire_", 1)[1]
+        read = lambda version: (  # noqa: E731
+            version.risk.retire.get(item) if version.risk.retire else None
+        )
+    elif key.startswith("max_") and key[4:] in STATS_COMPONENTS[1:]:
+        read = lambda version: get_section(version, key[4:])  # noqa: E731
+    else:
+        read = None
+
+    if read is not None:
+        try:
+            limit = float(value)
+        except ValueError:
+            error(
+                f"The policy rule {key} needs a number, not '{value}'.", True
+            )
+
+        label = key.split("_", 1)[1].replace("_", " ")
+        minimum = key.startswith("min_")
+
+        def check_limit(version: ReportVersion) -> Optional[str]:
+            found = read(version)
+
+            if not isinstance(found, (int, float)):
+                return None
+            elif minimum and found < limit:
+                return f"{label} {found:g} < {value}"
+            elif not minimum and found > limit:
+                return f"{label} {found:g} > {value}"
+
+            return None
+
+        return check_limit
+
+    entries = split_policy_list(value)
+
+    if key == "forbidden_permissions":
+
+        def check_permissions(version: ReportVersion) -> Optional[str]:
+            found: set = set()
+
+            for section in (
+                version.risk.permissions,
+                version.risk.optional_permissions,
+            ):
+                if section is not None:
+                    found.update(name for name, _ in section.items)
+
+            matches = sorted(found & entries)
+
+            return ", ".join(matches) if matches else None
+
+        return check_permissions
+    elif key == "required_csp":
+
+        def check_csp(version: ReportVersion) -> Optional[str]:
+            csp = version.risk.csp
+
+            if csp is None:
+                return None
+
+            matches = sorted(name for name in entries if csp.get(name, 0) > 0)
+
+            return ", ".join(matches) if matches else None
+
+        return check_csp
+    elif key == "banned_domains":
+
+        def check_domains(version: ReportVersion) -> Optional[str]:
+            matches = set()
+
+            for url in version.extcalls:
+                labels = urlparse(url).netloc.lower().split(".")
+
+                for index in range(len(labels)):
+                    if ".".join(labels[index:]) in entries:
+                        matches.add(urlparse(url).netloc)
+                        break
+
+            return ", ".join(sorted(matches)) if matches else None
+
+        return check_domains
+
+    error(f"The policy rule {key} is not supported.", True)
+
+
+def compile_policy(filename: str) -> list:
+    """Compiles a policy file into a list of named predicates.
+
+    The file uses the INI format of mrxcavator's configuration. Every section
+    is a group of rules, and each rule is named 'section.key' in violations.
+
+    Args:
+        filename: The policy filename as a string.
+
+    Returns:
+        A list of (rule name, predicate) tuples from compile_policy_rule().
+    """
+    policy = configparser.ConfigParser(
+        default_section="__defaults__", interpolation=None
+    )
 
-    if save_report(filename, report):
-        print(f"\n>> Report saved in {filename} <<\n")
-        return True
-    else:
-        error(f"A report for {id} could not be saved.")
-        return False
+    try:
+        with open(filename) as fileHandle:
+            policy.read_file(fileHandle)
+    except (IOError, configparser.Error):
+        error(f"Cannot read the policy {filename}.", True)
 
+    rules = []
 
-def get_reports_table(extensions: list) -> None:
-    """Builds a table of installed extension details from CRXcavator.
+    for section in policy.sections():
+        for key, value in policy.items(section):
+            rules.append(
+                (f"{section}.{key}", compile_policy_rule(key, value.strip()))
+            )
+
+    if len(rules) == 0:
+        error(f"The policy {filename} has no rules.", True)
+
+    return rules
+
+
+def evaluate_policy(extensions: list, rules: list) -> list:
+    """Checks every passed-in extension's newest report version against the
+    compiled policy rules in a single pass. Reports are fetched concurrently
+    with fetch_reports().
 
     Args:
-        extensions: A list of extension identifier strings.
+        extensions: A list of extension dicts.
+        rules: A list of rules from compile_policy().
+
+    Returns:
+        A list of violation dicts with 'id', 'name', 'rule' and 'detail' keys.
+    """
+    violations = []
+    names = {extension["id"]: extension["name"] for extension in extensions}
+
+    for id, _, report in fetch_reports(names):
+        if report is None:
+            continue
+
+        latest = report.latest
+        name = latest.webstore.name or names[id]
+
+        with timed("policy"):
+            for rule, predicate in rules:
+                detail = predicate(latest)
+
+                if detail is not None:
+                    violations.append(
+                        {
+                            "id": id,
+                            "name": name,
+                            "rule": rule,
+                            "detail": detail,
+                        }
+                    )
+
+    return violations
+
+
+def get_violations_table(violations: list) -> None:
+    """Prints a table of policy violations.
+
+    Args:
+        violations: A list of violation dicts from evaluate_policy().
 
     Returns:
         None.
     """
-    data = []
-    for extension in extensions:
-        report = get_report(extension["id"])
+    import termtables  # type: ignore
 
-        if report:
-            version = report[-1]["version"]
-            webstore = report[-1]["data"]["webstore"]
-            risk = report[-1]["data"]["risk"]
+    if len(violations) == 0:
+        print("\n\tNo policy violations were found.\n")
+        return
 
-            data.append(
-                [
-                    webstore["name"],
-                    extension["id"],
-                    version,
-                    webstore["last_updated"],
-                    round(webstore["rating"], 2),
-                    risk["total"],
-                ]
-            )
+    data = []
+    for violation in violations:
+        data.append(
+            [
+                violation["name"][:30],
+                violation["id"],
+                violation["rule"],
+                violation["detail"][:50],
+            ]
+        )
 
     header = [
         "\033[1mName\033[0m",
         "\033[1mIdentifier\033[0m",
-        "\033[1mVersion\033[0m",
-        "\033[1mUpdated\033[0m",
-        "\033[1mRating\033[0m",
-        "\033[1mRisk\033[0m",
+        "\033[1mRule\033[0m",
+        "\033[1mViolation\033[0m",
     ]
 
-    termtables.print(
-        data,
-        header=header,
-        style=termtables.styles.thin_double,
-        padding=(0, 1),
-        alignment="llllll",
-    )
+    with timed("render"):
+        termtables.print(
+            data,
+            header=header,
+            style=termtables.styles.thin_double,
+            padding=(0, 1),
+            alignment="llll",
+        )
 
+    extensions = len({violation["id"] for violation in violations})
+    print(f"\n  {len(violations)} violations by {extensions} extensions\n")
 
-def get_report_summary(report: dict) -> str:
-    """Prints a formatted report of information for the given extension.
+
+def get_cached_response(
+    cache: dict,
+    key: Any,
+    end_point: str,
+    method: str,
+    values=None,
+    headers=None,
+) -> tuple:
+    """Returns a cached API response body, or calls the API and caches it.
 
     Args:
-        report: A dict of a CRXcavator extension report.
+        cache: The dict used to cache responses.
+        key: A hashable key for the cache entry.
+        end_point: An API endpoint path string.
+        method: The HTTP method string to use for the API call.
+        values: An optional dict of values to pass as API parameters.
+        headers: An optional dict of headers to pass to the API.
 
     Returns:
-        A string of the report summary.
+        A tuple of the HTTP status code and the response body as bytes.
     """
-    id = report[-1]["extension_id"]
-    version = report[-1]["version"]
-    versions = version_count(report)
-
-    webstore = report[-1]["data"]["webstore"]
-    risk = report[-1]["data"]["risk"]
-
-    output = f"\nExtension Overview\n{'='*60}\n"
-    output += f"  Extension Name:\t{webstore['name']}\n"
-    output += f"  Extension ID:\t\t{id}\n"
+    entry = cache.get(key)
 
-    if webstore["website"] != "":
-        output += f"  Web Site:\t\t{webstore['website']}\n"
+    if entry and time.time() - entry[0] < CACHE_TTL:
+        timings["cache_hits"] += 1
+        return 200, entry[1]
 
-    output += f"\n  Newest Version:\t{version} ({webstore['last_updated']})"
-    output += f"\n  Versions Known:\t{versions}"
-    output += f"\n  Store Rating:\t\t{round(webstore['rating'],2)} stars\n"
-    output += f"\n  Total Risk Score:\t{risk['total']}"
+    response = api_request(end_point, method, values, headers)
 
-    if "csp" in risk:
-        output += f"\n\n\nContent Security Policy\n{'='*60}"
-        output += f"\n  {risk['csp'].get('total', 0)}\tTotal\n{'-'*60}"
+    if response.status_code == 200:
+        cache[key] = (time.time(), response.content)
 
-        csp_total = risk["csp"]["total"]
-        del risk["csp"]["total"]
+    return response.status_code, response.content
 
-        csp_attribute_total = 0
-        for key in risk["csp"].keys():
-            output += f"\n  {risk['csp'][key]}\t{key}"
-            csp_attribute_total += int(risk["csp"][key])
 
-        if csp_total > csp_attribute_total:
-            remainder = csp_total - csp_attribute_total
-            missing = int(remainder / 25)
-            output += f"\n  {remainder}\t{missing} attributes not set"
+def get_virustotal_cache_key(key: str) -> str:
+    """Returns a digest of a VirusTotal API key, so that cached VirusTotal
+    results are only served to callers with the same key.
 
-    if "retire" in risk:
-        output += f"\n\n\nRetireJS\n{'='*60}"
-        output += f"\n  {risk['retire'].get('total', '0')}\tTotal\n{'-'*60}"
-        output += f"\n  {risk['retire'].get('low', '0')}\tLow"
-        output += f"\n  {risk['retire'].get('medium', '0')}\tMedium"
-        output += f"\n  {risk['retire'].get('high', '0')}\tHigh"
-        output += f"\n  {risk['retire'].get('critical', '0')}\tCritical"
+    Args:
+        key: The VirusTotal API key as a string.
 
-    webstore_total = risk["webstore"].get("total", "0")
+    Returns:
+        A hex digest string.
+    """
+    import hashlib
 
-    if webstore_total > 0:
-        output += f"\n\n\nWeb Store\n{'='*60}"
-        output += f"\n  {risk['webstore'].get('total', '0')}\tTotal\n{'-'*60}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
 
-        del risk["webstore"]["total"]
 
-        for key in risk["webstore"].keys():
-            value = key.title().replace("_", " ")
-            output += f"\n  {risk['webstore'][key]}\t{value}"
+def lookup_virustotal(report: Extension, key: str) -> list:
+    """Returns VirusTotal results for an extension's "external calls" without
+    printing, for the daemon. Unlike get_virustotal(), errors are raised.
 
-    perms_required = 0
-    perms_optional = 0
+    Args:
+        report: An Extension of a CRXcavator extension report.
+        key: The VirusTotal API key as a string.
 
-    if "permissions" in risk:
-        perms_required = risk["permissions"].get("total", 0)
+    Returns:
+        A list of VirusTotal results.
 
-    if "optional_permissions" in risk:
-        perms_optional = risk["optional_permissions"].get("total", 0)
+    Raises:
+        MrxcavatorError: A VirusTotal call failed or no key was given.
+    """
+    data, blocked = get_virustotal_hosts(report)
 
-    perms_total = perms_required + perms_optional
+    results = [
+        {"url": host, "vt": {"positives": "blocklisted", "total": "-"}}
+        for host in blocked
+    ]
 
-    if perms_total > 0:
-        output += f"\n\n\nPermissions\n{'='*60}"
-        output += f"\n  {perms_total}\tTotal\n{'-'*60}"
-        output += f"\n  {perms_required}\tRequired"
-        output += f"\n  {perms_optional}\tOptional"
+    with get_batch_client(key) as schedule:
+        for index, group in enumerate(chunker(data, 4)):
+            if index > 0:
+                time.sleep(VIRUSTOTAL_THROTTLE)
 
-    if "extcalls" in report[-1]["data"]:
-        output += f"\n\n\nExternal Calls\n{'='*60}"
-        for result in get_extcalls(report[-1]["data"]["extcalls"]):
-            output += f"\n  - {result}"
+            schedule("submit_virustotal", group).result()
+            time.sleep(VIRUSTOTAL_THROTTLE)
+            results += schedule("virustotal_results", group).result()
 
-    return output + "\n"
+    return results
 
 
-def save_report(filename: str, content: str) -> bool:
-    """Writes passed-in content to the passed-in filename.
+def start_virustotal_lookup(report: Extension, key: str, entry: Any) -> tuple:
+    """Starts looking up an extension's VirusTotal results on a daemon
+    thread. The results are cached under the passed-in cache key once they
+    arrive.
 
     Args:
-        filename: The chosen filename as a string.
-        content: The chosen content to write as a string.
+        report: An Extension of a CRXcavator extension report.
+        key: The VirusTotal API key as a string.
+        entry: The virustotal_cache key for the results.
 
     Returns:
-        A boolean result.
+        A tuple of a Future of the results, the start time and the expected
+        number of seconds.
     """
-    if not os.path.isdir(get_report_dir()):
+    from concurrent.futures import Future
+
+    future: Any = Future()
+    hosts = len(get_virustotal_hosts(report)[0])
+    seconds = get_virustotal_seconds(hosts, VIRUSTOTAL_THROTTLE)
+    job = (future, time.time(), seconds)
+
+    def work() -> None:
         try:
-            os.mkdir(get_report_dir())
-        except IOError:
-            error(
-                f"Cannot create {get_report_dir()} - check permissions.",
-                True,
-            )
+            results = lookup_virustotal(report, key)
+        except MrxcavatorError as failure:
+            future.set_exception(failure)
+            return
+        except SystemExit:
+            future.set_exception(MrxcavatorError("API call failed."))
+            return
+
+        virustotal_cache[entry] = (
+            time.time(),
+            json.dumps(results).encode("utf-8"),
+        )
+        future.set_result(results)
 
-    try:
-        with open(filename, "w") as fileHandle:
-            fileHandle.write(content.strip())
-    except IOError:
-        error(f"Cannot write to {filename} -  check permissions.", True)
+        with virustotal_lock:
+            virustotal_jobs.pop(entry, None)
 
-    return True
+    threading.Thread(target=work, daemon=True).start()
 
+    return job
 
-def submit_extension(id: str) -> bool:
-    """Submits an extension (by ID) for CRXcavator to process.
+
+def get_virustotal_response(id: str, key: str) -> tuple:
+    """Answers a daemon request for an extension's VirusTotal results from
+    the cache, or starts a lookup and reports it as pending, so that the
+    request never waits on VirusTotal's throttling.
 
     Args:
         id: An extension identifier string.
+        key: The VirusTotal API key as a string.
 
     Returns:
-        A boolean result.
+        A tuple of the HTTP status code, content type and body as bytes. A
+        pending lookup is answered with a 202 and the seconds to wait before
+        asking again.
     """
-    result = call_api("/submit", "POST", {"extension_id": id})
+    if not key:
+        return 400, "text/plain", b"No VirusTotal API key has been set yet."
 
-    if result["code"] == 802 and extension_is_ignored(id) is False:
-        error(f"{id} is not a valid extension. Please check your input.")
-        return False
-    else:
-        return True
+    entry = (id, get_virustotal_cache_key(key))
+    cached = virustotal_cache.get(entry)
 
+    if cached and time.time() - cached[0] < CACHE_TTL:
+        timings["cache_hits"] += 1
+        return 200, "application/json", cached[1]
 
-def submit_extensions(extensions: list, path: str) -> None:
-    """Submits many extensions (by ID) for CRXcavator to process.
+    with virustotal_lock:
+        job = virustotal_jobs.get(entry)
+
+    if job is None:
+        code, body = get_cached_response(
+            report_cache, id, f"/report/{id}", "GET"
+        )
+
+        report = parse_report(json.loads(body)) if code == 200 else None
+
+        if report is None:
+            return 404, "text/plain", b"No results were found."
+
+        with virustotal_lock:
+            job = virustotal_jobs.get(entry)
+
+            if job is None:
+                job = start_virustotal_lookup(report, key, entry)
+                virustotal_jobs[entry] = job
+
+    future, started, seconds = job
+
+    if future.done():
+        with virustotal_lock:
+            virustotal_jobs.pop(entry, None)
+
+        failure = future.exception()
+
+        if failure is None:
+            body = json.dumps(future.result()).encode("utf-8")
+            return 200, "application/json", body
+        elif isinstance(failure, APIError) and 400 <= failure.status < 500:
+            return failure.status, "text/plain", str(failure).encode("utf-8")
+        elif isinstance(failure, APIError):
+            return 502, "text/plain", str(failure).encode("utf-8")
+        else:
+            return 400, "text/plain", str(failure).encode("utf-8")
+
+    remaining = math.ceil(max(seconds - (time.time() - started), 0))
+    pending = {
+        "status": "pending",
+        "seconds": remaining,
+        "retry_after": min(max(remaining, 1), VIRUSTOTAL_POLL),
+    }
+
+    return 202, "application/json", json.dumps(pending).encode("utf-8")
+
+
+def get_daemon_inventory() -> list:
+    """Returns the warm local inventory, rescanning only when the extension
+    directory (or one of its extension directories) has been modified.
 
     Args:
-        extensions: A list of extension identifier strings.
-        path: The system's directory path to Chrome extensions as a string.
+        None
 
     Returns:
-        None.
+        A list of installed extensions.
     """
-    successful = []
-    failed = []
+    path = get_crx_path()
+    mtime = 0.0
 
-    print(f"\nSubmitting extensions found in {path}\n")
+    if os.path.isdir(path):
+        mtime = os.stat(path).st_mtime
 
-    for extension in tqdm(extensions, bar_format="{l_bar}{bar}"):
-        if isinstance(extension, dict):
-            submit = submit_extension(extension["id"])
-        else:
-            submit = submit_extension(extension)
+        for dir in find_extension_directories(path):
+            mtime = max(mtime, os.stat(get_crx_path(dir)).st_mtime)
 
-        if submit:
-            successful.append(extension["name"])
-        else:
-            failed.append(extension["name"])
+    with inventory_lock:
+        if "extensions" not in inventory or inventory["mtime"] != mtime:
+            inventory["extensions"] = get_installed_extensions(path)
+            inventory["mtime"] = mtime
 
-    if len(successful) > 0:
-        successful.sort()
-        print("\nSuccessful:\n  > " + "\n  > ".join(successful))
-    if len(failed) > 0:
-        failed.sort()
-        print("\n\nFailed:\n  > " + "\n  > ".join(failed))
+        return inventory["extensions"]
 
 
-def get_report(id: str) -> dict:
-    """Requests the CRXcavator report (in JSON) for the given extension ID.
+def daemon_request(
+    end_point: str, method: str, values=None, statuses: tuple = (200,)
+) -> Any:
+    """Sends a request to the mrxcavator daemon for one of its own operations.
 
     Args:
-        id: An extension identifier string.
+        end_point: A daemon endpoint path string.
+        method: The HTTP method string to use for the request.
+        values: An optional dict of values to pass with the request.
+        statuses: The HTTP status codes the caller handles.
 
     Returns:
-        A dict of report results.
+        A response object, or None if the daemon can't be used or answered
+        with another status.
     """
-    result = call_api("/report/" + id, "GET")
+    global daemon_available
 
-    if result is None:
-        return {}
+    if not use_daemon():
+        return None
+
+    endpoint = config.get("custom", "daemon_uri") + end_point
+
+    try:
+        response = get_transport().request(method, endpoint, values)
+    except get_transport().errors:
+        error("The mrxcavator daemon is unreachable. Using the API directly.")
+        daemon_available = False
+        return None
+
+    if response.status_code in statuses:
+        return response
     else:
-        return result
+        return None
 
 
-def get_reports(extensions: list, export: bool) -> None:
-    """Retrieves a report summary for each passed-in extension ID in a list.
+def get_daemon_virustotal(id: str, key: str) -> Any:
+    """Requests VirusTotal results for an extension's external calls from the
+    mrxcavator daemon, which caches them between runs.
 
     Args:
-        extensions: A list of extension identifier strings.
-        export: A boolean for whether to export each report to a file.
+        id: An extension identifier string.
+        key: The VirusTotal API key as a string.
 
     Returns:
-        None.
+        A list of VirusTotal results, or None if the daemon can't be used.
+        While the daemon's lookup is pending, the daemon is asked again after
+        the delay it suggests. A rejected key is fatal.
     """
-    for extension in extensions:
-        if isinstance(extension, dict):
-            report = get_report(extension["id"])
-        else:
-            report = get_report(extension)
+    waiting = False
 
-        if report:
-            summary = get_report_summary(report)
-            print(f"{summary}\n{60*'~'}")
-            if export is True:
-                export_report(extension["id"], summary, "")
+    while True:
+        response = daemon_request(
+            f"/mrxcavator/virustotal/{id}",
+            "POST",
+            {"apiKey": key},
+            (200, 202, 400, 401, 403),
+        )
 
+        if response is None:
+            return None
 
-def write_config(filename: str) -> bool:
-    """Writes the state of ConfigParser to the passed-in filename.
+        content = response.content.decode("utf-8")
+
+        if response.status_code == 200:
+            return json.loads(content)
+        elif response.status_code != 202:
+            error(content, True)
+
+        pending = json.loads(content)
+
+        if not waiting:
+            duration = str(datetime.timedelta(seconds=pending["seconds"]))
+            print(
+                f"\n** The mrxcavator daemon is querying VirusTotal. This "
+                f"extension will take approximately {duration} to complete. "
+                f"**\n"
+            )
+            waiting = True
+
+        with timed("throttle"):
+            time.sleep(pending["retry_after"])
+
+
+def daemon_dispatch(
+    method: str, path: str, values=None, headers=None
+) -> tuple:
+    """Answers a daemon request from the warm caches, or by proxying the API.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
+        method: The HTTP method string of the request.
+        path: The request path string.
+        values: An optional dict of values sent with the request.
+        headers: An optional dict of headers to pass to the API.
 
     Returns:
-        A boolean result.
+        A tuple of the HTTP status code, content type and body as bytes.
     """
-    if not os.path.isdir(get_root_dir()):
+    route = urlparse(path).path.rstrip("/")
+    parts = route.split("/")
+
+    if route == "/mrxcavator/status":
+        status = {
+            "text": "mrxcavator",
+            "version": __version__,
+            "reports": len(report_cache),
+            "virustotal": len(virustotal_cache),
+        }
+        return 200, "application/json", json.dumps(status).encode("utf-8")
+
+    elif route == "/mrxcavator/extensions":
+        body = json.dumps(get_daemon_inventory()).encode("utf-8")
+        return 200, "application/json", body
+
+    elif route.startswith("/mrxcavator/graph/") and len(parts) == 4:
+        code, body = get_cached_response(
+            report_cache, parts[3], f"/report/{parts[3]}", "GET"
+        )
+
+        report = parse_report(json.loads(body)) if code == 200 else None
+
+        if report is None:
+            return 404, "text/plain", b"No results were found."
+
+        query = parse_qs(urlparse(path).query)
+
         try:
-            os.mkdir(get_root_dir())
-        except IOError:
-            error(
-                f"Cannot create {get_root_dir()} - check permissions.",
-                True,
-            )
+            width = int(query.get("width", ["0"])[0])
+        except ValueError:
+            width = 0
+
+        if width <= 0:
+            width = get_graph_width()
+
+        graph = build_risk_graph(report, width)
+        return 200, "text/plain", graph.encode("utf-8")
+
+    elif route.startswith("/mrxcavator/virustotal/") and len(parts) == 4:
+        key = (values or {}).get("apiKey", "")
+        return get_virustotal_response(parts[3], key)
+
+    elif method == "GET" and route.startswith("/report/"):
+        if (headers or {}).get("Cache-Control") == "no-cache":
+            report_cache.pop(parts[2], None)
+
+        code, body = get_cached_response(
+            report_cache, parts[2], route, method, values, headers
+        )
+        return code, "application/json", body
+
+    elif method == "POST" and route == "/virustotal/results":
+        key = (
+            tuple(sorted((values or {}).get("urls", []))),
+            get_virustotal_cache_key((values or {}).get("apiKey", "")),
+        )
+        code, body = get_cached_response(
+            virustotal_cache, key, route, method, values, headers
+        )
+        return code, "application/json", body
+
+    elif method == "POST" and route == "/submit":
+        report_cache.pop((values or {}).get("extension_id"), None)
+
+    response = api_request(route, method, values, headers)
+
+    return response.status_code, "application/json", response.content
+
+
+def build_daemon_server(port: int) -> Any:
+    """Returns a threaded HTTP server that answers mrxcavator daemon requests.
+
+    Args:
+        port: The localhost TCP port to listen on.
+
+    Returns:
+        An object for the HTTP server.
+    """
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+
+    class DaemonServer(ThreadingMixIn, HTTPServer):
+        """A threaded HTTP server that answers mrxcavator daemon requests."""
+
+        daemon_threads = True
+
+    class DaemonHandler(BaseHTTPRequestHandler):
+        """Handles HTTP requests made to the mrxcavator daemon."""
+
+        def do_GET(self) -> None:
+            """Handles an HTTP GET request."""
+            self.respond("GET")
+
+        def do_POST(self) -> None:
+            """Handles an HTTP POST request."""
+            self.respond("POST")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            """Silences the default per-request logging."""
+            return
+
+        def respond(self, method: str) -> None:
+            """Dispatches a request and writes the response back to the
+            client.
+
+            Args:
+                method: The HTTP method string of the request.
+
+            Returns:
+                None.
+            """
+            headers = {}
+            for name in ("API-Key", "Cache-Control"):
+                if self.headers.get(name):
+                    headers[name] = self.headers[name]
+
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                data = self.rfile.read(length) if length else b""
+                values = json.loads(data) if data else None
+            except ValueError:
+                code, content_type = 400, "text/plain"
+                body = b"The request body is not valid JSON."
+            else:
+                code, content_type, body = self.dispatch(
+                    method, values, headers
+                )
+
+            self.send_response(code)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def dispatch(self, method: str, values: Any, headers: dict) -> tuple:
+            """Answers a request, turning failures into error responses.
+
+            Args:
+                method: The HTTP method string of the request.
+                values: A dict of values sent with the request, or None.
+                headers: A dict of headers to pass to the API.
+
+            Returns:
+                A tuple of the HTTP status code, content type and body as
+                bytes.
+            """
+            try:
+                return daemon_dispatch(method, self.path, values, headers)
+            except MrxcavatorError as failure:
+                return 502, "text/plain", str(failure).encode("utf-8")
+            except SystemExit:
+                return 502, "text/plain", b"API call failed."
+            except Exception as failure:
+                message = f"500 - Server Error - {type(failure).__name__}"
+                return 500, "text/plain", message.encode("utf-8")
+
+    return DaemonServer(("127.0.0.1", port), DaemonHandler)
+
+
+def serve(port: int) -> None:
+    """Runs mrxcavator as a long-lived daemon on localhost. The daemon keeps
+    API connections, report and VirusTotal caches, and the local inventory
+    warm for clients configured with a daemon URI.
+
+    Args:
+        port: The localhost TCP port to listen on.
+
+    Returns:
+        None.
+    """
+    global serving
+
+    serving = True
+    get_daemon_inventory()
+
+    server = build_daemon_server(port)
+    print(f"\n\tServing mrxcavator on http://127.0.0.1:{port}\n")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def get_extension_versions(path: str) -> dict:
+    """Returns the version directories of every extension beneath a path.
+
+    Args:
+        path: A string for the path to installed Chrome extensions.
+
+    Returns:
+        A dict of version directory name sets keyed by extension identifier.
+    """
+    versions: dict = {}
 
     try:
-        with open(filename, "w") as fileHandle:
-            config.write(fileHandle)
-    except IOError:
-        error(f"Cannot write to {filename}. Please check permissions.", True)
+        entries = list(os.scandir(os.path.expanduser(path)))
+    except OSError:
+        return versions
 
-    return True
+    for entry in entries:
+        if len(entry.name) != 32 or extension_is_ignored(entry.name):
+            continue
+
+        try:
+            versions[entry.name] = frozenset(
+                version.name
+                for version in os.scandir(entry.path)
+                if version.is_dir()
+            )
+        except OSError:
+            continue
 
+    return versions
 
-def build_config(filename: str) -> bool:
-    """Builds a default configuration and says it  to the passed-in filename.
+
+def get_version_changes(old: dict, new: dict) -> list:
+    """Returns the extension versions in a new scan that an old one lacked.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
+        old: A dict from get_extension_versions().
+        new: A dict from get_extension_versions().
 
     Returns:
-        A boolean result.
+        A sorted list of (id, version) tuples.
     """
-    config["DEFAULT"] = {
-        "crxcavator_api_uri": "https://api.crxcavator.io/v1",
-        "crxcavator_api_key": "",
-        "virustotal_api_key": "",
-        "extension_path": CRX_PATH,
-    }
-    config.add_section("custom")
+    changes = []
 
-    if write_config(filename):
-        return True
-    else:
-        return False
+    for id, versions in new.items():
+        for version in versions - old.get(id, frozenset()):
+            changes.append((id, version))
 
+    return sorted(changes)
 
-def load_config(filename: str) -> bool:
-    """Loads ConfigParser with configuration data from the passed-in filename.
+
+def open_inotify(path: str) -> Any:
+    """Returns an inotify instance watching an extensions directory and its
+    extension directories for new subdirectories.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
+        path: A string for the path to installed Chrome extensions.
 
     Returns:
-        A boolean result.
+        A tuple of the libc handle, the inotify file descriptor and a dict of
+        watched paths keyed by watch descriptor, or None if inotify isn't
+        available.
     """
-    config.read(filename)
+    import ctypes
+    import ctypes.util
 
-    if config.sections() == []:
-        error(f"{filename} does not exist, or is corrupted. Creating it...")
+    if not sys.platform.startswith("linux"):
+        return None
 
-        if not build_config(filename):
-            return False
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+    except (OSError, AttributeError):
+        return None
 
-    return True
+    if fd < 0:
+        return None
 
+    inotify: tuple = (libc, fd, {})
+    root = os.path.expanduser(path)
 
-def set_extension_path(filename: str, path: str) -> bool:
-    """Configures the system's directory path to Chrome extensions.
+    if not add_inotify_watch(inotify, root):
+        os.close(fd)
+        return None
+
+    for id in get_extension_versions(root):
+        add_inotify_watch(inotify, os.path.join(root, id))
+
+    return inotify
+
+
+def add_inotify_watch(inotify: Any, path: str) -> bool:
+    """Adds a directory to an inotify instance from open_inotify().
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
-        path: The system's directory path to Chrome extensions as a string.
+        inotify: A tuple from open_inotify().
+        path: The directory to watch.
 
     Returns:
         A boolean result.
     """
-    if os.path.isdir(os.path.expanduser(path)) is True:
-        if path[-1] != "/":
-            path = path + "/"
+    libc, fd, watches = inotify
+    wd = libc.inotify_add_watch(fd, os.fsencode(path), INOTIFY_MASK)
 
-        config.set("custom", "extension_path", path)
+    if wd < 0:
+        return False
 
-        if not write_config(filename):
-            return False
-    else:
-        error(f"The provided extension path, {path}, does not exist.", True)
+    watches[wd] = path
 
     return True
 
 
-def set_crxcavator_key(filename: str, key: str) -> bool:
-    """Configures the CRXcavator API key into the passed-in filename.
+def read_inotify(inotify: Any, timeout: Optional[float]) -> bool:
+    """Waits for inotify events and watches any new extension directories.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
-        key: The CRXcavator API key as a string.
+        inotify: A tuple from open_inotify().
+        timeout: Seconds to wait for an event, or None to wait indefinitely.
 
     Returns:
-        A boolean result.
+        A boolean for whether any event arrived.
     """
-    if len(key) != 32 or re.match("^[a-zA-Z]+$", key) is False:
-        error(f"The provided API key, {key}, is incorrectly formatted.", True)
-    else:
-        config.set("custom", "crxcavator_api_key", key)
+    import select
 
-        if not write_config(filename):
-            return False
+    fd, watches = inotify[1], inotify[2]
+
+    if not select.select([fd], [], [], timeout)[0]:
+        return False
+
+    try:
+        data = os.read(fd, 64 * 1024)
+    except BlockingIOError:
+        return False
+
+    offset = 0
+
+    while offset + INOTIFY_EVENT.size <= len(data):
+        wd, mask, _, length = INOTIFY_EVENT.unpack_from(data, offset)
+        start = offset + INOTIFY_EVENT.size
+        offset = start + length
+        name = os.fsdecode(data[start:offset].rstrip(b"\0"))
+
+        if wd in watches and mask & INOTIFY_IN_ISDIR and len(name) == 32:
+            add_inotify_watch(inotify, os.path.join(watches[wd], name))
 
     return True
 
 
-def set_crxcavator_uri(filename: str, uri: str) -> bool:
-    """Configures the CRXcavator API URI into the passed-in filename.
+def wait_for_changes(path: str) -> Generator:
+    """Yields whenever the extensions directory may have changed. With
+    inotify, it waits for an event and then until no more events arrive for
+    WATCH_DEBOUNCE seconds; otherwise it yields every WATCH_POLL seconds.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
-        uri: The CRXcavator URI for API calls as a string.
+        path: A string for the path to installed Chrome extensions.
 
     Returns:
-        A boolean result.
+        A generator yielding 'inotify' or 'polling'.
     """
-    if validators.url(uri) is True:
-        config.set("custom", "crxcavator_api_uri", uri)
+    inotify = open_inotify(path)
 
-        if not write_config(filename):
-            return False
-    else:
-        error(f"The provided API URI, {uri}, is incorrectly formatted.", True)
+    if inotify is None:
+        while True:
+            yield "polling"
+            time.sleep(WATCH_POLL)
 
-    return True
+    try:
+        while True:
+            yield "inotify"
+            read_inotify(inotify, None)
 
+            while read_inotify(inotify, WATCH_DEBOUNCE):
+                pass
+    finally:
+        os.close(inotify[1])
 
-def set_virustotal_key(filename: str, key: str) -> bool:
-    """Configures the VirusTotal API key into the passed-in filename.
+
+def watch_extensions(path: str, timeout: int) -> None:
+    """Watches the extensions directory and, for every new extension or new
+    version, submits it and prints its report once the report covers that
+    version. Bursts of changes, such as Chrome unpacking an update, are
+    debounced and rescanned until stable. API errors are reported without
+    stopping the watch.
 
     Args:
-        filename: The mrxcavator configuration filename as a string.
-        key: The VirusTotal API key as a string.
+        path: A string for the path to installed Chrome extensions.
+        timeout: The number of seconds to wait for each batch's reports.
 
     Returns:
-        A boolean result.
+        None.
     """
-    if len(key) != 64 or re.match("^[a-f0-9]+$", key) is False:
-        error(f"The provided API key, {key}, is incorrectly formatted.", True)
-    else:
-        config.set("custom", "virustotal_api_key", key)
+    known = get_extension_versions(path)
+    changes = wait_for_changes(path)
 
-        if not write_config(filename):
-            return False
+    print(
+        f"\n\tWatching {get_crx_path()} for new extensions "
+        f"({next(changes)}, {len(known)} installed)...\n"
+    )
 
-    return True
+    try:
+        for _ in changes:
+            current = get_extension_versions(path)
 
+            while True:
+                time.sleep(WATCH_DEBOUNCE)
+                settled = get_extension_versions(path)
 
-def test_crxcavator_key() -> bool:
-    """Performs an API call to CRXcavator to test the configured API key.
+                if settled == current:
+                    break
 
-    Args:
-        None
+                current = settled
 
-    Returns:
-        A boolean result.
-    """
-    key = config.get("custom", "crxcavator_api_key")
+            found = get_version_changes(known, current)
+            known = current
+            batch = []
 
-    if key:
-        if call_api("/user/apikey", "GET", {}, {"API-Key": key}):
-            return True
-        else:
-            return False
-    else:
-        error("No CRXcavator API key has been set yet.")
-        return False
+            for id, version in found:
+                name = get_extension_name(id, version)
+                listing = get_extension_listing(id)
 
+                print(f"\n>> Found {name} ({id}) version {version} <<\n")
 
-def test_crxcavator_uri() -> bool:
-    """Performs an API call to CRXcavator to test the configured URI.
+                if listing:
+                    print(f"\tSkipped: the extension is {listing}.\n")
+                else:
+                    batch.append({"id": id, "name": name, "version": version})
 
-    Args:
-        None
+            if not batch:
+                continue
 
-    Returns:
-        A boolean result.
-    """
-    result = call_api("", "GET")
+            try:
+                submit_and_wait(batch, timeout)
+            except (MrxcavatorError, SystemExit) as failure:
+                if isinstance(failure, MrxcavatorError):
+                    error(str(failure))
 
-    if result["text"] == "CRXcavator":
-        return True
-    else:
-        return False
+                print("\tStill watching for new extensions...\n")
+    except KeyboardInterrupt:
+        pass
 
 
-def test_virustotal_key() -> bool:
-    """Performs a VirusTotal API call to test the configured API key.
+def fetch_report(id: str) -> Tuple[Any, Optional[Extension]]:
+    """Requests and parses an extension's report without touching its local
+    risk history.
 
     Args:
-        None
+        id: An extension identifier string.
 
     Returns:
-        A boolean result.
+        A tuple of the decoded JSON and an Extension, or None.
     """
-    key = config.get("custom", "virustotal_api_key")
-
-    if key:
-        if call_api(
-            "/virustotal/report",
-            "POST",
-            {"apiKey": key, "urls": ["google.com"]},
-            {},
-        ):
-            return True
-        else:
-            return False
+    if offline_bundle is not None:
+        results = get_offline_results("/report/" + id, "GET")
     else:
-        error("No VirusTotal API key has been set yet.")
-        return False
+        results = call_client("report_results", id)
 
+    return results, parse_report(results)
 
-def get_crx_path(id: str = "") -> str:
-    """Returns a filesystem path to the system's Chrome Extension directory. An
-    optional extentension ID may be passed in to append to the retuned path.
+
+@contextmanager
+def get_batch_client(virustotal_key: str = "") -> Generator:
+    """Runs an AsyncClient for the configured API (or daemon) on an event
+    loop in a background thread, for the CLI's commands. As with
+    api_request(), calls fall back to the API directly once the daemon turns
+    out to be unreachable.
 
     Args:
-        id: An optional extension identifier string.
+        virustotal_key: A VirusTotal API key to use instead of the configured
+            one, or an empty string.
 
     Returns:
-        A string with the appropriate filesystem path for a(n) extension(s).
+        A context manager that yields a function, which schedules an
+        AsyncClient method by name with its arguments and returns a
+        concurrent.futures.Future of the result.
     """
-    return os.path.expanduser(extension_path) + id
+    import asyncio
 
+    if offline_bundle is not None:
+        error("The API is not available in offline mode.", True)
 
-def find_extension_directories(path: str) -> list:
-    """Return all valid Chrome extension directories from a passed-in path.
+    limiter = RateLimiter()
 
-    Args:
-        path: The filesystem path to Chrome extensions.
+    def build_client() -> AsyncClient:
+        return AsyncClient(
+            get_api_uri(),
+            config.get("custom", "crxcavator_api_key", fallback=""),
+            virustotal_key
+            or config.get("custom", "virustotal_api_key", fallback=""),
+            config.get("custom", "transport", fallback="requests"),
+            limiter,
+        )
 
-    Returns:
-        A list containing Chrome extension directories.
-    """
-    directories = []
-    path = get_crx_path()
+    try:
+        clients = [build_client()]
+    except MrxcavatorError as failure:
+        error(str(failure), True)
 
-    if os.path.isdir(os.path.expanduser(path)) is True:
-        for dir in next(os.walk(path))[1]:
-            if len(dir) == 32:
-                directories.append(dir)
+    daemon = use_daemon()
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    futures: list = []
 
-    return directories
+    async def call(method: str, *args: Any) -> Any:
+        global daemon_available
 
+        client = clients[-1]
 
-def get_extension_messages_path(path: str) -> str:
-    """Return the path to an extension's most appropriate messages.json file.
+        try:
+            return await getattr(client, method)(*args)
+        except APIError as failure:
+            if failure.status or not daemon or client is not clients[0]:
+                raise
 
-    Args:
-        path: The filesystem path to a specific Chrome extension.
+        if len(clients) == 1:
+            error(
+                "The mrxcavator daemon is unreachable. Using the API directly."
+            )
+            daemon_available = False
+            clients.append(build_client())
 
-    Returns:
-        A string to the most appropriate messages.json file.
-    """
-    messages_en = f"{path}/_locales/en/messages.json"
-    messages_en_US = f"{path}/_locales/en_US/messages.json"
-    messages_en_GB = f"{path}/_locales/en_GB/messages.json"
+        return await getattr(clients[-1], method)(*args)
 
-    if os.path.isfile(messages_en_US):
-        path = messages_en_US
-    elif os.path.isfile(messages_en_GB):
-        path = messages_en_GB
-    elif os.path.isfile(messages_en):
-        path = messages_en
-    else:
-        path = ""
+    def schedule(method: str, *args: Any) -> Any:
+        future = asyncio.run_coroutine_threadsafe(call(method, *args), loop)
+        futures.append(future)
 
-    return path
+        return future
 
+    try:
+        yield schedule
+    finally:
+        for future in futures:
+            future.cancel()
 
-def get_extension_messages_name(name: str, messages: dict) -> str:
-    """Returns the 'name' of a Chrome extension via a messages.json file.
+        for client in clients:
+            asyncio.run_coroutine_threadsafe(client.close(), loop).result()
+
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+def call_client(method: str, *args: Any, virustotal_key: str = "") -> Any:
+    """Runs a single AsyncClient call through get_batch_client(), for the
+    CLI's single-operation commands.
 
     Args:
-        name: The canonical reference string for a messages.json value.
-        messages: A dict representation for a represented messages.json file.
+        method: The name of the AsyncClient method to call.
+        args: The method's arguments.
+        virustotal_key: A VirusTotal API key to use instead of the configured
+            one, or an empty string.
 
     Returns:
-        A string for the 'name' of a Chrome extension via a messages.json file.
+        The method's result. An API error is fatal, as with fetch_reports().
     """
-    manifest_key = re.search("__MSG_(.+?)__", name).group(1)  # type: ignore
-
-    if manifest_key:
-        switcher = {
-            "APP_NAME": "app_name",
-            "CHROME_EXTENSION_NAME": "chrome_extension_name",
-            "appName": "appName",
-            "extName": "extName",
-        }
-
-        messages_key = switcher.get(manifest_key, "")
-        name = messages[messages_key]["message"]
-    else:
-        name = ""
+    with get_batch_client(virustotal_key) as schedule:
+        future = schedule(method, *args)
 
-    return name
+        try:
+            with timed("network"):
+                return future.result()
+        except MrxcavatorError as failure:
+            error(str(failure), True)
 
 
-def get_extension_name(id: str, version: str) -> str:
-    """Returns the 'name' of a Chrome extension by finding the correct source.
+def fetch_reports(ids: Any, fresh: bool = False) -> Generator:
+    """Fetches many reports concurrently through an AsyncClient and yields
+    them in the order of the passed-in IDs. At most BATCH_WINDOW reports are
+    requested ahead of the one being yielded, so memory stays flat for long
+    lists. Each report is appended to its extension's risk history.
 
     Args:
-        id: An extension identifier string.
-        version: The extension version that is used to search file paths.
+        ids: An iterable of extension identifier strings.
+        fresh: Whether to skip the mrxcavator daemon's report cache.
 
     Returns:
-        A string for the 'name' of a Chrome extension.
+        A generator of (id, decoded JSON, Extension or None) tuples. An API
+        error is fatal, as with call_client().
     """
-    crx_base = f"{get_crx_path(id)}/{version}/"
-    manifest_path = f"{crx_base}/manifest.json"
-    messages_path = get_extension_messages_path(crx_base)
-
-    with open(manifest_path) as manifestHandle:
-        manifest = json.load(manifestHandle)
+    from collections import deque
 
-    if re.match("^__MSG", manifest["name"]) is None:
-        name = manifest["name"]
-    elif messages_path != "":
-        with open(messages_path) as messagesHandle:
-            messages = json.load(messagesHandle)
+    if offline_bundle is not None:
+        for id in ids:
+            yield (id,) + get_report_results(id)
+        return
 
-        name = get_extension_messages_name(manifest["name"], messages)
-    else:
-        name = "**Unknown Name**"
+    ids = iter(ids)
+    pending: Any = deque()
 
-    return name
+    with get_batch_client() as schedule:
+        for id in itertools.islice(ids, BATCH_WINDOW):
+            pending.append((id, schedule("report_results", id, fresh)))
 
+        while pending:
+            id, future = pending.popleft()
 
-def get_latest_local_version(extension_dir: str) -> str:
-    """Returns the latest local version for a passed-in extension path.
+            for next_id in itertools.islice(ids, 1):
+                pending.append(
+                    (next_id, schedule("report_results", next_id, fresh))
+                )
 
-    Args:
-        extension_dir: A string for the path to a given local extension.
+            try:
+                with timed("network"):
+                    results = future.result()
+            except MrxcavatorError as failure:
+                error(str(failure), True)
 
-    Returns:
-        A string for the version of the most recent local version available.
-    """
-    vers = []
+            report = parse_report(results)
 
-    for dir in next(os.walk(get_crx_path(extension_dir)))[1]:
-        vers.append(version.parse(dir))
+            if report is not None:
+                append_history(report)
 
-    return str(max(vers))
+            yield id, results, report
 
 
-def get_installed_extensions(path: str) -> list:
-    """Returns a list of installed extensions based on a passed-in path.
+def prefetch_report(id: str) -> Tuple[Any, Optional[Extension]]:
+    """Requests and parses an extension's report on a prefetch thread. Unlike
+    fetch_report(), errors are raised instead of exiting, and only
+    PREFETCH_RETRIES bad gateway or rate limit errors are retried.
 
     Args:
-        path: A string for the path to installed Chrome extensions.
+        id: An extension identifier string.
 
     Returns:
-        A list of extension identifiers that are locally installed for Chrome.
+        A tuple of the decoded JSON and an Extension, or None.
+
+    Raises:
+        APIError: The report couldn't be fetched.
     """
-    extensions: list = []
+    if offline_bundle is not None:
+        return fetch_report(id)
 
-    for dir in find_extension_directories(path):
-        version = get_latest_local_version(dir)
-        name = get_extension_name(dir, version)
+    for attempt in range(PREFETCH_RETRIES + 1):
+        try:
+            results = get_api_results(api_request("/report/" + id, "GET"))
 
-        if extension_is_ignored(dir) is False:
-            extensions.append({"name": name, "version": version, "id": dir})
+            return results, parse_report(results)
+        except APIError as failure:
+            if failure.retry_after is None or attempt == PREFETCH_RETRIES:
+                raise
 
-    return extensions
+            time.sleep(failure.retry_after)
 
+    return None, None
 
-def get_extensions_table(extensions: list, path: str) -> None:
-    """Prints a table of installed extensions.
+
+def prefetch_reports(extensions: list) -> dict:
+    """Starts fetching the passed-in extensions' reports in the background.
+    get_report() picks up a prefetched report instead of calling the API.
+
+    The fetches run on daemon threads, so reports that are still in flight
+    never hold up exit, and cancelled reports that haven't started are
+    skipped.
 
     Args:
-        extensions: A list of installed extension meta data.
-        path: A string for the path to installed Chrome extensions.
+        extensions: A list of extension dicts.
 
     Returns:
-        None.
+        A dict of futures keyed by extension identifier.
     """
-    print(f"\nExtensions Found in {path}")
+    import queue
+    from concurrent.futures import Future
 
-    data = []
-    for ext in extensions:
-        data.append([ext["name"], ext["version"].split("_")[0], ext["id"]])
+    pending: Any = queue.Queue()
 
-    header = [
-        "\033[1mName\033[0m",
-        "\033[1mVersion\033[0m",
-        "\033[1mIdentifier\033[0m",
-    ]
+    for extension in extensions:
+        future: Any = Future()
+        prefetched_reports[extension["id"]] = future
+        pending.put((extension["id"], future))
 
-    termtables.print(
-        data,
-        header=header,
-        style=termtables.styles.thin_double,
-        padding=(0, 1),
-        alignment="lll",
-    )
+    def work() -> None:
+        while True:
+            try:
+                id, future = pending.get_nowait()
+            except queue.Empty:
+                return
 
+            if not future.set_running_or_notify_cancel():
+                continue
 
-def get_risk_graph(id: str) -> None:
-    """Prints a graph of an extension's risk scores over time.
+            try:
+                future.set_result(prefetch_report(id))
+            except Exception as failure:
+                future.set_exception(failure)
+
+    for _ in range(min(PREFETCH_WORKERS, len(extensions))):
+        threading.Thread(target=work, daemon=True).start()
+
+    return {ext["id"]: prefetched_reports[ext["id"]] for ext in extensions}
+
+
+def get_choice_label(extension: dict, future: Any) -> str:
+    """Returns an extension's label in the picker, with the version and risk
+    of its report if the report has already arrived.
 
     Args:
-        id: An extension identifier string.
+        extension: An extension dict.
+        future: The extension's prefetch future, or None.
 
     Returns:
-        None.
+        A string label.
     """
-    results = get_report(id)
+    if future is None or not future.done() or future.exception():
+        return extension["name"]
 
-    if len(results) == 0:
-        error(f"No results were found for {id}.", True)
+    report = future.result()[1]
 
-    data = []
-    for item in results:
-        data.append(item["data"]["risk"]["total"])
+    if report is None:
+        return f"{extension['name']} (no report)"
 
-    print(
-        asciichartpy.plot(
-            data,
-            {
-                "min": min(data) - 5,
-                "max": max(data) + 5,
-                "height": 25,
-                "format": "{:8.0f}",
-            },
-        )
+    return (
+        f"{extension['name']} (v{report.latest.version}, "
+        f"risk {report.latest.risk.total})"
     )
 
 
-def select_extension(extensions: list) -> str:
+def select_extension(extensions: list, prefetch: bool = False) -> str:
     """Returns an extension identifier from the passed-in list via PyInquirer.
 
     Args:
         extensions: A list of extension identifier strings.
+        prefetch: Whether to fetch every listed extension's report in the
+            background, label each choice with its version and risk, and keep
+            the chosen report for the command that follows.
 
     Returns:
         A string of an extension identifier.
     """
+    from PyInquirer import prompt  # type: ignore
+    from concurrent.futures import wait
+
+    futures: dict = {}
+
+    if prefetch:
+        futures = prefetch_reports(extensions)
+        wait(list(futures.values()), timeout=PREFETCH_WAIT)
+
     choices = []
 
     for extension in extensions:
-        choices.append({"name": extension["name"], "value": extension["id"]})
+        choices.append(
+            {
+                "name": get_choice_label(
+                    extension, futures.get(extension["id"])
+                ),
+                "value": extension["id"],
+            }
+        )
 
     question = [
         {
@@ -1093,6 +7200,11 @@ def select_extension(extensions: list) -> str:
 
     result = prompt(question)
 
+    for id, future in futures.items():
+        if id != result.get("id"):
+            future.cancel()
+            prefetched_reports.pop(id, None)
+
     if "id" in result:
         return result["id"]
     else:
@@ -1145,6 +7257,30 @@ def build_parser() -> Any:
             "--virustotal_key", metavar="key", help="set VirusTotal API key"
         )
 
+        help_config.add_argument(
+            "--daemon_uri",
+            metavar="uri",
+            help="set mrxcavator daemon URI (empty to disable)",
+        )
+
+        help_config.add_argument(
+            "--allowlist",
+            metavar="filename",
+            help="set a list of known-good IDs and hosts (empty to disable)",
+        )
+
+        help_config.add_argument(
+            "--blocklist",
+            metavar="filename",
+            help="set a list of known-bad IDs and hosts (empty to disable)",
+        )
+
+        help_config.add_argument(
+            "--transport",
+            choices=TRANSPORTS,
+            help="set the HTTP transport for API calls (httpx uses HTTP/2)",
+        )
+
         help_test.add_argument(
             "--test_crxcavator_key",
             action="store_true",
@@ -1178,6 +7314,20 @@ def build_parser() -> Any:
             help="submit all installed extensions",
         )
 
+        help_features.add_argument(
+            "--submit_wait",
+            action="store_true",
+            help="submit all installed extensions and print reports as ready",
+        )
+
+        help_features.add_argument(
+            "--wait_timeout",
+            type=int,
+            default=SUBMIT_WAIT_TIMEOUT,
+            metavar="seconds",
+            help="stop waiting for --submit_wait/--watch reports after this",
+        )
+
         help_features.add_argument(
             "-r",
             "--report",
@@ -1199,6 +7349,32 @@ def build_parser() -> Any:
             help="retrieve a table of details for installed extensions",
         )
 
+        help_features.add_argument(
+            "--sort",
+            choices=sorted(TABLE_SORT_COLUMNS),
+            help="sort --report_all_table rows, largest first",
+        )
+
+        help_features.add_argument(
+            "--top",
+            type=non_negative_int,
+            default=0,
+            metavar="N",
+            help="only show the first N table rows (by risk unless sorted)",
+        )
+
+        help_features.add_argument(
+            "--stream",
+            action="store_true",
+            help="print table rows as they arrive, paging on a terminal",
+        )
+
+        help_features.add_argument(
+            "--stats",
+            action="store_true",
+            help="show risk statistics across installed extensions' reports",
+        )
+
         help_features.add_argument(
             "--export",
             nargs="?",
@@ -1207,6 +7383,18 @@ def build_parser() -> Any:
             help="export a report to a specific filename",
         )
 
+        help_features.add_argument(
+            "--archive",
+            metavar="filename",
+            help="save all reports in one .tar.gz, .zip or .jsonl archive",
+        )
+
+        help_features.add_argument(
+            "--archive_raw",
+            action="store_true",
+            help="also save each report's raw JSON in the archive",
+        )
+
         help_features.add_argument(
             "--input",
             nargs="?",
@@ -1215,6 +7403,25 @@ def build_parser() -> Any:
             help="load a specific filename for extension identifiers",
         )
 
+        help_features.add_argument(
+            "--shard",
+            metavar="i/N",
+            help="only process slice i of N of the extensions (e.g. 1/4)",
+        )
+
+        help_features.add_argument(
+            "--merge",
+            nargs="+",
+            metavar="filename",
+            help="combine per-shard NDJSON or snapshot outputs into one",
+        )
+
+        help_features.add_argument(
+            "--crx_dir",
+            metavar="path",
+            help="read extensions from a directory of .crx/.zip packages",
+        )
+
         help_features.add_argument(
             "-e",
             "--extensions",
@@ -1228,7 +7435,7 @@ def build_parser() -> Any:
             nargs="?",
             const="empty",
             metavar="id",
-            help="get a graph of an extension's risk",
+            help="get a graph of extensions' risk (ids comma-separated)",
         )
 
         help_features.add_argument(
@@ -1240,6 +7447,131 @@ def build_parser() -> Any:
             help="get VirusTotal data for an extension's external calls",
         )
 
+        help_features.add_argument(
+            "--scan_extcalls",
+            nargs="?",
+            const="empty",
+            metavar="id",
+            help="scan an extension's local code for external calls",
+        )
+
+        help_features.add_argument(
+            "--scan_extcalls_all",
+            action="store_true",
+            help="scan all installed extensions' code for external calls",
+        )
+
+        help_features.add_argument(
+            "--no_api",
+            action="store_true",
+            help="don't compare a local scan against CRXcavator's report",
+        )
+
+        help_features.add_argument(
+            "--hash",
+            nargs="?",
+            const="empty",
+            metavar="id",
+            help="hash each file of an installed extension",
+        )
+
+        help_features.add_argument(
+            "--hash_all",
+            action="store_true",
+            help="hash all installed extensions and show their tree hashes",
+        )
+
+        help_features.add_argument(
+            "--local_risk",
+            nargs="?",
+            const="empty",
+            metavar="id",
+            help="estimate an extension's risk from its local manifest",
+        )
+
+        help_features.add_argument(
+            "--local_risk_all",
+            action="store_true",
+            help="estimate local risk for all installed extensions",
+        )
+
+        help_features.add_argument(
+            "--min_risk",
+            type=int,
+            default=0,
+            metavar="score",
+            help="only list extensions with at least this local risk",
+        )
+
+        help_features.add_argument(
+            "--diff",
+            nargs="?",
+            const="empty",
+            metavar="filename",
+            help="show what changed since the last --diff run",
+        )
+
+        help_features.add_argument(
+            "--ndjson",
+            action="store_true",
+            help="print --diff or --policy results as newline-delimited JSON",
+        )
+
+        help_features.add_argument(
+            "--policy",
+            metavar="filename",
+            help="check reports against a policy file; exit 3 on violations",
+        )
+
+        help_features.add_argument(
+            "--metrics",
+            metavar="filename",
+            help="write an OpenMetrics textfile of installed extensions' risk",
+        )
+
+        help_features.add_argument(
+            "--snapshot_export",
+            metavar="filename",
+            help="save reports and VirusTotal verdicts for offline use",
+        )
+
+        help_features.add_argument(
+            "--offline",
+            metavar="bundle",
+            help="read reports from a snapshot bundle instead of the API",
+        )
+
+        help_features.add_argument(
+            "--watch",
+            action="store_true",
+            help="submit and report extensions as they're installed/updated",
+        )
+
+        help_features.add_argument(
+            "--serve",
+            nargs="?",
+            const=DAEMON_PORT,
+            type=int,
+            metavar="port",
+            help="run as a daemon with warm caches on a localhost port",
+        )
+
+        help_misc.add_argument(
+            "--timings",
+            nargs="?",
+            const="empty",
+            metavar="filename",
+            help="print (or save as JSON) phase timings and API latency",
+        )
+
+        help_misc.add_argument(
+            "--profile",
+            nargs="?",
+            const="empty",
+            metavar="filename",
+            help="profile the run with cProfile and save the stats file",
+        )
+
         help_misc.add_argument(
             "-v", "--version", action="version", version="v" + __version__
         )
@@ -1269,10 +7601,22 @@ def main() -> None:
     """
     global config
     global extension_path
+    global crx_packages
+    global offline_bundle
 
     parser = build_parser()
     args = parser.parse_args()
 
+    if args.timings == "empty":
+        atexit.register(print_timings)
+    elif args.timings:
+        atexit.register(write_timings, args.timings)
+
+    if args.profile == "empty":
+        start_profile(f"{get_root_dir()}mrxcavator.prof")
+    elif args.profile:
+        start_profile(args.profile)
+
     if args.config:
         config_file = f"{get_root_dir()}{args.config}"
     else:
@@ -1282,6 +7626,13 @@ def main() -> None:
 
     extension_path = config.get("custom", "extension_path")
 
+    if args.crx_dir:
+        extension_path = args.crx_dir
+        crx_packages = True
+
+    if args.offline:
+        offline_bundle = open_snapshot_bundle(args.offline)
+
     if args.submit:
         if args.submit == "empty":
             id = select_extension(get_installed_extensions(extension_path))
@@ -1293,7 +7644,9 @@ def main() -> None:
 
     elif args.report:
         if args.report == "empty":
-            id = select_extension(get_installed_extensions(extension_path))
+            id = select_extension(
+                get_installed_extensions(extension_path), True
+            )
         else:
             id = args.report
 
@@ -1324,6 +7677,22 @@ def main() -> None:
         if set_virustotal_key(config_file, args.virustotal_key):
             print("\n\tThe VirusTotal API key was set successfully!\n")
 
+    elif args.daemon_uri is not None:
+        if set_daemon_uri(config_file, args.daemon_uri):
+            print("\n\tThe mrxcavator daemon URI was set successfully!\n")
+
+    elif args.allowlist is not None:
+        if set_membership_list(config_file, "allowlist", args.allowlist):
+            print("\n\tThe allowlist was set successfully!\n")
+
+    elif args.blocklist is not None:
+        if set_membership_list(config_file, "blocklist", args.blocklist):
+            print("\n\tThe blocklist was set successfully!\n")
+
+    elif args.transport:
+        if set_transport(config_file, args.transport):
+            print("\n\tThe HTTP transport was set successfully!\n")
+
     elif args.test_crxcavator_key:
         if test_crxcavator_key():
             print("\n\tThe CRXcavator API key was successfully tested!\n")
@@ -1344,15 +7713,33 @@ def main() -> None:
         if len(extensions) == 0:
             error("No extensions were found. Check your configuration.")
         else:
-            get_extensions_table(extensions, extension_path)
+            get_extensions_table(
+                extensions, extension_path, args.top, args.stream
+            )
 
     elif args.submit_all:
         if args.input:
-            submit_extensions(extensions_from_file(args.input), args.input)
+            extensions = extensions_from_file(args.input)
+            path = args.input
         else:
-            submit_extensions(
-                get_installed_extensions(extension_path), extension_path
-            )
+            extensions = get_installed_extensions(extension_path)
+            path = extension_path
+
+        extensions = screen_extensions(
+            shard_extensions(extensions, args.shard)
+        )
+        submit_extensions(extensions, path)
+
+    elif args.submit_wait:
+        if args.input:
+            extensions = extensions_from_file(args.input)
+        else:
+            extensions = get_installed_extensions(extension_path)
+
+        extensions = screen_extensions(
+            shard_extensions(extensions, args.shard)
+        )
+        submit_and_wait(extensions, args.wait_timeout)
 
     elif args.report_all:
         if args.export:
@@ -1361,42 +7748,234 @@ def main() -> None:
             export = False
 
         if args.input:
-            get_reports(extensions_from_file(args.input), export)
+            extensions = extensions_from_file(args.input)
+        else:
+            extensions = get_installed_extensions(extension_path)
+
+        extensions = screen_extensions(
+            shard_extensions(extensions, args.shard)
+        )
+
+        if args.archive:
+            with ReportArchive(
+                os.path.join(get_report_dir(), args.archive), args.archive_raw
+            ) as archive:
+                get_reports(extensions, export, archive)
+        else:
+            get_reports(extensions, export)
+
+    elif args.stats:
+        if args.input:
+            extensions = extensions_from_file(args.input)
         else:
-            get_reports(get_installed_extensions(extension_path), export)
+            extensions = get_installed_extensions(extension_path)
+
+        extensions = screen_extensions(extensions)
+        reports = fetch_reports(extension["id"] for extension in extensions)
+        get_stats_table([report for _, _, report in reports if report])
 
     elif args.report_all_table:
         if args.input:
-            get_reports_table(extensions_from_file(args.input))
+            extensions = extensions_from_file(args.input)
         else:
-            get_reports_table(get_installed_extensions(extension_path))
+            extensions = get_installed_extensions(extension_path)
+
+        get_reports_table(
+            screen_extensions(shard_extensions(extensions, args.shard)),
+            args.sort,
+            args.top,
+            args.stream,
+        )
 
     elif args.virustotal:
         if args.virustotal == "empty":
-            id = select_extension(get_installed_extensions(extension_path))
+            id = select_extension(
+                get_installed_extensions(extension_path), True
+            )
         else:
             id = args.virustotal
 
         key = config.get("custom", "virustotal_api_key")
 
-        if key == "":
+        if key == "" and offline_bundle is None:
             error("No VirusTotal API key has been set yet.", True)
 
-        results = get_report(id)
+        vt_results = get_daemon_virustotal(id, key)
 
-        if results:
-            get_virustotal_table(get_virustotal(results, key))
+        if vt_results is not None:
+            get_virustotal_table(vt_results)
         else:
-            error(f"The extension {id} was not found.")
+            results = get_report(id)
+
+            if results:
+                get_virustotal_table(get_virustotal(results, key))
+            else:
+                error(f"The extension {id} was not found.")
 
     elif args.graph:
         if args.graph == "empty":
-            id = select_extension(get_installed_extensions(extension_path))
+            id = select_extension(
+                get_installed_extensions(extension_path), True
+            )
         else:
             id = args.graph
 
         get_risk_graph(id)
 
+    elif args.scan_extcalls:
+        extensions = get_installed_extensions(extension_path)
+
+        if args.scan_extcalls == "empty":
+            id = select_extension(extensions)
+        else:
+            id = args.scan_extcalls
+
+        matches = [ext for ext in extensions if ext["id"] == id]
+
+        if matches:
+            local = get_local_extcalls(matches[0])
+
+            if args.no_api:
+                results = None
+            else:
+                results = get_report(id)
+
+            get_extcalls_table(
+                get_extcalls_diff(local, results), results is not None
+            )
+        else:
+            error(f"The extension {id} is not installed locally.")
+
+    elif args.scan_extcalls_all:
+        extensions = get_installed_extensions(extension_path)
+
+        if len(extensions) == 0:
+            error("No extensions were found. Check your configuration.")
+        else:
+            get_extcalls_all_table(extensions)
+
+    elif args.hash:
+        extensions = get_installed_extensions(extension_path)
+
+        if args.hash == "empty":
+            id = select_extension(extensions)
+        else:
+            id = args.hash
+
+        matches = [ext for ext in extensions if ext["id"] == id]
+
+        if matches:
+            summary = get_hash_summary(hash_extensions(matches)[0])
+            print(summary)
+
+            if args.export:
+                export_report(id, summary, args.export)
+        else:
+            error(f"The extension {id} is not installed locally.")
+
+    elif args.hash_all:
+        extensions = get_installed_extensions(extension_path)
+
+        if len(extensions) == 0:
+            error("No extensions were found. Check your configuration.")
+        else:
+            get_hashes_table(hash_extensions(extensions))
+
+    elif args.local_risk:
+        extensions = get_installed_extensions(extension_path, True)
+
+        if args.local_risk == "empty":
+            id = select_extension(extensions)
+        else:
+            id = args.local_risk
+
+        matches = [ext for ext in extensions if ext["id"] == id]
+
+        if matches:
+            summary = get_local_risk_summary(matches[0])
+            print(summary)
+
+            if args.export:
+                export_report(id, summary, args.export)
+        else:
+            error(f"The extension {id} is not installed locally.")
+
+    elif args.local_risk_all:
+        extensions = get_installed_extensions(extension_path, True)
+
+        if len(extensions) == 0:
+            error("No extensions were found. Check your configuration.")
+        else:
+            get_local_risks_table(
+                get_local_risks(extensions, args.min_risk), extension_path
+            )
+
+    elif args.diff:
+        if args.diff == "empty":
+            snapshot = get_snapshot_file()
+        else:
+            snapshot = args.diff
+
+        if args.input:
+            extensions = extensions_from_file(args.input)
+        else:
+            extensions = get_installed_extensions(extension_path, True)
+
+        changes = diff_extensions(extensions, snapshot, args.shard)
+
+        if args.ndjson:
+            print_ndjson(changes)
+        else:
+            get_changes_table(changes)
+
+    elif args.policy:
+        rules = compile_policy(args.policy)
+
+        if args.input:
+            extensions = extensions_from_file(args.input)
+        else:
+            extensions = get_installed_extensions(extension_path)
+
+        extensions = screen_extensions(
+            shard_extensions(extensions, args.shard)
+        )
+        violations = evaluate_policy(extensions, rules)
+
+        if args.ndjson:
+            print_ndjson(violations)
+        else:
+            get_violations_table(violations)
+
+        if violations:
+            sys.exit(POLICY_VIOLATION_EXIT)
+
+    elif args.metrics:
+        if args.input:
+            export_metrics(extensions_from_file(args.input), args.metrics)
+        else:
+            export_metrics(
+                get_installed_extensions(extension_path), args.metrics
+            )
+
+    elif args.snapshot_export:
+        if args.input:
+            extensions = extensions_from_file(args.input)
+        else:
+            extensions = get_installed_extensions(extension_path)
+
+        export_snapshot_bundle(
+            shard_extensions(extensions, args.shard), args.snapshot_export
+        )
+
+    elif args.merge:
+        sys.stdout.write(merge_outputs(args.merge))
+
+    elif args.watch:
+        watch_extensions(extension_path, args.wait_timeout)
+
+    elif args.serve:
+        serve(args.serve)
+
 
 if __name__ == "__main__":
     main()
@@ -7,7 +7,10 @@ black --line-length=80 mrxcavator.py
 mypy mrxcavator.py
 
 # Run `flake8` to perform linting
-flake8 mrxcavator.py
+flake8 mrxcavator.py benchmarks
+
+# Run the startup benchmark to check each command's import budget
+python benchmarks/startup.py
 
 # Run `pdoc3` to update HTML documentation
 pdoc3 --html -c show_source_code=False mrxcavator.py -o docs --force